@@ -0,0 +1,182 @@
+"""Time-budgeted background jobs run off the GUI's event loop."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+from typing import Callable, List
+
+import database
+from utils import merge_tasks, similarity_ratio
+
+# Called by a job between slices of work; True means stop and return
+StopCheck = Callable[[], bool]
+
+class Job:
+    """A periodic job that gets a time budget per run and keeps its timings.
+    
+    The job function receives a stop check, which turns true once the
+    budget is spent or the worker is cancelled, and returns how many
+    tasks it changed.
+    """
+    
+    def __init__(self, name: str, func: Callable[[StopCheck], int], budget: float,
+                 interval: float, enabled: Callable[[], bool] = None):
+        self.name = name
+        self.func = func
+        self.budget = budget
+        self.interval = interval
+        self.enabled = enabled
+        self.next_run = 0.0
+        self.runs = 0
+        self.over_budget = 0
+        self.last_ms = self.max_ms = self.total_ms = 0.0
+        self.last_result = 0
+        self.error = None
+    
+    def is_due(self, now: float) -> bool:
+        return now >= self.next_run and (self.enabled is None or self.enabled())
+    
+    def run(self, cancelled: threading.Event) -> int:
+        start = time.monotonic()
+        deadline = start + self.budget
+        try:
+            result = self.func(lambda: cancelled.is_set() or time.monotonic() >= deadline) or 0
+            self.error = None
+        except Exception as e:
+            result = 0
+            self.error = str(e)
+        finished = time.monotonic()
+        
+        elapsed_ms = (finished - start) * 1000
+        self.runs += 1
+        self.last_ms = elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.total_ms += elapsed_ms
+        self.last_result = result
+        if finished > deadline:
+            self.over_budget += 1
+        self.next_run = finished + self.interval
+        return result
+
+class BackgroundWorker:
+    """Runs jobs one at a time on a dedicated thread.
+    
+    The event loop only schedules and awaits the jobs, so UI events keep
+    being handled while they run. Their commits reach the screen like any
+    other process's, through a changes.ChangeWatcher.
+    """
+    
+    def __init__(self, jobs: List[Job], on_run: Callable[[Job], None] = None, tick: float = 1.0):
+        self.jobs = jobs
+        self.on_run = on_run
+        self.tick = tick
+        self._cancelled = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gtd-background")
+    
+    async def run(self):
+        """Run due jobs every tick until cancelled."""
+        loop = asyncio.get_running_loop()
+        try:
+            while not self._cancelled.is_set():
+                for job in self.jobs:
+                    if self._cancelled.is_set():
+                        break
+                    if job.is_due(time.monotonic()):
+                        await loop.run_in_executor(self._executor, self._run_job, job)
+                await asyncio.sleep(self.tick)
+        finally:
+            # Also reached when the coroutine itself is cancelled, so stop any running job too
+            self._cancelled.set()
+            self._executor.shutdown(wait=False)
+    
+    def cancel(self):
+        """Stop the running job at its next stop check, and run no more."""
+        self._cancelled.set()
+    
+    def _run_job(self, job: Job):
+        job.run(self._cancelled)
+        if self.on_run is not None:
+            self.on_run(job)
+
+class SimilarityMerger:
+    """Merges each newly added open task into its most similar open task.
+    
+    Tasks are compared once, in ID order, with utils.similarity_ratio in
+    the argument order check_for_similar_tasks uses, so both merge paths
+    agree on the threshold. The last task compared is checkpointed in
+    app_state; the first run starts from the newest task, so an existing
+    backlog is never merged wholesale. A comparison cut short by the stop
+    check resumes where it stopped on the next run.
+    """
+    
+    CHECKPOINT_KEY = "merge_checked_id"
+    
+    def __init__(self, threshold: float = 0.8, chunk_size: int = 250):
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        # In-progress comparison: task ID, matcher, last candidate ID, best (ratio, ID)
+        self._scan = None
+    
+    def __call__(self, should_stop: StopCheck) -> int:
+        checked = database.get_state(self.CHECKPOINT_KEY)
+        if checked is None:
+            newest = database.get_connection().execute("SELECT ifnull(max(id), 0) FROM tasks").fetchone()[0]
+            database.set_state(self.CHECKPOINT_KEY, str(newest))
+            return 0
+        
+        merged = 0
+        checked = int(checked)
+        while not should_stop():
+            if self._scan is None:
+                row = database.get_connection().execute(
+                    "SELECT id, title FROM tasks WHERE id > ? AND completed = 0 ORDER BY id LIMIT 1", (checked,)
+                ).fetchone()
+                if row is None:
+                    break
+                # The length and character count bounds are symmetric, so one matcher
+                # holding the new title filters every candidate
+                matcher = SequenceMatcher(None)
+                matcher.set_seq2(row[1].lower())
+                self._scan = [row[0], matcher, 0, None]
+            
+            if not self._compare(should_stop):
+                break
+            task_id, _, _, best = self._scan
+            self._scan = None
+            if best is not None and merge_tasks(task_id, best[1]) is not None:
+                merged += 1
+            database.set_state(self.CHECKPOINT_KEY, str(task_id))
+            checked = task_id
+        return merged
+    
+    def _compare(self, should_stop: StopCheck) -> bool:
+        """Compare the current task with more candidates; True once all are done."""
+        task_id, matcher, after_id, best = self._scan
+        length = len(matcher.b)
+        # ratio() is at most 2 * min(len) / sum(len), which bounds the lengths worth reading
+        low = int(length * self.threshold / (2 - self.threshold))
+        high = int(length * (2 - self.threshold) / self.threshold) + 1
+        cursor = database.get_connection().cursor()
+        while True:
+            # The unary + keeps SQLite on the rowid range instead of sorting the open tasks
+            rows = cursor.execute('''
+            SELECT id, title FROM tasks
+            WHERE id > ? AND id != ? AND +completed = 0 AND length(title) BETWEEN ? AND ?
+            ORDER BY id LIMIT ?
+            ''', (after_id, task_id, low, high, self.chunk_size)).fetchall()
+            for other_id, title in rows:
+                matcher.set_seq1(title.lower())
+                if matcher.real_quick_ratio() < self.threshold or matcher.quick_ratio() < self.threshold:
+                    continue
+                # ratio() itself isn't symmetric (autojunk, tie-breaking), so take it in utils' order
+                ratio = similarity_ratio(matcher.b, title)
+                if ratio >= self.threshold and (best is None or ratio > best[0]):
+                    best = (ratio, other_id)
+            if rows:
+                after_id = rows[-1][0]
+            self._scan[2:] = [after_id, best]
+            if len(rows) < self.chunk_size:
+                return True
+            if should_stop():
+                return False
@@ -0,0 +1,104 @@
+"""Time background auto-merging of new tasks and how much it delays the UI.
+
+Builds a backlog of ROWS synthetic tasks, then adds NEW tasks, some of
+them near-duplicates of each other. On a copy of the database, each new
+task is checked with utils.check_for_similar_tasks, which blocks its
+caller for the whole comparison. The same tasks are then merged by the
+GUI's BackgroundWorker, one budgeted slice per run on its own thread,
+while a probe coroutine measures how late the event loop wakes up: the
+stutter a user would see.
+
+Usage: python benchmarks/bench_background.py [ROWS] [NEW_TASKS] [BUDGET_MS]
+"""
+import asyncio
+import os
+import shutil
+import sys
+import time
+
+from common import make_task_db, timed
+from load_test_server import percentile
+
+import database
+import utils
+from background import BackgroundWorker, Job, SimilarityMerger
+
+PHRASES = [
+    "Email the landlord about the heating",
+    "Renew the car insurance policy",
+    "Book a dentist appointment for next month",
+    "Prepare slides for the quarterly review",
+    "Buy a birthday present for Sam",
+]
+
+def add_new_tasks(count: int) -> list:
+    # Every phrase after the first round is a near-duplicate of an earlier task
+    return [database.add_task(title=PHRASES[i % len(PHRASES)] + (" soon" if i >= len(PHRASES) else ""))
+            for i in range(count)]
+
+async def run_worker(merger: SimilarityMerger, budget: float) -> tuple:
+    job = Job("Auto-merge", merger, budget, interval=0)
+    worker = BackgroundWorker([job], tick=0.001)
+    lags = []
+    
+    async def probe():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append((time.perf_counter() - start - 0.005) * 1000)
+    
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(worker.run()), asyncio.create_task(probe())]
+    # New tasks can be merged away before their turn, so wait for none left to compare
+    while database.get_connection().execute(
+        "SELECT count(*) FROM tasks WHERE completed = 0 AND id > ?",
+        (int(database.get_state(SimilarityMerger.CHECKPOINT_KEY)),)
+    ).fetchone()[0]:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    worker.cancel()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return elapsed, job, sorted(lags)
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    new = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    budget = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.05
+    
+    path = make_task_db(rows)
+    copy = path + ".inline"
+    try:
+        merger = SimilarityMerger()
+        merger(lambda: False)  # Checkpoint the backlog as already compared
+        new_ids = add_new_tasks(new)
+        database.close_connection()
+        shutil.copy(path, copy)
+        
+        database.DB_PATH = copy
+        inline = sorted(timed(utils.check_for_similar_tasks, task_id, repeat=1) for task_id in new_ids)
+        inline_merged = rows + new - database.count_tasks()
+        database.close_connection()
+        
+        database.DB_PATH = path
+        elapsed, job, lags = asyncio.run(run_worker(merger, budget))
+        worker_merged = rows + new - database.count_tasks()
+    finally:
+        database.close_connection()
+        for base in (path, copy):
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(base + suffix):
+                    os.remove(base + suffix)
+    
+    print(f"Merging {new} new tasks into a backlog of {rows}")
+    print(f"  inline check_for_similar_tasks  {sum(inline) / 1000:>6.2f} s total, blocks the UI"
+          f" {percentile(inline, 0.5):.0f} ms per task (max {inline[-1]:.0f} ms), {inline_merged} merged")
+    print(f"  background worker               {elapsed:>6.2f} s total in {job.runs} runs of"
+          f" {job.budget * 1000:.0f} ms budget (max run {job.max_ms:.1f} ms, {job.over_budget} over),"
+          f" {worker_merged} merged")
+    print(f"  event loop lag while merging    p50 {percentile(lags, 0.5):.1f} ms"
+          f"  p99 {percentile(lags, 0.99):.1f} ms  max {lags[-1]:.1f} ms")
+
+if __name__ == "__main__":
+    main()
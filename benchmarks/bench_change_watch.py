@@ -0,0 +1,90 @@
+"""Time how the GUI and status bar notice commits from other processes.
+
+Times a ChangeWatcher check against an idle database, the cost the GUI
+and status bar pay every interval, then has a separate process add
+tasks one at a time and measures how long each one takes to reach a listener.
+
+The monotonic clock is system-wide on Linux and macOS, so the two
+processes' timestamps can be compared.
+
+Usage: python benchmarks/bench_change_watch.py [ROWS] [COMMITS]
+"""
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from common import make_task_db, timed
+from load_test_server import percentile
+
+import database
+from changes import ChangeWatcher
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WRITER = '''
+import sys, time
+import database
+database.DB_PATH = sys.argv[1]
+for _ in range(int(sys.argv[2])):
+    sys.stdin.readline()
+    started = time.monotonic()
+    task_id = database.add_task(title="Added elsewhere %r" % started)
+    print(started, task_id, flush=True)
+'''
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    commits = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    
+    path = make_task_db(rows)
+    try:
+        watcher = ChangeWatcher()
+        watcher.check()
+        idle = timed(watcher.check, repeat=1000) * 1000
+        
+        # First time each task's events reached the listener
+        received = {}
+        delivered = threading.Condition()
+        
+        def listener(events):
+            now = time.monotonic()
+            with delivered:
+                for event in events:
+                    received.setdefault(event['task_id'], now)
+                delivered.notify_all()
+        watcher.subscribe(listener)
+        watcher.start()
+        
+        writer = subprocess.Popen([sys.executable, "-c", WRITER, path, str(commits)], cwd=PACKAGE_DIR,
+                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        latencies = []
+        for _ in range(commits):
+            # Land the writes at random points of the watcher's interval
+            time.sleep(random.uniform(0, watcher.interval))
+            writer.stdin.write("\n")
+            writer.stdin.flush()
+            # The writer stamps the time just before it starts writing
+            started, task_id = writer.stdout.readline().split()
+            with delivered:
+                delivered.wait_for(lambda: int(task_id) in received, timeout=5)
+            latencies.append((received[int(task_id)] - float(started)) * 1000)
+        writer.wait()
+        watcher.stop()
+    finally:
+        database.close_connection()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    
+    latencies.sort()
+    print(f"Watching a database of {rows} tasks every {watcher.interval * 1000:.0f} ms")
+    print(f"  idle check                    {idle:>7.1f} us")
+    print(f"  write elsewhere to listener   p50 {percentile(latencies, 0.5):.1f} ms"
+          f"  p90 {percentile(latencies, 0.9):.1f} ms"
+          f"  max {latencies[-1]:.1f} ms  ({commits} commits)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Time `gtd list` output modes: time to first line and time to the end.
+
+Each command runs in a subprocess against a database of synthetic tasks,
+with stdout on a pipe as in a shell pipeline. The full table is only
+timed to its first line, since rendering every row through rich is the
+slow path the machine formats exist to avoid.
+
+Usage: python benchmarks/bench_cli_list.py [ROWS]
+"""
+import os
+import subprocess
+import sys
+import time
+
+from common import make_task_db
+from load_test_server import ROOT
+
+COMMANDS = (
+    (["list", "-n", "50"], True),
+    (["list"], False),
+    (["list", "--format", "jsonl"], True),
+    (["list", "--format", "csv"], True),
+    (["list", "--format", "tsv", "--fields", "id,title,score"], True),
+)
+
+def run(args: list, env: dict, to_end: bool) -> tuple:
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "cli.py")] + args, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    proc.stdout.readline()
+    first = (time.perf_counter() - start) * 1000
+    total = None
+    lines = 1
+    if to_end:
+        for _ in proc.stdout:
+            lines += 1
+        total = (time.perf_counter() - start) * 1000
+    proc.stdout.close()
+    proc.wait()
+    return first, total, lines
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    
+    path = make_task_db(rows)
+    env = dict(os.environ, GTD_DB_PATH=path)
+    try:
+        run(["list", "-n", "1"], env, True)  # warm the page cache
+        print(f"gtd list on {rows} tasks")
+        print(f"  {'command':<48}{'first line':>12}{'total':>12}{'lines':>9}")
+        for args, to_end in COMMANDS:
+            first, total, lines = run(args, env, to_end)
+            total_text = f"{total:>9.0f} ms" if total is not None else f"{'-':>12}"
+            print(f"  {'gtd ' + ' '.join(args):<48}{first:>9.0f} ms{total_text}{lines if to_end else '':>9}")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+if __name__ == "__main__":
+    main()
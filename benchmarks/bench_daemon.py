@@ -0,0 +1,79 @@
+"""Compare end-to-end CLI latency with and without `gtd daemon`.
+
+Each command runs as a fresh `python main.py ...` process, the way a shell
+or a status bar script would call it: RUNS times with GTD_NO_DAEMON set,
+then RUNS times forwarded to a daemon serving the same database of
+synthetic tasks. Process startup is included in both columns.
+
+Usage: python benchmarks/bench_daemon.py [ROWS] [RUNS]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import make_task_db
+from load_test_server import ROOT, percentile
+
+COMMANDS = (
+    ["getone"],
+    ["list", "-n", "20"],
+    ["list", "-n", "1000", "--format", "jsonl"],
+    ["create", "Benchmark task", "--effort", "3"],
+)
+
+def run(args: list, env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, "main.py")] + args, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+def timings(args: list, env: dict, runs: int) -> list:
+    run(args, env)
+    return sorted(run(args, env) for _ in range(runs))
+
+def wait_for_socket(proc: subprocess.Popen, path: str, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if proc.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError("gtd daemon did not start")
+        time.sleep(0.05)
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    
+    path = make_task_db(rows)
+    socket_path = os.path.join(tempfile.gettempdir(), f"gtd-bench-{os.getpid()}.sock")
+    env = dict(os.environ, GTD_DB_PATH=path, GTD_SOCKET=socket_path)
+    direct_env = dict(env, GTD_NO_DAEMON="1")
+    proc = None
+    try:
+        direct = {" ".join(args): timings(args, direct_env, runs) for args in COMMANDS}
+        
+        proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "main.py"), "daemon"], env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        wait_for_socket(proc, socket_path)
+        served = {" ".join(args): timings(args, env, runs) for args in COMMANDS}
+        
+        print(f"{rows} tasks, {runs} runs per command, median / p90 in ms")
+        print(f"  {'command':<44}{'direct':>18}{'daemon':>18}{'speedup':>9}")
+        for label, times in direct.items():
+            warm = served[label]
+            print(f"  {'gtd ' + label:<44}{percentile(times, 0.5):>9.0f} /{percentile(times, 0.9):>6.0f}"
+                  f"{percentile(warm, 0.5):>11.0f} /{percentile(warm, 0.9):>6.0f}"
+                  f"{percentile(times, 0.5) / percentile(warm, 0.5):>8.1f}x")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    if os.path.exists(socket_path):
+        print(f"daemon left {socket_path} behind")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
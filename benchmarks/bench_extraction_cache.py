@@ -0,0 +1,56 @@
+"""Measure LLM calls and latency saved by the extraction cache.
+
+Replays a corpus in which texts repeat, as forwarded emails and meeting
+notes do, through a StubLLM with a simulated per-call latency.
+
+Usage: python benchmarks/bench_extraction_cache.py [REQUESTS] [DISTINCT] [LATENCY_MS]
+"""
+import os
+import random
+import sys
+import time
+
+from common import make_task_db
+import extraction
+
+def corpus(requests: int, distinct: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    texts = [
+        f"Forwarded message {i}: please review the attached proposal for client {i} "
+        f"and send comments. This is important, deadline is next week."
+        for i in range(distinct)
+    ]
+    # Skewed reuse, with whitespace noise that normalization must absorb
+    return [rng.choice(texts[:max(1, distinct // 5)] if rng.random() < 0.6 else texts)
+            + " " * rng.randint(0, 2) for _ in range(requests)]
+
+def replay(texts: list, cached: bool, latency: float) -> tuple:
+    stub = extraction.StubLLM(latency=latency)
+    extraction.set_extraction_chain(stub)
+    start = time.perf_counter()
+    for text in texts:
+        if cached:
+            extraction.extract_task_info_with_llm(text)
+        else:
+            stub.invoke(text)
+    return stub.calls, time.perf_counter() - start
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 20) / 1000
+    
+    path = make_task_db(0)
+    try:
+        texts = corpus(requests, distinct)
+        for label, cached in (("no cache", False), ("cold cache", True), ("warm cache", True)):
+            calls, seconds = replay(texts, cached, latency)
+            print(f"{label:<12}{calls:>7} LLM calls{seconds:>9.2f} s total"
+                  f"{seconds * 1000 / requests:>9.2f} ms/request")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+if __name__ == "__main__":
+    main()
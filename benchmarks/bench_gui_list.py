@@ -0,0 +1,80 @@
+"""Time rendering and scrolling the GUI task list as the backlog grows.
+
+Builds GTDApp on a recording Flet connection (see bench_gui_refresh.py)
+for databases of increasing size, then times showing the list from the
+top, scrolling it a viewport at a time, and jumping to the middle and
+the end, as scroll events from the client would. Render times, bytes
+sent and the rows held as controls should not grow with the task count.
+
+Usage: python benchmarks/bench_gui_list.py [ROWS ...]
+"""
+import asyncio
+import os
+import sys
+import time
+import warnings
+from types import SimpleNamespace
+
+from flet.core.page import Page
+
+from bench_gui_refresh import RecordingConnection
+from common import make_task_db
+from load_test_server import percentile
+
+import database
+import gui
+
+def timed_send(conn: RecordingConnection, action) -> tuple:
+    conn.sent_bytes = 0
+    start = time.perf_counter()
+    action()
+    return (time.perf_counter() - start) * 1000, conn.sent_bytes
+
+def scroll(task_list: gui.TaskList, pixels: float):
+    task_list._on_scroll(SimpleNamespace(pixels=pixels, viewport_dimension=gui.LIST_HEIGHT))
+
+async def run(scrolls: int) -> dict:
+    conn = RecordingConnection()
+    page = Page(conn, "bench", asyncio.get_running_loop())
+    app = gui.GTDApp(page)
+    task_list = app.task_list
+    
+    def show_all():
+        app.filter_dropdown.value = "all"
+        app.filter_tasks(None)
+    
+    results = {"show list": [timed_send(conn, show_all)]}
+    results["scroll a viewport"] = [
+        timed_send(conn, lambda: scroll(task_list, step * gui.LIST_HEIGHT)) for step in range(1, scrolls + 1)
+    ]
+    middle = task_list.total // 2 * gui.ROW_HEIGHT
+    end = task_list.total * gui.ROW_HEIGHT - gui.LIST_HEIGHT
+    results["jump to middle"] = [timed_send(conn, lambda: scroll(task_list, middle))]
+    results["jump to end"] = [timed_send(conn, lambda: scroll(task_list, end))]
+    results["rows held"] = len(task_list.list_view.controls) - 2
+    return results
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    # Deprecation warnings from the GUI's use of older Flet properties
+    warnings.simplefilter("ignore", DeprecationWarning)
+    
+    for rows in sizes:
+        path = make_task_db(rows)
+        try:
+            results = asyncio.run(run(scrolls=20))
+        finally:
+            database.close_connection()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        
+        print(f"Task list with {rows} tasks, {results.pop('rows held')} rows held as controls")
+        for name, samples in results.items():
+            times = sorted(ms for ms, _ in samples)
+            sent = sorted(size for _, size in samples)
+            print(f"  {name:<20}{percentile(times, 0.5):>8.1f} ms  {percentile(sent, 0.5) / 1024:>7.1f} KB sent"
+                  + (f"  (median of {len(samples)}, p90 {percentile(times, 0.9):.1f} ms)" if len(samples) > 1 else ""))
+
+if __name__ == "__main__":
+    main()
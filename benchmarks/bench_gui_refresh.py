@@ -0,0 +1,99 @@
+"""Time completing one task in the GUI, and how much it sends to the client.
+
+Runs GTDApp on a Flet page whose connection processes control commands
+like the Flet socket server does, but only counts the bytes it would send.
+No Flet client is started, so times cover the Python side of an update:
+the database, building controls and diffing the control tree. Each
+completion marks the current top task done, as clicking its button would.
+
+Usage: python benchmarks/bench_gui_refresh.py [ROWS] [COMPLETIONS]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+import warnings
+
+from flet.core.local_connection import LocalConnection
+from flet.core.page import Page
+from flet.core.protocol import (
+    ClientActions, ClientMessage, CommandEncoder, PageCommandResponsePayload,
+    PageCommandsBatchResponsePayload,
+)
+
+from common import make_task_db
+from load_test_server import percentile
+
+import database
+import gui
+
+class RecordingConnection(LocalConnection):
+    """Handles page commands like the socket server but counts what it would send."""
+    
+    def __init__(self):
+        super().__init__()
+        self.sent_bytes = 0
+    
+    def send_command(self, session_id: str, command):
+        result, message = self._process_command(command)
+        if message:
+            self._record(message)
+        return PageCommandResponsePayload(result=result, error="")
+    
+    def send_commands(self, session_id: str, commands: list):
+        results = []
+        messages = []
+        for command in commands:
+            result, message = self._process_command(command)
+            if command.name in ("add", "get"):
+                results.append(result)
+            if message:
+                messages.append(message)
+        if messages:
+            self._record(ClientMessage(ClientActions.PAGE_CONTROLS_BATCH, messages))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+    
+    def _record(self, message):
+        self.sent_bytes += len(json.dumps(message, cls=CommandEncoder, separators=(",", ":")))
+
+async def run(completions: int) -> tuple:
+    conn = RecordingConnection()
+    page = Page(conn, "bench", asyncio.get_running_loop())
+    start = time.perf_counter()
+    app = gui.GTDApp(page)
+    startup = ((time.perf_counter() - start) * 1000, conn.sent_bytes)
+    
+    samples = []
+    for _ in range(completions):
+        task = database.get_highest_score_task(as_tasks=True)
+        conn.sent_bytes = 0
+        start = time.perf_counter()
+        app.mark_complete(task)
+        samples.append(((time.perf_counter() - start) * 1000, conn.sent_bytes))
+    return startup, samples
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    completions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    # Deprecation warnings from the GUI's use of older Flet properties
+    warnings.simplefilter("ignore", DeprecationWarning)
+    
+    path = make_task_db(rows)
+    try:
+        startup, samples = asyncio.run(run(completions))
+    finally:
+        database.close_connection()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    
+    times = sorted(ms for ms, _ in samples)
+    sent = sorted(size for _, size in samples)
+    print(f"GUI with {rows} tasks")
+    print(f"  first load          {startup[0]:>9.1f} ms  {startup[1] / 1024:>9.1f} KB sent")
+    print(f"  complete one task   {percentile(times, 0.5):>9.1f} ms  {percentile(sent, 0.5) / 1024:>9.1f} KB sent"
+          f"  (median of {completions}, p90 {percentile(times, 0.9):.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Time `gtd import` and `gtd export` on large files.
+
+Writes ROWS synthetic tasks as CSV and as JSON lines, then runs each
+command in its own process against a fresh database: an import into an
+empty table, a deduplicated re-import, and exports in both formats.
+Peak memory is reported to show it stays flat with the row count. Exits
+non-zero if the CSV import misses its budget.
+
+Usage: python benchmarks/bench_import_export.py [ROWS] [BUDGET_S]
+"""
+import datetime
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from load_test_server import ROOT
+
+def write_inputs(directory: str, rows: int) -> tuple:
+    random.seed(42)
+    today = datetime.date.today()
+    csv_path = os.path.join(directory, "tasks.csv")
+    jsonl_path = os.path.join(directory, "tasks.jsonl")
+    with open(csv_path, "w") as csv_file, open(jsonl_path, "w") as jsonl_file:
+        csv_file.write("title,description,due_date,effort,consequences,desire\n")
+        for i in range(rows):
+            due = (today + datetime.timedelta(days=random.randint(-10, 60))).isoformat() if i % 3 else ""
+            effort, consequences, desire = (random.randint(1, 10) for _ in range(3))
+            csv_file.write(f"Imported task {i},note {i},{due},{effort},{consequences},{desire}\n")
+            jsonl_file.write(json.dumps({"title": f"Imported jsonl task {i}", "due_date": due or None,
+                                         "effort": effort, "consequences": consequences}) + "\n")
+    return csv_path, jsonl_path
+
+def run(args: list, env: dict) -> tuple:
+    """Run a gtd command; returns (seconds, peak RSS in MB, last output line)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "main.py")] + args, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    stdout, stderr = proc.stdout.read(), proc.stderr.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    if status != 0:
+        raise RuntimeError(f"gtd {' '.join(args)} failed:\n{stderr[-2000:]}")
+    return elapsed, usage.ru_maxrss / 1024, stdout.strip().splitlines()[-1]
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else 60
+    
+    with tempfile.TemporaryDirectory(prefix="gtd-bulk-") as directory:
+        csv_path, jsonl_path = write_inputs(directory, rows)
+        env = dict(os.environ, GTD_DB_PATH=os.path.join(directory, "gtd.db"))
+        commands = (
+            (["import", csv_path], rows),
+            (["import", jsonl_path], rows),
+            (["import", csv_path, "--dedupe"], rows),
+            (["export", os.path.join(directory, "out.jsonl")], 2 * rows),
+            (["export", os.path.join(directory, "out.csv")], 2 * rows),
+        )
+        print(f"{rows} rows per input file")
+        results = []
+        for args, count in commands:
+            elapsed, peak, output = run(args, env)
+            results.append(elapsed)
+            label = " ".join(os.path.basename(arg) for arg in args)
+            print(f"  gtd {label:<28}{elapsed:>7.1f} s{count / elapsed:>10.0f} rows/s"
+                  f"  peak RSS {peak:>5.0f} MB  {output}")
+    
+    if results[0] > budget:
+        print(f"CSV import took {results[0]:.1f} s, over the {budget:.0f} s budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
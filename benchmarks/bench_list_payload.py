@@ -0,0 +1,74 @@
+"""Measure /tasks payload size and end-to-end latency with projection and compression.
+
+Serves a database of synthetic tasks from one gunicorn worker and fetches
+the full listing with and without ?fields= and Accept-Encoding. Cold
+requests use a unique URL to bypass the response cache. Latency includes
+reading, decompressing and parsing the body on the client.
+
+Usage: python benchmarks/bench_list_payload.py [ROWS]
+"""
+import gzip
+import http.client
+import json
+import os
+import subprocess
+import sys
+import time
+import zlib
+
+from common import make_task_db
+from load_test_server import ROOT, PORT, wait_until_ready
+
+REPEAT = 3
+CASES = (
+    ("all fields", "/tasks", None),
+    ("all fields", "/tasks", "gzip"),
+    ("all fields", "/tasks", "deflate"),
+    ("id,title,score,quadrant", "/tasks?fields=id,title,score,quadrant", None),
+    ("id,title,score,quadrant", "/tasks?fields=id,title,score,quadrant", "gzip"),
+)
+
+def fetch(path: str, encoding: str) -> tuple:
+    conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=120)
+    start = time.perf_counter()
+    conn.request("GET", path, headers={"Accept-Encoding": encoding or "identity"})
+    response = conn.getresponse()
+    body = response.read()
+    wire = len(body)
+    if response.getheader("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    elif response.getheader("Content-Encoding") == "deflate":
+        body = zlib.decompress(body)
+    count = len(json.loads(body))
+    elapsed = (time.perf_counter() - start) * 1000
+    conn.close()
+    return wire, count, elapsed
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    
+    path = make_task_db(rows)
+    env = dict(os.environ, GTD_DB_PATH=path)
+    args = [sys.executable, os.path.join(ROOT, "cli.py"), "server", "--host", "127.0.0.1",
+            "--port", str(PORT), "--workers", "1", "--threads", "2", "--timeout", "300"]
+    proc = subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(proc)
+        print(f"/tasks over {rows} tasks (best of {REPEAT})")
+        print(f"{'fields':<26}{'encoding':<10}{'wire size':>12}{'cold':>11}{'cached':>11}")
+        for n, (label, url, encoding) in enumerate(CASES):
+            separator = "&" if "?" in url else "?"
+            cold = min(fetch(f"{url}{separator}_={n}-{i}", encoding)[2] for i in range(REPEAT))
+            fetch(url, encoding)
+            wire, count, _ = fetch(url, encoding)
+            cached = min(fetch(url, encoding)[2] for _ in range(REPEAT))
+            print(f"{label:<26}{encoding or 'identity':<10}{wire / 1e6:>9.2f} MB{cold:>8.0f} ms{cached:>8.0f} ms")
+    finally:
+        proc.terminate()
+        proc.wait()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compare the MCP list_tasks response with dumping every task.
+
+Reports size (in estimated tokens) and time for the old behaviour,
+json.dumps(get_all_tasks()), against the first page of list_tasks and a
+page deep into the backlog, which should cost the same thanks to the
+keyset cursor.
+
+Usage: python benchmarks/bench_mcp_list_tasks.py [ROWS]
+"""
+import json
+import os
+import sys
+import time
+
+from common import make_task_db
+
+def timed(fn, repeat: int = 5) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    
+    path = make_task_db(rows)
+    try:
+        import database
+        from mcp_server import list_tasks_page as list_tasks, CHARS_PER_TOKEN
+        
+        everything, full_ms = timed(lambda: json.dumps(database.get_all_tasks()), repeat=2)
+        first, first_ms = timed(lambda: list_tasks())
+        
+        cursor = json.loads(first)["next_cursor"]
+        for _ in range(200):
+            cursor = json.loads(list_tasks(cursor=cursor))["next_cursor"]
+        deep, deep_ms = timed(lambda: list_tasks(cursor=cursor))
+        
+        print(f"{rows} tasks")
+        for label, text, ms in (("get_all_tasks()", everything, full_ms),
+                                ("list_tasks() first page", first, first_ms),
+                                ("list_tasks() page 202", deep, deep_ms)):
+            count = len(json.loads(text)) if text.startswith("[") else len(json.loads(text)["tasks"])
+            print(f"  {label:<26}{count:>8} tasks{len(text) // CHARS_PER_TOKEN:>10} tokens{ms:>10.2f} ms")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Time filling the four quadrant cards as the backlog grows.
+
+For databases of increasing size, times database.get_top_tasks_by_quadrant
+(a UNION ALL of per-quadrant index seeks) against the same top N per
+quadrant computed with a row_number() window over every open task, then
+times the dashboard refresh GTDApp runs after each task change, on a
+recording Flet connection (see bench_gui_refresh.py).
+
+Usage: python benchmarks/bench_quadrants.py [TOP_N] [ROWS ...]
+"""
+import asyncio
+import os
+import sys
+import warnings
+
+from flet.core.page import Page
+
+from bench_gui_refresh import RecordingConnection
+from common import make_task_db, timed
+
+import database
+import gui
+
+WINDOW_SQL = '''
+SELECT * FROM (
+    SELECT *, row_number() OVER (PARTITION BY quadrant ORDER BY score DESC, id) AS position
+    FROM tasks WHERE completed = 0
+) WHERE position <= ? ORDER BY quadrant, score DESC, id
+'''
+
+async def dashboard_refresh_ms() -> float:
+    page = Page(RecordingConnection(), "bench", asyncio.get_running_loop())
+    app = gui.GTDApp(page)
+    return timed(lambda: page.update(*app._reload_quadrants()), repeat=20)
+
+def main():
+    top_n = int(sys.argv[1]) if len(sys.argv) > 1 else gui.QUADRANT_PAGE_SIZE
+    sizes = [int(arg) for arg in sys.argv[2:]] or [1000, 10000, 100000]
+    # Deprecation warnings from the GUI's use of older Flet properties
+    warnings.simplefilter("ignore", DeprecationWarning)
+    
+    print(f"Top {top_n} open tasks per quadrant")
+    for rows in sizes:
+        path = make_task_db(rows)
+        try:
+            limits = {quadrant: top_n for quadrant in range(1, 5)}
+            grouped = timed(database.get_top_tasks_by_quadrant, limits, repeat=20)
+            window = timed(lambda: database.get_connection().execute(WINDOW_SQL, (top_n,)).fetchall())
+            refresh = asyncio.run(dashboard_refresh_ms())
+        finally:
+            database.close_connection()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        print(f"  {rows:>7} tasks  grouped query {grouped:>7.2f} ms  window function {window:>8.1f} ms"
+              f"  dashboard refresh {refresh:>6.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Check that `gtd getone` starts within its time budget.
+
+Runs `python -X importtime main.py getone` against a temporary database,
+reports wall time and the most expensive imports, and flags GUI, server
+or LLM modules that a CLI command should never load. Exits non-zero if
+the median wall time exceeds the budget.
+
+Usage: python benchmarks/bench_startup.py [ROWS] [BUDGET_MS]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from common import make_task_db
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 7
+# Modules only the GUI, the server or NLP extraction need
+HEAVY_MODULES = ("flet", "rumps", "flask", "gunicorn", "openai", "langchain",
+                 "langchain_openai", "InquirerPy", "prompt_toolkit", "numpy")
+
+def run_getone(db_path: str) -> tuple:
+    env = dict(os.environ, GTD_DB_PATH=db_path)
+    env.pop("OPENAI_API_KEY", None)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", os.path.join(ROOT, "main.py"), "getone"],
+                          env=env, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"getone failed:\n{proc.stderr[-2000:]}")
+    return elapsed, parse_importtime(proc.stderr)
+
+def parse_importtime(stderr: str) -> dict:
+    """Map each top-level import to its cumulative time in milliseconds."""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two spaces per level after the separator
+        imports[name[1:].rstrip()] = int(cumulative) / 1000
+    return imports
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else 250
+    
+    path = make_task_db(rows)
+    try:
+        run_getone(path)  # warm the page cache and bring scores up to date
+        results = [run_getone(path) for _ in range(RUNS)]
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    
+    wall = statistics.median(elapsed for elapsed, _ in results)
+    imports = results[-1][1]
+    top_level = {name: ms for name, ms in imports.items() if not name.startswith(" ")}
+    loaded = {name.strip().split(".")[0] for name in imports}
+    
+    print(f"gtd getone on {rows} tasks: median {wall:.0f} ms over {RUNS} runs (budget {budget:.0f} ms)")
+    print(f"imports: {sum(top_level.values()):.0f} ms in total; slowest top-level:")
+    for name, ms in sorted(top_level.items(), key=lambda item: -item[1])[:8]:
+        print(f"  {name:<28}{ms:>8.1f} ms")
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    print(f"heavy modules loaded: {', '.join(heavy) or 'none'}")
+    
+    if wall > budget or heavy:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
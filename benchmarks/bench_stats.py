@@ -0,0 +1,76 @@
+"""Time `gtd stats` aggregates against counting tasks in Python.
+
+Builds a database of ROWS synthetic tasks whose completed tasks were
+finished at random times over the past year, then times
+database.get_task_stats, which only reads the task_counts summary and
+index ranges, and a Python pass over every task computing the same
+counts. Exits non-zero if the median of get_task_stats misses its budget.
+
+Usage: python benchmarks/bench_stats.py [ROWS] [BUDGET_MS]
+"""
+import datetime
+import os
+import sqlite3
+import sys
+import time
+
+from common import make_task_db, timed
+from load_test_server import percentile
+
+import database
+
+def count_in_python() -> dict:
+    """The same counts the way the app computed them before: read every task."""
+    now_ts = int(time.time())
+    today = datetime.date.today()
+    today_ts = int(datetime.datetime.combine(today, datetime.time()).timestamp())
+    soon_ts = today_ts + (database.DUE_SOON_DAYS + 1) * 86400
+    stats = {"open": 0, "completed": 0, "quadrants": {1: 0, 2: 0, 3: 0, 4: 0},
+             "overdue": 0, "due_soon": 0, "effort": 0, "recent": 0}
+    for task in database.get_all_tasks(fields=["completed", "quadrant", "due_ts", "effort"]):
+        if task["completed"]:
+            stats["completed"] += 1
+            continue
+        stats["open"] += 1
+        stats["effort"] += task["effort"]
+        stats["quadrants"][task["quadrant"]] += 1
+        due_ts = task["due_ts"]
+        if due_ts is not None:
+            stats["overdue"] += due_ts < today_ts
+            stats["due_soon"] += today_ts <= due_ts < soon_ts
+    return stats
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    
+    path = make_task_db(rows)
+    try:
+        conn = sqlite3.connect(path)
+        now_ts = int(time.time())
+        conn.execute("UPDATE tasks SET completed_ts = ? - abs(random() % ?) WHERE completed = 1",
+                     (now_ts, 365 * 86400))
+        conn.commit()
+        conn.close()
+        
+        stats = database.get_task_stats()
+        samples = sorted(timed(database.get_task_stats, repeat=1) for _ in range(50))
+        python_ms = timed(count_in_python, repeat=1)
+        
+        print(f"{rows} tasks: {stats['open']} open, {stats['overdue']} overdue, "
+              f"{stats['due_soon']} due soon, {sum(d['count'] for d in stats['completed_per_week'])} "
+              f"completed in the last {len(stats['completed_per_week'])} weeks")
+        print(f"  get_task_stats       p50 {percentile(samples, 0.5):>8.2f} ms  p90 {percentile(samples, 0.9):>8.2f} ms")
+        print(f"  counting in Python       {python_ms:>8.0f} ms")
+    finally:
+        database.close_connection()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    
+    if percentile(samples, 0.5) > budget:
+        print(f"get_task_stats took {percentile(samples, 0.5):.2f} ms, over the {budget:.0f} ms budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
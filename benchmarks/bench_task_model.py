@@ -0,0 +1,113 @@
+"""Compare memory and construction time of the slotted Task with the old dataclass.
+
+Usage: python benchmarks/bench_task_model.py [ROWS]
+"""
+import os
+import sys
+import sqlite3
+import datetime
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+from common import make_task_db, timed
+from models import Task, FrozenTask
+
+@dataclass
+class LegacyTask:
+    """The dataclass-based Task model this benchmark compares against."""
+    id: Optional[int] = None
+    title: str = ""
+    description: Optional[str] = None
+    due_date: Optional[datetime.datetime] = None
+    completed: bool = False
+    effort: int = 5
+    consequences: int = 5
+    desire: int = 5
+    repetitions: int = 1
+    score: float = 0
+    pre_task: Optional[int] = None
+    created_at: Optional[datetime.datetime] = None
+    updated_at: Optional[datetime.datetime] = None
+    quadrant: Optional[int] = None
+    due_ts: Optional[int] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LegacyTask':
+        task_data = dict(data)
+        for date_field in ['due_date', 'created_at', 'updated_at']:
+            if task_data.get(date_field):
+                try:
+                    task_data[date_field] = datetime.datetime.fromisoformat(task_data[date_field])
+                except ValueError:
+                    task_data[date_field] = None
+        if 'completed' in task_data:
+            task_data['completed'] = bool(task_data['completed'])
+        return cls(**{k: v for k, v in task_data.items() if k in cls.__annotations__})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        result = vars(self).copy()
+        for date_field in ['due_date', 'created_at', 'updated_at']:
+            if result.get(date_field):
+                result[date_field] = result[date_field].isoformat()
+        if 'completed' in result:
+            result['completed'] = int(result['completed'])
+        return result
+
+def load_legacy(path: str) -> list:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    tasks = [LegacyTask.from_dict(dict(row)) for row in conn.execute('SELECT * FROM tasks')]
+    conn.close()
+    return tasks
+
+def load_slotted(path: str, cls=Task) -> list:
+    conn = sqlite3.connect(path)
+    conn.row_factory = cls.row_factory
+    tasks = conn.execute('SELECT * FROM tasks').fetchall()
+    conn.close()
+    return tasks
+
+def measure_memory(loader, *args, serialize: str = None) -> float:
+    """Return the memory retained by the loaded list in bytes per task.
+    
+    With `serialize` set, every task is serialized once before measuring,
+    as the /tasks endpoint does, so state created by serialization counts.
+    """
+    tracemalloc.start()
+    tasks = loader(*args)
+    if serialize:
+        for task in tasks:
+            getattr(task, serialize)()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(tasks)
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    path = make_task_db(rows)
+    try:
+        run(path, rows)
+    finally:
+        os.remove(path)
+
+def run(path: str, rows: int):
+    legacy = load_legacy(path)
+    slotted = load_slotted(path)
+    
+    print(f"{rows} tasks")
+    print(f"{'':<28}{'legacy':>12}{'slotted':>12}")
+    print(f"{'load rows (ms)':<28}{timed(load_legacy, path):>12.1f}{timed(load_slotted, path):>12.1f}")
+    print(f"{'load rows, frozen (ms)':<28}{'':>12}{timed(load_slotted, path, FrozenTask):>12.1f}")
+    print(f"{'serialize (ms)':<28}"
+          f"{timed(lambda: [t.to_dict() for t in legacy]):>12.1f}"
+          f"{timed(lambda: [t.to_json_dict() for t in slotted]):>12.1f}")
+    print(f"{'memory (bytes/task)':<28}"
+          f"{measure_memory(load_legacy, path):>12.0f}"
+          f"{measure_memory(load_slotted, path):>12.0f}")
+    print(f"{'memory after serialize':<28}"
+          f"{measure_memory(load_legacy, path, serialize='to_dict'):>12.0f}"
+          f"{measure_memory(load_slotted, path, serialize='to_json_dict'):>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Shared helpers for the benchmark scripts."""
+import os
+import sys
+import random
+import sqlite3
+import tempfile
+import time
+
+# Add the repository root to the path so we can import from local modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+def make_task_db(count: int, path: str = None, seed: int = 42) -> str:
+    """Create a database with `count` synthetic tasks and point `database` at it.
+    
+    Rows are scored and classified with the same functions the app uses.
+    Returns the database path.
+    """
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="gtd-bench-", suffix=".db")
+        os.close(fd)
+        os.remove(path)
+    
+    database.DB_PATH = path
+    database.init_db()
+    
+    rng = random.Random(seed)
+    now_ts = int(time.time())
+    conn = sqlite3.connect(path)
+    
+    batch = []
+    for i in range(count):
+        due_ts = now_ts + rng.randint(-10, 30) * 86400 if rng.random() < 0.6 else None
+        task = {
+            'due_ts': due_ts,
+            'effort': rng.randint(1, 10),
+            'consequences': rng.randint(1, 10),
+            'desire': rng.randint(1, 10),
+            'repetitions': rng.choice((1, 1, 1, 2, 3)),
+        }
+        due_date = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(due_ts)) if due_ts else None
+        batch.append((
+            f"Task {i}: follow up on item {rng.randint(1, 10000)}",
+            "Synthetic benchmark task " * rng.randint(0, 8) or None,
+            due_date, due_ts, int(rng.random() < 0.2),
+            task['effort'], task['consequences'], task['desire'], task['repetitions'],
+            database.calculate_score(task, now_ts), database.calculate_quadrant(task, now_ts),
+        ))
+        if len(batch) == 10000:
+            _insert(conn, batch)
+            batch = []
+    if batch:
+        _insert(conn, batch)
+    
+    conn.close()
+    return path
+
+def _insert(conn: sqlite3.Connection, rows: list):
+    conn.executemany('''
+    INSERT INTO tasks (title, description, due_date, due_ts, completed, effort,
+                       consequences, desire, repetitions, score, quadrant)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+
+def timed(func, *args, repeat: int = 5, **kwargs) -> float:
+    """Return the best wall time in milliseconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
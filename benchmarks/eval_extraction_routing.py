@@ -0,0 +1,104 @@
+"""Evaluate confidence-based routing between rule-based extraction and the LLM.
+
+For each threshold, reports how many inputs would go to the LLM compared
+with the old `len(text) >= 100` routing. It also reports how often the
+rule-based fields agree with the reference, for the inputs the rules
+keep. By default the reference is the hand-labelled corpus. With --llm it
+is the configured LLM's output, served through the extraction cache.
+
+Usage: python benchmarks/eval_extraction_routing.py [CORPUS.jsonl] [--llm]
+"""
+import datetime
+import json
+import os
+import sys
+
+from common import make_task_db
+from utils import extract_task_info_from_text, similarity_ratio
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "extraction_corpus.jsonl")
+THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.9)
+
+def load_corpus(path: str) -> list:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def labelled_reference(example: dict) -> dict:
+    due = example.get("due_in_days")
+    return {
+        "title": example["title"],
+        "due_date": (datetime.date.today() + datetime.timedelta(days=due)).isoformat() if due is not None else None,
+        "effort": example.get("effort"),
+    }
+
+def llm_reference(example: dict) -> dict:
+    from extraction import extract_task_info_with_llm
+    return extract_task_info_with_llm(example["text"])
+
+def same_day(due: str, ref_due: str) -> bool:
+    """Whether two due dates agree within a day; "next month" varies in length."""
+    if not due or not ref_due:
+        return not due and not ref_due
+    try:
+        days = (datetime.date.fromisoformat(due[:10]) - datetime.date.fromisoformat(ref_due[:10])).days
+    except ValueError:
+        return False
+    return abs(days) <= 1
+
+def agreement(extracted: dict, reference: dict) -> dict:
+    """Per-field agreement; effort is only judged where the reference has one."""
+    fields = {
+        "title": similarity_ratio(extracted.get("title") or "", reference.get("title") or "") >= 0.8,
+        "due_date": same_day(extracted.get("due_date"), reference.get("due_date")),
+    }
+    if reference.get("effort") is not None:
+        fields["effort"] = abs(int(extracted.get("effort", 5)) - int(reference["effort"])) <= 2
+    return fields
+
+def report(label: str, kept: list, total: int, by_length: int):
+    """Print LLM calls relative to length routing and rule agreement on the kept inputs."""
+    calls = total - len(kept)
+    change = calls / by_length - 1 if by_length else 0.0
+    rates = []
+    for field in ("title", "due_date", "effort"):
+        judged = [fields[field] for fields in kept if field in fields]
+        rates.append(f"{field} {sum(judged) / len(judged):>5.0%}" if judged else f"{field}   n/a")
+    print(f"{label:<18}{calls:>4} LLM calls ({change:+5.0%} vs length)"
+          f"  rule agreement on {len(kept):>3} kept: {', '.join(rates)}")
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    use_llm = "--llm" in sys.argv
+    corpus = load_corpus(args[0] if args else DEFAULT_CORPUS)
+    
+    path = None
+    if use_llm:
+        # The LLM reference goes through the persistent cache in a scratch database
+        path = make_task_db(0)
+    try:
+        reference = llm_reference if use_llm else labelled_reference
+        rows = []
+        for example in corpus:
+            extracted = extract_task_info_from_text(example["text"])
+            rows.append((example, extracted, agreement(extracted, reference(example))))
+    finally:
+        if path:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+    
+    total = len(rows)
+    by_length = sum(len(example["text"]) >= 100 for example, _, _ in rows)
+    print(f"{total} examples, reference: {'LLM' if use_llm else 'labels'}")
+    report("length >= 100", [fields for example, _, fields in rows if len(example["text"]) < 100], total, by_length)
+    for threshold in THRESHOLDS:
+        kept = [fields for _, extracted, fields in rows if extracted["confidence"] >= threshold]
+        report(f"confidence < {threshold:.1f}", kept, total, by_length)
+    
+    print("\nPer example (confidence, agreement):")
+    for example, extracted, fields in rows:
+        flags = " ".join(f"{name}={'ok' if ok else 'MISS'}" for name, ok in fields.items())
+        print(f"  {extracted['confidence']:.2f}  {flags:<40} {example['text'][:60]!r}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Measure /events delivery latency and memory per connected client.
+
+Starts one gunicorn worker with enough threads for every stream, opens
+CLIENTS event streams from a single selector loop, then creates tasks
+through the API. Reports how long each "created" event took to reach every
+client and how much the worker's resident memory grew per connection.
+
+Usage: python benchmarks/load_test_events.py [CLIENTS] [WRITES]
+"""
+import http.client
+import json
+import os
+import random
+import selectors
+import socket
+import subprocess
+import sys
+import time
+
+from common import make_task_db
+from load_test_server import ROOT, PORT, wait_until_ready, percentile
+
+def rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+def worker_pid(master_pid: int) -> int:
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return int(f.read().split()[0])
+
+def open_stream() -> socket.socket:
+    sock = socket.create_connection(("127.0.0.1", PORT))
+    sock.sendall(b"GET /events HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n")
+    sock.setblocking(False)
+    return sock
+
+def created_ids(buffer: bytes) -> list:
+    """Task IDs of the complete "created" messages in the buffer."""
+    ids = []
+    for message in buffer.split(b"\n\n"):
+        if b"event: created" in message:
+            for line in message.split(b"\n"):
+                if line.startswith(b"data: "):
+                    ids.append(json.loads(line[6:])["task_id"])
+    return ids
+
+def post_task(title: str) -> int:
+    conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=10)
+    conn.request("POST", "/task", body=json.dumps({"title": title}),
+                 headers={"Content-Type": "application/json"})
+    task_id = json.loads(conn.getresponse().read())["task_id"]
+    conn.close()
+    return task_id
+
+def run(db_path: str, clients: int, writes: int):
+    env = dict(os.environ, GTD_DB_PATH=db_path)
+    args = [sys.executable, os.path.join(ROOT, "cli.py"), "server", "--host", "127.0.0.1",
+            "--port", str(PORT), "--workers", "1", "--threads", str(clients + 8), "--backlog", "4096"]
+    proc = subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    selector = selectors.DefaultSelector()
+    try:
+        wait_until_ready(proc)
+        pid = worker_pid(proc.pid)
+        # Start the watcher so its cost isn't counted per connection
+        warmup = open_stream()
+        time.sleep(0.5)
+        baseline = rss_kb(pid)
+        
+        buffers = {}
+        for _ in range(clients):
+            sock = open_stream()
+            buffers[sock] = b""
+            selector.register(sock, selectors.EVENT_READ)
+        
+        # Wait until every stream has delivered its initial top_changed message
+        deadline = time.time() + 30
+        while time.time() < deadline and not all(b"top_changed" in data for data in buffers.values()):
+            for key, _ in selector.select(timeout=0.1):
+                buffers[key.fileobj] += key.fileobj.recv(65536)
+        time.sleep(0.5)
+        per_client = (rss_kb(pid) - baseline) / clients
+        
+        latencies = []
+        for i in range(writes):
+            sent = time.perf_counter()
+            task_id = post_task(f"SSE latency probe {i}")
+            waiting = set(buffers)
+            while waiting and time.perf_counter() - sent < 10:
+                for key, _ in selector.select(timeout=0.1):
+                    sock = key.fileobj
+                    buffers[sock] += sock.recv(65536)
+                    if sock in waiting and task_id in created_ids(buffers[sock]):
+                        latencies.append((time.perf_counter() - sent) * 1000)
+                        waiting.discard(sock)
+                        buffers[sock] = buffers[sock].rsplit(b"\n\n", 1)[-1]
+            # Jitter so writes don't phase-lock with the watcher's poll interval
+            time.sleep(random.uniform(0.2, 0.3))
+        
+        latencies.sort()
+        expected = clients * writes
+        print(f"{clients} clients, {writes} writes: {len(latencies)}/{expected} events delivered")
+        print(f"latency p50 {percentile(latencies, 0.5):.1f} ms, p99 {percentile(latencies, 0.99):.1f} ms, "
+              f"max {latencies[-1] if latencies else float('nan'):.1f} ms")
+        print(f"worker RSS {baseline / 1024:.1f} MB idle, +{per_client:.0f} KB per connection")
+        warmup.close()
+    finally:
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        proc.terminate()
+        proc.wait()
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    writes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    
+    path = make_task_db(1000)
+    try:
+        run(path, clients, writes)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+if __name__ == "__main__":
+    main()
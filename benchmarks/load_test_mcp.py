@@ -0,0 +1,121 @@
+"""Fire parallel MCP tool calls at the server through the SSE transport.
+
+Starts mcp_server.py against a temporary database and opens SESSIONS
+client sessions. Each session concurrently lists tasks, adds a batch of
+todos with create_tasks and completes them with complete_tasks. The test
+checks that every batch landed exactly once and reports per-tool latency.
+It also times 30 separate create_task calls against one create_tasks call.
+
+Usage: python benchmarks/load_test_mcp.py [SESSIONS] [ROUNDS]
+"""
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from common import make_task_db
+from load_test_server import ROOT, PORT, percentile
+
+BATCH = 30
+URL = f"http://127.0.0.1:{PORT}/sse"
+
+def wait_for_port(proc, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("MCP server exited during startup")
+        try:
+            socket.create_connection(("127.0.0.1", PORT), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("MCP server did not start")
+
+async def call(session: ClientSession, latencies: dict, tool: str, **arguments) -> str:
+    start = time.perf_counter()
+    result = await session.call_tool(tool, arguments)
+    latencies.setdefault(tool, []).append((time.perf_counter() - start) * 1000)
+    if result.isError:
+        raise RuntimeError(f"{tool} failed: {result.content[0].text}")
+    return result.content[0].text
+
+async def run_session(n: int, rounds: int, latencies: dict) -> int:
+    """Run `rounds` of list/create/complete with the three calls in flight together."""
+    created = 0
+    async with sse_client(URL) as streams, ClientSession(*streams) as session:
+        await session.initialize()
+        for r in range(rounds):
+            todos = [{"title": f"session {n} round {r} todo {i}", "effort": i % 10 + 1} for i in range(BATCH)]
+            listing, batch, _ = await asyncio.gather(
+                call(session, latencies, "list_tasks", limit=50),
+                call(session, latencies, "create_tasks", tasks=todos),
+                call(session, latencies, "list_tasks", status="all", fields="id,title"),
+            )
+            task_ids = json.loads(batch)["created"]
+            created += len(task_ids)
+            done = json.loads(await call(session, latencies, "complete_tasks", task_ids=task_ids))
+            assert done["completed"] == task_ids and not done["not_found"], done
+    return created
+
+async def compare_round_trips(latencies: dict) -> tuple:
+    async with sse_client(URL) as streams, ClientSession(*streams) as session:
+        await session.initialize()
+        start = time.perf_counter()
+        for i in range(BATCH):
+            await call(session, latencies, "create_task", title=f"single todo {i}", description="")
+        singles = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        await call(session, latencies, "create_tasks", tasks=[{"title": f"batched todo {i}"} for i in range(BATCH)])
+        batched = (time.perf_counter() - start) * 1000
+    return singles, batched
+
+async def run(sessions: int, rounds: int):
+    latencies = {}
+    start = time.perf_counter()
+    created = await asyncio.gather(*(run_session(n, rounds, latencies) for n in range(sessions)))
+    wall = time.perf_counter() - start
+    singles, batched = await compare_round_trips({})
+    
+    expected = sessions * rounds * BATCH
+    print(f"{sessions} sessions x {rounds} rounds in {wall:.2f} s: {sum(created)}/{expected} tasks created and completed")
+    for tool, values in sorted(latencies.items()):
+        values.sort()
+        print(f"  {tool:<16}{len(values):>5} calls  p50 {percentile(values, 0.5):7.1f} ms"
+              f"  p99 {percentile(values, 0.99):7.1f} ms")
+    print(f"{BATCH} todos: {singles:.0f} ms as separate create_task calls, {batched:.0f} ms as one create_tasks call")
+    return sum(created) == expected
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    
+    path = make_task_db(10_000)
+    env = dict(os.environ, GTD_DB_PATH=path, FASTMCP_HOST="127.0.0.1", FASTMCP_PORT=str(PORT),
+               FASTMCP_LOG_LEVEL="WARNING")
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "mcp_server.py")], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(proc)
+        ok = asyncio.run(run(sessions, rounds))
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            # uvicorn waits for SSE streams it still considers open
+            proc.kill()
+            proc.wait()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Check that MCP resource subscriptions fire only when the result changes.
+
+Starts mcp_server.py and opens SESSIONS sessions. Each one subscribes to
+gtd://tasks/top and gtd://quadrant/1. A writer session then adds
+low-priority tasks, adds urgent tasks and completes the top task. It reads
+both resources around each write. Every subscriber must get exactly one
+notification per resource whose contents changed, and none otherwise.
+Reports notification counts and delivery latency.
+
+Usage: python benchmarks/load_test_mcp_resources.py [SESSIONS] [WRITES]
+"""
+import asyncio
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from common import make_task_db
+from load_test_server import ROOT, PORT, percentile
+from load_test_mcp import URL, wait_for_port
+
+SUBSCRIBED = ("gtd://tasks/top", "gtd://quadrant/1")
+
+class RecordingSession(ClientSession):
+    """Client session that timestamps every resource update it receives."""
+    
+    def __init__(self, *args, received: list, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.received = received
+    
+    async def _received_notification(self, notification):
+        if notification.root.method == "notifications/resources/updated":
+            self.received.append((str(notification.root.params.uri), time.perf_counter()))
+
+async def subscriber(received: list, ready: asyncio.Event, done: asyncio.Event):
+    async with sse_client(URL) as streams, RecordingSession(*streams, received=received) as session:
+        await session.initialize()
+        for uri in SUBSCRIBED:
+            await session.subscribe_resource(uri)
+        ready.set()
+        
+        async def drain():
+            async for _ in session.incoming_messages:
+                pass
+        drainer = asyncio.create_task(drain())
+        await done.wait()
+        drainer.cancel()
+
+async def read_all(session: ClientSession) -> list:
+    return [(await session.read_resource(uri)).contents[0].text for uri in SUBSCRIBED]
+
+async def step(writer: ClientSession, received: list, tool: str, arguments: dict) -> tuple:
+    """Make one write and return (resources that changed, notification latencies in ms)."""
+    before = await read_all(writer)
+    marks = [len(r) for r in received]
+    sent = time.perf_counter()
+    await writer.call_tool(tool, arguments)
+    await asyncio.sleep(0.5)
+    changed = sum(a != b for a, b in zip(before, await read_all(writer)))
+    latencies = [(at - sent) * 1000 for n, r in enumerate(received) for _, at in r[marks[n]:]]
+    return changed, latencies
+
+async def run(sessions: int, writes: int) -> bool:
+    received = [[] for _ in range(sessions)]
+    ready = [asyncio.Event() for _ in range(sessions)]
+    done = asyncio.Event()
+    clients = [asyncio.create_task(subscriber(received[n], ready[n], done)) for n in range(sessions)]
+    for event in ready:
+        await event.wait()
+    
+    today = datetime.date.today().isoformat()
+    results = {}
+    async with sse_client(URL) as streams, ClientSession(*streams) as writer:
+        await writer.initialize()
+        for i in range(writes):
+            low = {"title": f"someday idea {i}", "effort": 1, "consequences": 1, "desire": 1}
+            results.setdefault("low-priority task added", []).append(
+                await step(writer, received, "create_tasks", {"tasks": [low]}))
+        for i in range(writes):
+            urgent = {"title": f"urgent fire {i}", "due_date": today, "effort": 10, "consequences": 10, "desire": 10}
+            results.setdefault("urgent task added", []).append(
+                await step(writer, received, "create_tasks", {"tasks": [urgent]}))
+        for i in range(writes):
+            top = json.loads((await writer.read_resource(SUBSCRIBED[0])).contents[0].text)["task"]
+            results.setdefault("top task completed", []).append(
+                await step(writer, received, "complete_tasks", {"task_ids": [top["id"]]}))
+    
+    done.set()
+    await asyncio.gather(*clients, return_exceptions=True)
+    
+    ok = True
+    print(f"{sessions} sessions subscribed to {', '.join(SUBSCRIBED)}")
+    for label, steps in results.items():
+        changed = sum(c for c, _ in steps)
+        latencies = sorted(ms for _, values in steps for ms in values)
+        expected = sessions * changed
+        ok = ok and len(latencies) == expected
+        timing = (f", p50 {percentile(latencies, 0.5):.1f} ms, p99 {percentile(latencies, 0.99):.1f} ms"
+                  if latencies else "")
+        print(f"  {writes} x {label:<24} {changed:>3} resource changes, "
+              f"{len(latencies)}/{expected} notifications{timing}")
+    return ok
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    writes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    
+    path = make_task_db(10_000)
+    env = dict(os.environ, GTD_DB_PATH=path, FASTMCP_HOST="127.0.0.1", FASTMCP_PORT=str(PORT),
+               FASTMCP_LOG_LEVEL="WARNING")
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "mcp_server.py")], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(proc)
+        ok = asyncio.run(run(sessions, writes))
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compare synchronous and queued /nlp/task under a burst of long inputs.
+
+Runs one gunicorn worker with 4 threads against a StubLLM with a simulated
+latency, fires a burst of NLP requests and measures /health meanwhile. In
+async mode it then polls every accepted job until it finishes.
+
+Usage: python benchmarks/load_test_nlp.py [BURST] [LATENCY_S]
+"""
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from common import make_task_db
+from load_test_server import ROOT, PORT, wait_until_ready, percentile
+
+TEXT = ("Forwarded from the client: please prepare the revised statement of work, "
+        "check the budget figures with finance and send it back. Deadline is next week. {}")
+
+def request(method: str, path: str, body: dict = None) -> tuple:
+    conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=120)
+    start = time.perf_counter()
+    conn.request(method, path, body=json.dumps(body) if body else None,
+                 headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response.status, json.loads(data) if data else None, (time.perf_counter() - start) * 1000
+
+def probe_health(stop: threading.Event, latencies: list):
+    while not stop.is_set():
+        latencies.append(request("GET", "/health")[2])
+        time.sleep(0.05)
+
+def burst(count: int, use_async: bool) -> list:
+    results = [None] * count
+    
+    def send(i):
+        results[i] = request("POST", "/nlp/task", {"text": TEXT.format(f"{use_async}-{i}"), "async": use_async})
+    
+    threads = [threading.Thread(target=send, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def run(db_path: str, use_async: bool, count: int, latency: float):
+    # A threshold above 1 sends every input through the (stub) LLM
+    env = dict(os.environ, GTD_DB_PATH=db_path, GTD_LLM_MODEL="stub",
+               GTD_LLM_STUB_LATENCY=str(latency), GTD_LLM_CONFIDENCE_THRESHOLD="1.1", GTD_NLP_WORKERS="2",
+               GTD_NLP_MAX_PENDING="8", GTD_NLP_JOB_TIMEOUT=str(latency * 6))
+    args = [sys.executable, os.path.join(ROOT, "cli.py"), "server", "--host", "127.0.0.1",
+            "--port", str(PORT), "--workers", "1", "--threads", "4", "--timeout", "120"]
+    proc = subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(proc)
+        stop, health = threading.Event(), []
+        prober = threading.Thread(target=probe_health, args=(stop, health))
+        prober.start()
+        
+        start = time.perf_counter()
+        results = burst(count, use_async)
+        statuses = {}
+        for status, _, _ in results:
+            statuses[status] = statuses.get(status, 0) + 1
+        
+        outcomes = {}
+        for status, body, _ in results:
+            if status != 202:
+                continue
+            while True:
+                _, job, _ = request("GET", f"/nlp/jobs/{body['job_id']}")
+                if job["status"] in ("succeeded", "failed"):
+                    outcome = job["status"] if not job["error"] else f"failed ({job['error']})"
+                    outcomes[outcome] = outcomes.get(outcome, 0) + 1
+                    break
+                time.sleep(0.1)
+        elapsed = time.perf_counter() - start
+        
+        stop.set()
+        prober.join()
+        health.sort()
+        print(f"{'async' if use_async else 'sync':<6} responses {statuses}, jobs {outcomes or '-'}, "
+              f"{elapsed:.1f}s; /health p50 {percentile(health, 0.5):.1f} ms, "
+              f"max {health[-1] if health else float('nan'):.1f} ms")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    
+    path = make_task_db(0)
+    try:
+        for use_async in (False, True):
+            run(path, use_async, count, latency)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Load test the HTTP API with the dev server and with 1, 2 and 4 workers.
+
+Each configuration is started as `cli.py server` in a subprocess against a
+temporary database, then hammered on /task/top and /tasks by client
+processes holding keep-alive connections.
+
+Usage: python benchmarks/load_test_server.py [ROWS] [CLIENTS] [SECONDS]
+"""
+import http.client
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+from common import make_task_db
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 5077
+ENDPOINTS = ("/task/top", "/tasks?completed=false&quadrant=1")
+
+def client(args):
+    """Request the endpoints in turn for `seconds`; return latencies in ms."""
+    path, seconds = args
+    conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=30)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=30)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    conn.close()
+    return latencies, errors
+
+def wait_until_ready(proc: subprocess.Popen, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=1)
+            conn.request("GET", "/health")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start in time")
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+def run(db_path: str, workers, clients: int, seconds: float):
+    args = [sys.executable, os.path.join(ROOT, "cli.py"), "server",
+            "--host", "127.0.0.1", "--port", str(PORT)]
+    if workers:
+        args += ["--workers", str(workers), "--threads", "4"]
+    env = dict(os.environ, GTD_DB_PATH=db_path)
+    # The API builds its LLM client at import; no request here reaches it
+    env.setdefault("OPENAI_API_KEY", "unused")
+
+    proc = subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(proc)
+        label = f"{workers} worker(s)" if workers else "dev server"
+        with multiprocessing.Pool(clients) as pool:
+            for path in ENDPOINTS:
+                results = pool.map(client, [(path, seconds)] * clients)
+                latencies = sorted(ms for result, _ in results for ms in result)
+                errors = sum(count for _, count in results)
+                print(f"{label:<14}{path:<38}{len(latencies) / seconds:>9.0f} req/s"
+                      f"{percentile(latencies, 0.5):>9.2f} ms p50"
+                      f"{percentile(latencies, 0.99):>9.2f} ms p99"
+                      f"{errors:>6} errors")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    path = make_task_db(rows)
+    print(f"{rows} tasks, {clients} concurrent clients, {seconds:g}s per endpoint")
+    try:
+        for workers in (None, 1, 2, 4):
+            run(path, workers, clients, seconds)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+if __name__ == "__main__":
+    main()
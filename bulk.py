@@ -0,0 +1,211 @@
+"""Stream tasks into and out of the database as CSV, TSV or JSON lines."""
+import csv
+import datetime
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Sequence, Tuple
+
+import database
+from models import TASK_FIELDS
+
+IMPORT_FORMATS = ("csv", "jsonl", "text")
+EXPORT_FORMATS = ("jsonl", "csv", "tsv")
+IMPORT_CHUNK_ROWS = 10000
+MAX_REPORTED_ERRORS = 20
+
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".txt": "text",
+}
+
+def detect_format(path: str, default: str = "jsonl") -> str:
+    """Guess the format of a file from its extension."""
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower(), default)
+
+def write_rows(rows: Iterable[Sequence[Any]], fields: List[str], output_format: str, out: IO[str]) -> int:
+    """Stream rows of `fields` to `out` as JSON lines, CSV or TSV; returns the row count."""
+    count = 0
+    if output_format == "jsonl":
+        dumps = json.dumps
+        write = out.write
+        for row in rows:
+            write(dumps(dict(zip(fields, row))))
+            write("\n")
+            count += 1
+        return count
+    writer = csv.writer(out, dialect="excel-tab" if output_format == "tsv" else "excel", lineterminator="\n")
+    writer.writerow(fields)
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+def read_records(f: IO[str], input_format: str) -> Iterator[Any]:
+    """Yield one dict per record; free-text lines become {"text": line}.
+    
+    JSON lines are yielded undecoded, so one bad line can be reported by
+    prepare_row instead of ending the whole import.
+    """
+    if input_format == "csv":
+        yield from csv.DictReader(f)
+    elif input_format == "jsonl":
+        for line in f:
+            if line.strip():
+                yield line
+    elif input_format == "text":
+        for line in f:
+            line = line.strip()
+            if line:
+                yield {"text": line}
+    else:
+        raise ValueError(f"Unknown import format: {input_format}")
+
+def _level(record: Dict[str, Any], name: str) -> int:
+    value = record.get(name)
+    if value is None or value == "":
+        return 5
+    level = int(value)
+    if not 1 <= level <= 10:
+        raise ValueError(f"{name} must be between 1 and 10")
+    return level
+
+def _completed_ts(record: Dict[str, Any], now_ts: int) -> int:
+    """When an imported completed task was completed, as epoch seconds.
+    
+    Uses the record's completed_ts, then its updated_at (as exports carry),
+    then the import time. Dates without a timezone are UTC, like SQLite's.
+    """
+    for name in ("completed_ts", "updated_at"):
+        value = record.get(name)
+        if value is None or value == "":
+            continue
+        if isinstance(value, (int, float)) or str(value).isdigit():
+            return int(value)
+        try:
+            moment = datetime.datetime.fromisoformat(str(value))
+        except ValueError:
+            raise ValueError(f"{name} must be epoch seconds or an ISO date")
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=datetime.timezone.utc)
+        return int(moment.timestamp())
+    return now_ts
+
+def prepare_row(record: Any, now_ts: int) -> Tuple[Any, ...]:
+    """Validate and score one record into a database.IMPORT_COLUMNS row.
+    
+    Records without a title but with free text are run through the rule
+    based extractor. Raises ValueError if the record is not a valid task.
+    """
+    if isinstance(record, str):
+        record = json.loads(record)
+    if not record.get("title") and record.get("text"):
+        from utils import extract_task_info_from_text
+        record = extract_task_info_from_text(record["text"])
+    
+    title = (record.get("title") or "").strip()
+    if not title:
+        raise ValueError("missing title")
+    due_date, due_ts = database.normalize_due_date(record.get("due_date") or None)
+    task = {
+        "due_ts": due_ts,
+        "effort": _level(record, "effort"),
+        "consequences": _level(record, "consequences"),
+        "desire": _level(record, "desire"),
+        "repetitions": int(record.get("repetitions") or 1),
+    }
+    completed = record.get("completed")
+    completed = 1 if completed not in (None, "", 0, "0", False, "false", "False") else 0
+    completed_ts = _completed_ts(record, now_ts) if completed else None
+    
+    return (
+        title, record.get("description") or None, due_date, due_ts,
+        task["effort"], task["consequences"], task["desire"], task["repetitions"], completed, completed_ts,
+        database.calculate_score(task, now_ts), database.calculate_quadrant(task, now_ts),
+    )
+
+@dataclass
+class ImportStats:
+    """Counts for one run of import_tasks."""
+    records: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    resumed_from: int = 0
+    errors: List[str] = field(default_factory=list)
+
+def import_tasks(path: str, input_format: str = None, chunk_size: int = IMPORT_CHUNK_ROWS,
+                 dedupe: bool = False, resume: bool = True,
+                 on_chunk: Callable[[ImportStats], None] = None) -> ImportStats:
+    """Import tasks from a CSV, JSON lines or free-text file in chunked transactions.
+    
+    Memory use is bounded by the chunk size. Progress is committed with
+    every chunk under an app_state key for the file, so running the same
+    import again after an interruption resumes after the last committed
+    chunk unless resume is False. Reading from "-" (stdin) can't resume.
+    """
+    input_format = input_format or detect_format(path)
+    stats = ImportStats()
+    state_key = None
+    if path != "-":
+        info = os.stat(path)
+        state_key = f"import:{os.path.abspath(path)}"
+        fingerprint = [info.st_size, info.st_mtime_ns]
+        saved = database.get_state(state_key)
+        if saved and resume:
+            progress = json.loads(saved)
+            if progress["file"] == fingerprint:
+                stats.resumed_from = progress["records"]
+    
+    now_ts = int(time.time())
+    chunk = []
+    
+    def flush():
+        state = None
+        if state_key is not None:
+            state = (state_key, json.dumps({"file": fingerprint, "records": stats.records}))
+        inserted = database.import_task_rows(chunk, dedupe=dedupe, state=state)
+        stats.inserted += inserted
+        stats.duplicates += len(chunk) - inserted
+        chunk.clear()
+        if on_chunk is not None:
+            on_chunk(stats)
+    
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+    try:
+        for number, record in enumerate(read_records(f, input_format), 1):
+            stats.records = number
+            if number <= stats.resumed_from:
+                continue
+            try:
+                chunk.append(prepare_row(record, now_ts))
+            except (ValueError, TypeError, AttributeError) as e:
+                stats.invalid += 1
+                if len(stats.errors) < MAX_REPORTED_ERRORS:
+                    stats.errors.append(f"record {number}: {e}")
+            if len(chunk) >= chunk_size:
+                flush()
+        flush()
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    
+    if state_key is not None:
+        database.delete_state(state_key)
+    return stats
+
+def export_tasks(path: str, output_format: str = None, fields: List[str] = None,
+                 completed: bool = None, quadrant: int = None) -> int:
+    """Stream tasks to a file (or "-" for stdout); returns the number written."""
+    output_format = output_format or detect_format(path)
+    fields = fields or list(TASK_FIELDS)
+    rows = database.iter_tasks(fields, completed=completed, quadrant=quadrant)
+    if path == "-":
+        return write_rows(rows, fields, output_format, sys.stdout)
+    with open(path, "w", encoding="utf-8", newline="") as out:
+        return write_rows(rows, fields, output_format, out)
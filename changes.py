@@ -0,0 +1,192 @@
+"""Watch the database for committed changes and fan them out to listeners."""
+import bisect
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import database
+
+logger = logging.getLogger(__name__)
+
+WATCH_INTERVAL_SECONDS = float(os.environ.get("GTD_WATCH_INTERVAL", 0.05))
+
+class ChangeWatcher:
+    """Polls PRAGMA data_version on one connection and reads new task events.
+    
+    data_version only moves when another connection commits, so an idle
+    database costs one pragma per interval no matter how many listeners
+    are subscribed. Listeners are called on the watcher thread with each
+    batch of new task_events rows, oldest first.
+    """
+    
+    def __init__(self, interval: float = WATCH_INTERVAL_SECONDS):
+        self.interval = interval
+        self.latest_seq = database.get_change_counter()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._version = None
+    
+    def subscribe(self, listener: Callable[[List[Dict[str, Any]]], None]) -> Callable[[], None]:
+        """Register a listener and return a function that unregisters it."""
+        with self._lock:
+            self._listeners.append(listener)
+        
+        def unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+        return unsubscribe
+    
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="change-watcher", daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+    
+    def check(self) -> bool:
+        """Deliver new events if the database was committed to since the last check.
+        
+        start() calls this every interval on the watcher thread; callers
+        with a timer of their own can call it instead. data_version is per
+        connection, so checks must all come from the same thread.
+        """
+        current = database.get_connection().execute('PRAGMA data_version').fetchone()[0]
+        if current == self._version:
+            return False
+        # The first check has nothing to compare with and looks for events anyway
+        self._version = current
+        self.poll()
+        return True
+    
+    def poll(self):
+        """Deliver any events logged since the last delivery."""
+        while True:
+            events = database.get_task_events_since(self.latest_seq)
+            if not events:
+                return
+            self.latest_seq = events[-1]['seq']
+            with self._lock:
+                listeners = list(self._listeners)
+            for listener in listeners:
+                try:
+                    listener(events)
+                except Exception:
+                    # One broken listener must not starve the others
+                    logger.exception("Change listener failed")
+
+def format_sse(event: str, data: Dict[str, Any], event_id: int = None) -> str:
+    """Render one Server-Sent Events message."""
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+def render_events(events: List[Dict[str, Any]]) -> List[Tuple[int, str]]:
+    """Render task events as (seq, message) pairs, with the tasks as they are now."""
+    task_ids = list({event['task_id'] for event in events if event['task_id'] is not None})
+    tasks = {task.id: task.to_json_dict() for task in database.get_tasks_by_ids(task_ids)}
+    return [
+        (event['seq'], format_sse(event['kind'], {
+            "seq": event['seq'],
+            "task_id": event['task_id'],
+            "task": tasks.get(event['task_id']),
+        }, event['seq']))
+        for event in events
+    ]
+
+class EventBroadcaster:
+    """Keeps recently rendered events so any number of clients can read them.
+    
+    Each batch is rendered once, and a "top_changed" message is added when
+    the highest priority task changes. Clients only hold the sequence
+    number they have read up to, and wait on a shared condition.
+    """
+    
+    def __init__(self, watcher: ChangeWatcher, maxlen: int = 10000):
+        self.maxlen = maxlen
+        self._seqs = []
+        self._messages = []
+        self._cond = threading.Condition()
+        # Everything up to base_seq is only available from the database
+        self.base_seq = watcher.latest_seq
+        self.latest_seq = watcher.latest_seq
+        self._top = self._current_top()
+        watcher.subscribe(self._publish)
+    
+    def _current_top(self) -> Optional[Tuple[int, float]]:
+        task = database.get_highest_score_task(as_tasks=True)
+        return (task.id, task.score) if task else None
+    
+    def top_message(self, event_id: int = None) -> str:
+        """The current top task as a "top_changed" message."""
+        task = database.get_highest_score_task(as_tasks=True)
+        return format_sse("top_changed", {"task": task.to_json_dict() if task else None}, event_id)
+    
+    def _publish(self, events: List[Dict[str, Any]]):
+        messages = render_events(events)
+        top = self._current_top()
+        if top != self._top:
+            self._top = top
+            # Numbered like the batch it follows, so resuming never repeats it
+            messages.append((events[-1]['seq'], self.top_message(events[-1]['seq'])))
+        
+        with self._cond:
+            for seq, message in messages:
+                self._seqs.append(seq)
+                self._messages.append(message)
+            if len(self._seqs) > 2 * self.maxlen:
+                # Trim in bulk so appends stay amortized O(1)
+                drop = len(self._seqs) - self.maxlen
+                self.base_seq = self._seqs[drop - 1]
+                del self._seqs[:drop]
+                del self._messages[:drop]
+            self.latest_seq = events[-1]['seq']
+            self._cond.notify_all()
+    
+    def read_after(self, seq: int, timeout: float) -> List[Tuple[int, str]]:
+        """(seq, message) pairs after `seq`, waiting up to `timeout` seconds for new ones.
+        
+        When the changes right after `seq` were already pruned from the log,
+        a single "reset" message tells the client to reload everything and
+        resume from its ID.
+        """
+        if seq < self.base_seq:
+            # Older than the buffer: replay from the change log if it still has them
+            oldest = database.get_oldest_event_seq()
+            if oldest is not None and seq < oldest - 1:
+                latest = database.get_change_counter()
+                return [(latest, format_sse("reset", {"seq": latest}, latest))]
+            return render_events(database.get_task_events_since(seq))
+        
+        with self._cond:
+            if self.latest_seq <= seq:
+                self._cond.wait(timeout)
+            start = bisect.bisect_right(self._seqs, seq)
+            return list(zip(self._seqs[start:], self._messages[start:]))
+
+_broadcaster = None
+_broadcaster_pid = None
+_broadcaster_lock = threading.Lock()
+
+def get_broadcaster() -> EventBroadcaster:
+    """Get this process's broadcaster, starting its watcher on first use."""
+    global _broadcaster, _broadcaster_pid
+    with _broadcaster_lock:
+        if _broadcaster is None or _broadcaster_pid != os.getpid():
+            watcher = ChangeWatcher()
+            _broadcaster = EventBroadcaster(watcher)
+            watcher.start()
+            _broadcaster_pid = os.getpid()
+        return _broadcaster
@@ -2,14 +2,16 @@ from traceback import print_stack
 import typer
 from typing import Optional
 from datetime import datetime
+import itertools
 import json
+import os
+import sys
 from rich.console import Console
 from rich.table import Table
-from InquirerPy import prompt
-from InquirerPy.validator import EmptyInputValidator
 
+import bulk
 import database
-from models import Task, Quadrant
+from models import Task, Quadrant, ScoringProfile, TASK_FIELDS
 
 app = typer.Typer()
 console = Console()
@@ -52,16 +54,20 @@ def create_task(
         console.print(f"[bold red]Error creating task:[/] {str(e)}")
 
 @app.command("getone")
-def get_highest_priority_task():
+def get_highest_priority_task(
+    profile: Optional[str] = typer.Option(None, "--profile", help="Rank with this scoring profile"),
+):
     """Get the highest priority task."""
-    task_data = database.get_highest_score_task()
+    try:
+        task = database.get_highest_score_task(as_tasks=True, profile=profile)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/] {str(e)}")
+        return
     
-    if not task_data:
+    if not task:
         console.print("[yellow]No tasks found.[/]")
         return
     
-    task = Task.from_dict(task_data)
-    
     table = Table(title=f"Task #{task.id}: {task.title}")
     
     table.add_column("Field", style="cyan")
@@ -77,48 +83,170 @@ def get_highest_priority_task():
     
     console.print(table)
 
+# Columns shown by the table view, read straight from the database
+_TABLE_FIELDS = ['id', 'title', 'due_date', 'score', 'quadrant', 'completed']
+_QUADRANT_NAMES = {q.value: q.name.replace("_", " ") for q in Quadrant}
+# Rows rendered per table chunk; chunks share fixed column widths so they line up
+LIST_CHUNK_ROWS = 200
+
+def _task_table_chunks(rows, title: str = "Tasks"):
+    """Render rows of _TABLE_FIELDS as a sequence of aligned rich Tables."""
+    from rich import box
+    
+    def new_table(first: bool) -> Table:
+        table = Table(title=title if first else None, show_header=first, box=box.SIMPLE_HEAD,
+                      pad_edge=False, expand=True)
+        table.add_column("ID", style="cyan", justify="right", width=7)
+        table.add_column("Title", style="green", ratio=1, no_wrap=True, overflow="ellipsis")
+        table.add_column("Due Date", style="blue", width=10)
+        table.add_column("Score", justify="right", width=6)
+        table.add_column("Quadrant", style="magenta", width=24)
+        table.add_column("Status", style="yellow", width=6)
+        return table
+    
+    table = new_table(True)
+    for task_id, title, due_date, score, quadrant, completed in rows:
+        table.add_row(
+            str(task_id),
+            title,
+            due_date[:10] if due_date else "N/A",
+            f"{score:.2f}",
+            _QUADRANT_NAMES.get(quadrant, ""),
+            "✓" if completed else "○",
+        )
+        if table.row_count == LIST_CHUNK_ROWS:
+            yield table
+            table = new_table(False)
+    if table.row_count or table.show_header:
+        yield table
+
+def _page_output(chunks):
+    """Feed rendered chunks to $PAGER as they are produced, stopping when it quits."""
+    import shlex
+    import subprocess
+    
+    pager = subprocess.Popen(shlex.split(os.environ.get("PAGER", "less -RFX")),
+                             stdin=subprocess.PIPE, text=True, encoding="utf-8")
+    page_console = Console(file=pager.stdin, force_terminal=console.is_terminal,
+                           width=console.width, color_system=console.color_system)
+    try:
+        for chunk in chunks:
+            page_console.print(chunk)
+            pager.stdin.flush()
+        pager.stdin.close()
+    except BrokenPipeError:
+        # The pager was closed before the end of the list
+        pass
+    pager.wait()
+
 @app.command("list")
 def list_tasks(
     all: bool = typer.Option(False, "--all", "-a", help="Show all tasks including completed"),
     completed: bool = typer.Option(False, "--completed", "-c", help="Show only completed tasks"),
+    quadrant: Optional[int] = typer.Option(None, "--quadrant", "-q", min=1, max=4, help="Show only tasks in this quadrant (1-4)"),
+    profile: Optional[str] = typer.Option(None, "--profile", help="Rank with this scoring profile"),
+    limit: Optional[int] = typer.Option(None, "--limit", "-n", min=0, help="Show at most this many tasks"),
+    offset: int = typer.Option(0, "--offset", min=0, help="Skip this many tasks first"),
+    output_format: str = typer.Option("table", "--format", "-f", help="Output format: table, jsonl, csv or tsv"),
+    fields: Optional[str] = typer.Option(None, "--fields", help="Comma-separated fields for jsonl/csv/tsv (default: all)"),
+    pager: bool = typer.Option(False, "--pager", help="Page the table, rendering it as you scroll"),
 ):
-    """List all tasks, filtered by completion status."""
+    """List all tasks, filtered by completion status and quadrant."""
     completed_filter = None
     if not all:
         completed_filter = True if completed else False
     
-    tasks = database.get_all_tasks(completed=completed_filter)
+    if output_format != "table" and output_format not in bulk.EXPORT_FORMATS:
+        console.print(f"[bold red]Error:[/] Unknown format '{output_format}'. Use table, jsonl, csv or tsv.")
+        raise typer.Exit(1)
+    
+    try:
+        if output_format == "table":
+            columns = _TABLE_FIELDS
+        else:
+            columns = database.parse_fields(fields) if fields else list(TASK_FIELDS)
+        rows = database.iter_tasks(columns, completed=completed_filter, quadrant=quadrant,
+                                   profile=profile, limit=limit, offset=offset)
+        first = next(rows, None)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/] {str(e)}")
+        raise typer.Exit(1)
     
-    if not tasks:
+    if first is None and output_format == "table":
         console.print("[yellow]No tasks found.[/]")
         return
+    rows = itertools.chain([] if first is None else [first], rows)
     
-    table = Table(title="Tasks")
+    try:
+        if output_format != "table":
+            bulk.write_rows(rows, columns, output_format, sys.stdout)
+            sys.stdout.flush()
+        elif pager:
+            _page_output(_task_table_chunks(rows))
+        else:
+            for chunk in _task_table_chunks(rows):
+                console.print(chunk)
+    except BrokenPipeError:
+        # The reader went away (e.g. `gtd list | head`); silence the flush at exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        raise typer.Exit(0)
+
+@app.command("import")
+def import_tasks(
+    path: str = typer.Argument(..., help="CSV, JSON lines or text file to import, or - for stdin"),
+    input_format: Optional[str] = typer.Option(None, "--format", "-f", help="csv, jsonl or text (one task per line); default from the file extension"),
+    chunk_size: int = typer.Option(bulk.IMPORT_CHUNK_ROWS, "--chunk-size", min=1, help="Rows per transaction"),
+    dedupe: bool = typer.Option(False, "--dedupe", help="Skip tasks whose title matches an open task"),
+    restart: bool = typer.Option(False, "--restart", help="Ignore progress saved by an interrupted import of this file"),
+):
+    """Import tasks from a file, resuming an interrupted import of the same file."""
+    if input_format is not None and input_format not in bulk.IMPORT_FORMATS:
+        console.print(f"[bold red]Error:[/] Unknown format '{input_format}'. Use csv, jsonl or text.")
+        raise typer.Exit(1)
     
-    table.add_column("ID", style="cyan", justify="right")
-    table.add_column("Title", style="green")
-    table.add_column("Due Date", style="blue")
-    table.add_column("Score", justify="right")
-    table.add_column("Quadrant", style="magenta")
-    table.add_column("Status", style="yellow")
+    def report(stats):
+        console.print(f"[dim]{stats.records} records read, {stats.inserted} imported[/]", end="\r")
     
-    for task_data in tasks:
-        task = Task.from_dict(task_data)
-        
-        due_date_str = task.due_date.strftime("%Y-%m-%d") if task.due_date else "N/A"
-        status = "✓" if task.completed else "○"
-        quadrant = task.get_quadrant().name.replace("_", " ")
-        
-        table.add_row(
-            str(task.id),
-            task.title,
-            due_date_str,
-            f"{task.score:.2f}",
-            quadrant,
-            status
-        )
+    try:
+        stats = bulk.import_tasks(path, input_format, chunk_size=chunk_size, dedupe=dedupe,
+                                  resume=not restart, on_chunk=report if console.is_terminal else None)
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error:[/] {str(e)}")
+        raise typer.Exit(1)
     
-    console.print(table)
+    if stats.resumed_from:
+        console.print(f"[yellow]Resumed after record {stats.resumed_from}.[/]")
+    console.print(f"[bold green]Imported {stats.inserted} tasks[/] from {stats.records} records "
+                  f"({stats.duplicates} duplicates, {stats.invalid} invalid).")
+    for error in stats.errors:
+        console.print(f"[red]  {error}[/]")
+    if stats.invalid > len(stats.errors):
+        console.print(f"[red]  ... and {stats.invalid - len(stats.errors)} more[/]")
+
+@app.command("export")
+def export_tasks(
+    path: str = typer.Argument("-", help="File to write, or - for stdout"),
+    output_format: Optional[str] = typer.Option(None, "--format", "-f", help="jsonl, csv or tsv; default from the file extension"),
+    all: bool = typer.Option(True, "--all/--open", help="Export all tasks or only open ones"),
+    quadrant: Optional[int] = typer.Option(None, "--quadrant", "-q", min=1, max=4, help="Only tasks in this quadrant (1-4)"),
+    fields: Optional[str] = typer.Option(None, "--fields", help="Comma-separated fields (default: all)"),
+):
+    """Export tasks to a CSV, TSV or JSON lines file."""
+    output_format = output_format or bulk.detect_format(path)
+    if output_format not in bulk.EXPORT_FORMATS:
+        console.print(f"[bold red]Error:[/] Unknown format '{output_format}'. Use jsonl, csv or tsv.")
+        raise typer.Exit(1)
+    
+    try:
+        columns = database.parse_fields(fields) if fields else None
+        count = bulk.export_tasks(path, output_format, columns, completed=None if all else False, quadrant=quadrant)
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error:[/] {str(e)}")
+        raise typer.Exit(1)
+    
+    if path != "-":
+        console.print(f"[bold green]Exported {count} tasks[/] to {path}.")
 
 @app.command("done")
 def complete_task(task_id: int = typer.Argument(..., help="ID of the task to complete")):
@@ -130,6 +258,54 @@ def complete_task(task_id: int = typer.Argument(..., help="ID of the task to com
     else:
         console.print(f"[bold red]Failed to mark task {task_id} as complete. Task may not exist.[/]")
 
+@app.command("stats")
+def show_stats(
+    days: int = typer.Option(7, "--days", min=1, max=366, help="Show completions for this many days"),
+    weeks: int = typer.Option(4, "--weeks", min=1, max=104, help="Show completions for this many weeks"),
+    soon: int = typer.Option(database.DUE_SOON_DAYS, "--soon", min=0, max=366, help="Days ahead that count as due soon"),
+    output_format: str = typer.Option("table", "--format", "-f", help="Output format: table or json"),
+):
+    """Show task counts by quadrant, due dates and recent completions."""
+    if output_format not in ("table", "json"):
+        console.print(f"[bold red]Error:[/] Unknown format '{output_format}'. Use table or json.")
+        raise typer.Exit(1)
+    
+    stats = database.get_task_stats(days=days, weeks=weeks, soon_days=soon)
+    if output_format == "json":
+        print(json.dumps(stats))
+        return
+    
+    summary = Table(title="Tasks")
+    summary.add_column("Open", justify="right", style="cyan")
+    summary.add_column("Completed", justify="right", style="green")
+    summary.add_column("Overdue", justify="right", style="red")
+    summary.add_column(f"Due within {soon} days", justify="right", style="yellow")
+    summary.add_column("Avg Effort", justify="right")
+    average = stats["average_effort"]
+    summary.add_row(str(stats["open"]), str(stats["completed"]), str(stats["overdue"]),
+                    str(stats["due_soon"]), f"{average:.1f}" if average is not None else "N/A")
+    console.print(summary)
+    
+    quadrants = Table(title="Open Tasks by Quadrant")
+    quadrants.add_column("Quadrant", style="magenta")
+    quadrants.add_column("Tasks", justify="right")
+    for value, count in stats["quadrants"].items():
+        quadrants.add_row(_QUADRANT_NAMES[value], str(count))
+    console.print(quadrants)
+    
+    completions = Table(title="Completed")
+    completions.add_column("Day", style="blue")
+    completions.add_column("Tasks", justify="right")
+    completions.add_column("Week of", style="blue")
+    completions.add_column("Tasks", justify="right")
+    per_day, per_week = stats["completed_per_day"], stats["completed_per_week"]
+    for day, week in itertools.zip_longest(per_day, per_week):
+        completions.add_row(
+            day["date"] if day else "", str(day["count"]) if day else "",
+            week["week_start"] if week else "", str(week["count"]) if week else "",
+        )
+    console.print(completions)
+
 @app.command("edit")
 def edit_task(
     task_id: int = typer.Argument(..., help="ID of the task to edit"),
@@ -174,6 +350,9 @@ def edit_task(
     
     # If no updates were specified, use interactive mode
     if not updates:
+        # Imported here so non-interactive commands start quickly
+        from InquirerPy import prompt
+        
         task = Task.from_dict(task_data)
         
         questions = [
@@ -246,9 +425,109 @@ def edit_task(
     else:
         console.print("[yellow]No changes made to the task.[/]")
 
+@app.command("profile")
+def scoring_profile(
+    name: Optional[str] = typer.Argument(None, help="Profile to show, create or update"),
+    effort: Optional[float] = typer.Option(None, "--effort-weight", help="Weight of the effort score"),
+    consequences: Optional[float] = typer.Option(None, "--consequences-weight", help="Weight of the consequences score"),
+    desire: Optional[float] = typer.Option(None, "--desire-weight", help="Weight of the desire score"),
+    repetitions: Optional[float] = typer.Option(None, "--repetitions-weight", help="Weight of each repetition"),
+    due_buckets: Optional[str] = typer.Option(None, "--due-buckets", help="Due date points as DAYS:POINTS pairs, e.g. 0:10,2:8,7:5"),
+    later_due: Optional[float] = typer.Option(None, "--later-due-points", help="Points for tasks due after the last bucket"),
+):
+    """List scoring profiles, or show, create and update one."""
+    if name is None:
+        for profile_name in database.list_scoring_profiles():
+            console.print(profile_name)
+        return
+    
+    profile = database.get_scoring_profile(name) or ScoringProfile(name)
+    updates = {
+        'effort_weight': effort,
+        'consequences_weight': consequences,
+        'desire_weight': desire,
+        'repetitions_weight': repetitions,
+        'later_due_points': later_due,
+    }
+    for key, value in updates.items():
+        if value is not None:
+            setattr(profile, key, value)
+    
+    if due_buckets is not None:
+        try:
+            profile.due_buckets = sorted(
+                (int(days), float(points))
+                for days, points in (bucket.split(":") for bucket in due_buckets.split(","))
+            )
+        except ValueError:
+            console.print(f"[bold red]Error:[/] Invalid due buckets. Use DAYS:POINTS pairs, e.g. 0:10,2:8,7:5.")
+            return
+    
+    if any(value is not None for value in updates.values()) or due_buckets is not None:
+        database.save_scoring_profile(profile)
+        console.print(f"[bold green]Scoring profile '{name}' saved.[/]")
+    
+    table = Table(title=f"Scoring profile: {profile.name}")
+    table.add_column("Field", style="cyan")
+    table.add_column("Value", style="green")
+    
+    table.add_row("Effort weight", str(profile.effort_weight))
+    table.add_row("Consequences weight", str(profile.consequences_weight))
+    table.add_row("Desire weight", str(profile.desire_weight))
+    table.add_row("Repetitions weight", str(profile.repetitions_weight))
+    table.add_row("Due buckets", ", ".join(f"<= {days}d: {points}" for days, points in profile.due_buckets))
+    table.add_row("Later due points", str(profile.later_due_points))
+    
+    console.print(table)
+
+@app.command("server")
+def run_server(
+    host: str = typer.Option("0.0.0.0", "--host", help="Address to bind"),
+    port: int = typer.Option(5000, "--port", "-p", help="Port to listen on"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", help="Number of worker processes (enables the prefork server)"),
+    threads: int = typer.Option(4, "--threads", help="Threads per worker process"),
+    backlog: int = typer.Option(2048, "--backlog", help="Maximum number of pending connections"),
+    timeout: int = typer.Option(30, "--timeout", help="Seconds before a silent worker is restarted"),
+    max_streams: Optional[int] = typer.Option(None, "--max-streams", help="Event streams per worker process (default: half the threads)"),
+):
+    """Start the HTTP API server."""
+    # Imported here so other commands don't pay for Flask and LangChain
+    import server
+    
+    if workers is None:
+        server.start_server(host=host, port=port)
+    else:
+        try:
+            server.start_production_server(host=host, port=port, workers=workers,
+                                           threads=threads, backlog=backlog, timeout=timeout,
+                                           max_streams=max_streams)
+        except ValueError as e:
+            console.print(f"[bold red]Error:[/] {str(e)}")
+            raise typer.Exit(1)
+
+@app.command("daemon")
+def run_daemon(
+    socket_path: Optional[str] = typer.Option(None, "--socket", help="Unix socket to listen on (default: per database, in $TMPDIR)"),
+):
+    """Keep a warm process that serves getone, list, create and done to the gtd client."""
+    import daemon
+    
+    resident = daemon.Daemon(socket_path)
+    try:
+        resident.serve_forever(ready=lambda: console.print(
+            f"[bold green]gtd daemon listening on {resident.path}[/] (Ctrl-C to stop)"))
+    except RuntimeError as e:
+        console.print(f"[bold red]Error:[/] {str(e)}")
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+
 @app.command("interactive")
 def interactive_mode():
     """Interactive task creation mode."""
+    from InquirerPy import prompt
+    from InquirerPy.validator import EmptyInputValidator
+    
     questions = [
         {
             "type": "input",
@@ -0,0 +1,314 @@
+"""Resident `gtd daemon` and the thin client that forwards CLI commands to it.
+
+The client side is imported by main.py before anything else, so this
+module's top level only uses the standard library pieces a bare
+interpreter has already loaded. The server side imports the CLI lazily.
+"""
+import json
+import os
+import socket
+import struct
+import sys
+import time
+import zlib
+from typing import Callable
+
+# Commands the daemon runs; anything else (prompts, files, servers) runs directly
+DAEMON_COMMANDS = ("getone", "list", "stats", "create", "done")
+# Options that need the client's terminal; commands using them run directly
+CLIENT_ONLY_OPTIONS = ("--pager",)
+# Seconds a client may go without reading its output before it is dropped
+CLIENT_TIMEOUT_SECONDS = 60
+# Seconds between rescores; scores only change at day boundaries
+RESCORE_INTERVAL_SECONDS = 60
+
+# Frames are a kind byte and a big-endian length, followed by that many bytes.
+# For EXIT frames the length is the exit code and no payload follows.
+_HEADER = struct.Struct(">cI")
+STDOUT, STDERR, EXIT = b"O", b"E", b"X"
+
+def socket_path() -> str:
+    """The daemon socket for the current database.
+    
+    Mirrors database.DB_PATH without importing it, so each database gets
+    its own daemon. GTD_SOCKET overrides the location.
+    """
+    if os.environ.get("GTD_SOCKET"):
+        return os.environ["GTD_SOCKET"]
+    db_path = os.environ.get("GTD_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "gtd.db"))
+    digest = zlib.crc32(os.path.abspath(db_path).encode())
+    return os.path.join(os.environ.get("TMPDIR", "/tmp"), f"gtd-{os.getuid()}-{digest:08x}.sock")
+
+def is_forwardable(argv: list) -> bool:
+    """Whether the daemon can run this command line for a client."""
+    return bool(argv) and argv[0] in DAEMON_COMMANDS and not any(arg in CLIENT_ONLY_OPTIONS for arg in argv)
+
+def run_client(argv: list) -> int:
+    """Run a CLI command through the daemon and return its exit code.
+    
+    Returns None when the command isn't served by the daemon or no daemon
+    is listening, so the caller can run it directly instead.
+    """
+    if not is_forwardable(argv) or not hasattr(socket, "AF_UNIX") or os.environ.get("GTD_NO_DAEMON"):
+        return None
+    
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path())
+    except OSError:
+        sock.close()
+        return None
+    
+    try:
+        size = os.get_terminal_size(sys.stdout.fileno()).columns if sys.stdout.isatty() else 80
+    except OSError:
+        size = 80
+    request = {"argv": argv, "width": size, "tty": sys.stdout.isatty()}
+    outputs = {STDOUT: sys.stdout.buffer, STDERR: sys.stderr.buffer}
+    sock.sendall(json.dumps(request).encode() + b"\n")
+    
+    reader = sock.makefile("rb")
+    try:
+        while True:
+            header = reader.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                # The daemon went away mid-command
+                sys.stderr.write("gtd: lost connection to the daemon\n")
+                return 1
+            kind, length = _HEADER.unpack(header)
+            if kind == EXIT:
+                outputs[STDOUT].flush()
+                return length
+            outputs[kind].write(reader.read(length))
+            if kind == STDERR:
+                outputs[kind].flush()
+    except BrokenPipeError:
+        # Our own reader went away, e.g. `gtd list | head`
+        return 0
+    finally:
+        reader.close()
+        sock.close()
+
+class ClientGone(Exception):
+    """The client disconnected before the command finished."""
+
+class _Sender:
+    """Sends frames to one client from a thread of its own.
+    
+    Frames are queued, so a command never waits on a slow reader. A
+    client that reads nothing for CLIENT_TIMEOUT_SECONDS is dropped and
+    the rest of its frames are discarded.
+    """
+    
+    def __init__(self, sock: socket.socket):
+        import queue
+        import threading
+        
+        sock.settimeout(CLIENT_TIMEOUT_SECONDS)
+        self._sock = sock
+        self._frames = queue.Queue()
+        self.gone = False
+        self._thread = threading.Thread(target=self._run, name="gtd-daemon-sender", daemon=True)
+        self._thread.start()
+    
+    def send(self, kind: bytes, data: bytes = b"", length: int = None):
+        if self.gone:
+            raise ClientGone()
+        self._frames.put(_HEADER.pack(kind, len(data) if length is None else length) + data)
+    
+    def close(self):
+        """Wait until every queued frame is sent or the client is gone."""
+        self._frames.put(None)
+        self._thread.join()
+    
+    def _run(self):
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                return
+            if self.gone:
+                continue
+            try:
+                self._sock.sendall(frame)
+            except OSError:
+                self.gone = True
+
+class _FrameWriter:
+    """Text file that sends what is written to it as frames of one kind."""
+    
+    def __init__(self, sender: _Sender, kind: bytes, buffer_size: int = 65536):
+        self._sender = sender
+        self._kind = kind
+        self._buffer = []
+        self._size = 0
+        self._limit = buffer_size
+    
+    def write(self, text: str) -> int:
+        data = text.encode("utf-8")
+        self._buffer.append(data)
+        self._size += len(data)
+        if self._size >= self._limit:
+            self.flush()
+        return len(text)
+    
+    def flush(self):
+        if not self._size:
+            return
+        data = b"".join(self._buffer)
+        self._buffer.clear()
+        self._size = 0
+        # ClientGone isn't an OSError, so command code that handles broken pipes
+        # on the real stdout doesn't try to repair the daemon's descriptors
+        self._sender.send(self._kind, data)
+    
+    def isatty(self) -> bool:
+        return False
+    
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+class Daemon:
+    """Serves CLI commands on a Unix socket, one at a time, from a warm process.
+    
+    The database connection, its page cache, the imported CLI and the
+    compiled queries all stay alive between commands: warm-up and every
+    command run on one command thread, which owns the cached connection,
+    one command at a time, since SQLite serializes writers anyway and the
+    CLI's console is a module global. Each client gets a thread of its own
+    to read its request, and its output is sent by a _Sender, so a client
+    that reads slowly holds up no one else.
+    """
+    
+    def __init__(self, path: str = None):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        self.path = path or socket_path()
+        self._last_rescore = 0.0
+        self._command = None
+        self._commands = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gtd-daemon-command")
+    
+    def _bind(self) -> socket.socket:
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                # Left behind by a daemon that didn't shut down cleanly
+                os.unlink(self.path)
+            else:
+                probe.close()
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+        
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        os.chmod(self.path, 0o600)
+        listener.listen(64)
+        return listener
+    
+    def warm_up(self):
+        import typer
+        import cli
+        import database
+        
+        database.init_db()
+        database.rescore_tasks()
+        self._last_rescore = time.monotonic()
+        # Pull the ranking indexes into the page cache
+        database.get_highest_score_task(as_tasks=True)
+        list(database.iter_tasks(['id'], completed=False, limit=1000))
+        self._command = typer.main.get_command(cli.app)
+    
+    def serve_forever(self, ready: Callable[[], None] = None):
+        """Serve until interrupted; `ready` is called once commands can be taken."""
+        import signal
+        import threading
+        
+        listener = self._bind()
+        if threading.current_thread() is threading.main_thread():
+            # Unwind through the finally below so the socket file is removed
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            self._commands.submit(self.warm_up).result()
+            if ready is not None:
+                ready()
+            while True:
+                conn, _ = listener.accept()
+                threading.Thread(target=self._serve_connection, args=(conn,),
+                                 name="gtd-daemon-client", daemon=True).start()
+        finally:
+            listener.close()
+            self._commands.shutdown(wait=False)
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+    
+    def _serve_connection(self, conn: socket.socket):
+        with conn:
+            self.handle(conn)
+    
+    def handle(self, conn: socket.socket):
+        conn.settimeout(CLIENT_TIMEOUT_SECONDS)
+        try:
+            line = conn.makefile("rb").readline()
+            request = json.loads(line)
+            argv = list(request["argv"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        if not is_forwardable(argv):
+            return
+        
+        sender = _Sender(conn)
+        try:
+            code = self._commands.submit(
+                self.run_command, sender, argv, int(request.get("width", 80)), bool(request.get("tty"))
+            ).result()
+            sender.send(EXIT, length=code)
+        except ClientGone:
+            pass
+        finally:
+            sender.close()
+    
+    def run_command(self, sender: _Sender, argv: list, width: int, tty: bool) -> int:
+        import contextlib
+        import traceback
+        import typer
+        from rich.console import Console
+        import cli
+        import database
+        
+        now = time.monotonic()
+        if now - self._last_rescore >= RESCORE_INTERVAL_SECONDS:
+            database.rescore_tasks()
+            self._last_rescore = now
+        
+        out = _FrameWriter(sender, STDOUT)
+        err = _FrameWriter(sender, STDERR)
+        saved_console = cli.console
+        cli.console = Console(file=out, width=width, force_terminal=tty,
+                              color_system="standard" if tty else None)
+        code = 0
+        try:
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                result = self._command.main(args=argv, prog_name="gtd", standalone_mode=False)
+                if isinstance(result, int):
+                    code = result
+        except typer.Exit as e:
+            code = e.exit_code
+        except typer.Abort:
+            code = 1
+        except ClientGone:
+            raise
+        except Exception as e:
+            if hasattr(e, "show") and hasattr(e, "exit_code"):
+                # Usage errors, whether typer vendors click or not
+                e.show(file=err)
+                code = e.exit_code
+            else:
+                err.write(traceback.format_exc())
+                code = 1
+        finally:
+            cli.console = saved_console
+        out.flush()
+        err.flush()
+        return code
+
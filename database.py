@@ -1,16 +1,102 @@
 import sqlite3
 import os
 import datetime
-from typing import List, Dict, Optional, Any
+import time
+from typing import List, Dict, Optional, Any, Tuple, Iterator, Callable
 import json
+import threading
+from contextlib import contextmanager
 
-DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gtd.db")
+from models import (
+    Task, Quadrant, ScoringProfile, TASK_FIELDS,
+    NO_DUE_TS, SECONDS_PER_DAY, URGENT_DAYS, IMPORTANCE_THRESHOLD,
+    DUE_DATE_POINTS, LATER_DUE_POINTS,
+)
+
+DB_PATH = os.environ.get(
+    "GTD_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "gtd.db")
+)
+
+DEFAULT_PROFILE = "default"
+
+# Bump whenever init_db gains a table, column, index or migration, so
+# existing databases run the full initialization once more
+SCHEMA_VERSION = 3
+
+# Open tasks due within this many days after today count as due soon
+DUE_SOON_DAYS = 7
+
+# SQL mirrors of calculate_score/calculate_quadrant for rows with a due_ts,
+# evaluated against a :now parameter. floor((due_ts - now) / day) <= N is
+# written as due_ts - now < (N + 1) * day so it stays in integer arithmetic.
+_DUE_POINTS_SQL = 'CASE ' + ' '.join(
+    f'WHEN due_ts - :now < {(max_days + 1) * SECONDS_PER_DAY} THEN {points}'
+    for max_days, points in DUE_DATE_POINTS
+) + f' ELSE {LATER_DUE_POINTS} END'
+
+_SCORE_SQL = f'({_DUE_POINTS_SQL}) + effort + consequences + desire + repetitions - 1'
+
+_QUADRANT_SQL = f'''CASE WHEN due_ts - :now < {(URGENT_DAYS + 1) * SECONDS_PER_DAY}
+    THEN (CASE WHEN consequences + desire >= {IMPORTANCE_THRESHOLD} THEN 1 ELSE 3 END)
+    ELSE (CASE WHEN consequences + desire >= {IMPORTANCE_THRESHOLD} THEN 2 ELSE 4 END) END'''
+
+_local = threading.local()
+
+def get_connection() -> sqlite3.Connection:
+    """Get this thread's reusable connection to the database.
+    
+    Connections are cached per thread and per process, so forked server
+    workers open their own, and are reopened if DB_PATH changes.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.key == (os.getpid(), DB_PATH):
+        return conn
+    
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    # In WAL mode NORMAL stays consistent and skips an fsync per commit
+    conn.execute('PRAGMA synchronous = NORMAL')
+    _local.conn = conn
+    _local.key = (os.getpid(), DB_PATH)
+    return conn
+
+def close_connection():
+    """Close this thread's cached connection, if any."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.key[0] == os.getpid():
+        conn.close()
+    _local.conn = None
+
+@contextmanager
+def transaction():
+    """Yield a cursor on this thread's connection and commit on success.
+    
+    On error the transaction is rolled back so the reused connection is
+    never left holding an open write transaction.
+    """
+    conn = get_connection()
+    try:
+        yield conn.cursor()
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
 
 def init_db():
-    """Initialize the database with the tasks table if it doesn't exist."""
+    """Initialize the database with the tasks table if it doesn't exist.
+    
+    Databases already at SCHEMA_VERSION are left untouched, so startup
+    doesn't pay for migrations that have nothing to do.
+    """
+    if get_connection().execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+        return
+    
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
+    # Write-ahead logging is a persistent property of the database file
+    cursor.execute('PRAGMA journal_mode = WAL')
+    
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS tasks (
         id INTEGER PRIMARY KEY,
@@ -26,31 +112,324 @@ def init_db():
         pre_task INTEGER,
         created_at TEXT DEFAULT CURRENT_TIMESTAMP,
         updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        quadrant INTEGER,
+        due_ts INTEGER,
+        completed_ts INTEGER,
         FOREIGN KEY (pre_task) REFERENCES tasks(id)
     )
     ''')
     
+    migrate_db(cursor)
+    
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_tasks_quadrant
+    ON tasks (completed, quadrant, score DESC)
+    ''')
+    
+    # Serves due date range scans and covers every input of a scoring
+    # profile, so profile rankings never touch the table rows
+    cursor.execute('DROP INDEX IF EXISTS idx_tasks_due')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_tasks_ranking
+    ON tasks (completed, due_ts, effort, consequences, desire, repetitions)
+    ''')
+    
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_tasks_score
+    ON tasks (completed, score DESC)
+    ''')
+    
+    # Lets bulk imports skip titles that are already on the open list
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_title ON tasks (title)')
+    
+    # Completions per day and week are range counts over recent completions
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_tasks_completed_ts
+    ON tasks (completed_ts) WHERE completed_ts IS NOT NULL
+    ''')
+    
+    create_task_counts(cursor)
+    
+    # Small key/value store for bookkeeping such as the last rescore time
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS app_state (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    ''')
+    
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS scoring_profiles (
+        name TEXT PRIMARY KEY,
+        effort_weight REAL NOT NULL,
+        consequences_weight REAL NOT NULL,
+        desire_weight REAL NOT NULL,
+        repetitions_weight REAL NOT NULL,
+        due_buckets TEXT NOT NULL,
+        later_due_points REAL NOT NULL,
+        no_due_points REAL NOT NULL,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    
+    # Log of task changes; its latest seq is the change counter. Rows older
+    # than TASK_EVENT_RETENTION_SECONDS are pruned by rescore_tasks.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS task_events (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id INTEGER,
+        kind TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    
+    # Content-addressed cache of LLM extraction results
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS llm_cache (
+        key TEXT PRIMARY KEY,
+        result TEXT NOT NULL,
+        created_ts INTEGER NOT NULL,
+        used_ts INTEGER NOT NULL
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_used ON llm_cache (used_ts)')
+    
+    # Asynchronous NLP jobs, shared by all server processes
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS nlp_jobs (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        task_id INTEGER,
+        result TEXT,
+        error TEXT,
+        created_ts INTEGER NOT NULL,
+        updated_ts INTEGER NOT NULL
+    )
+    ''')
+    
+    # The default profile ranks exactly like the stored score
+    cursor.execute('''
+    INSERT OR IGNORE INTO scoring_profiles
+    (name, effort_weight, consequences_weight, desire_weight, repetitions_weight,
+     due_buckets, later_due_points, no_due_points)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', _profile_row(ScoringProfile(DEFAULT_PROFILE)))
+    
+    cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    
     conn.commit()
     conn.close()
 
-def calculate_score(task: Dict[str, Any]) -> float:
+def migrate_db(cursor: sqlite3.Cursor):
+    """Bring an existing tasks table up to the current schema."""
+    cursor.execute('PRAGMA table_info(tasks)')
+    columns = {row[1] for row in cursor.fetchall()}
+    
+    if 'quadrant' not in columns:
+        cursor.execute('ALTER TABLE tasks ADD COLUMN quadrant INTEGER')
+    
+    if 'due_ts' not in columns:
+        cursor.execute('ALTER TABLE tasks ADD COLUMN due_ts INTEGER')
+    
+    if 'completed_ts' not in columns:
+        cursor.execute('ALTER TABLE tasks ADD COLUMN completed_ts INTEGER')
+        # The last update of a completed task is usually its completion
+        cursor.execute('''
+        UPDATE tasks SET completed_ts = CAST(strftime('%s', updated_at) AS INTEGER)
+        WHERE completed = 1
+        ''')
+    
+    # Normalize due dates written before the epoch column existed: rewrite
+    # them as canonical ISO strings and fill in due_ts. Empty or unparseable
+    # values are cleared, they could never be scored anyway.
+    cursor.execute('''
+    SELECT id, due_date FROM tasks WHERE due_ts IS NULL AND due_date IS NOT NULL
+    ''')
+    updates = []
+    for task_id, due_date in cursor.fetchall():
+        try:
+            due_date, due_ts = normalize_due_date(due_date)
+        except ValueError:
+            due_date, due_ts = None, None
+        updates.append((due_date, due_ts, task_id))
+    cursor.executemany('UPDATE tasks SET due_date = ?, due_ts = ? WHERE id = ?', updates)
+    
+    # Backfill the materialized quadrant for rows written before it existed
+    cursor.execute('''
+    SELECT id, due_ts, consequences, desire FROM tasks WHERE quadrant IS NULL
+    ''')
+    updates = [
+        (calculate_quadrant({'due_ts': due_ts, 'consequences': consequences, 'desire': desire}), task_id)
+        for task_id, due_ts, consequences, desire in cursor.fetchall()
+    ]
+    cursor.executemany('UPDATE tasks SET quadrant = ? WHERE id = ?', updates)
+
+def _due_day_sql(row: str) -> str:
+    """Summary bucket of a row's due date: its UTC day, or NO_DUE_TS without one."""
+    return f'ifnull({row}.due_ts / {SECONDS_PER_DAY}, {NO_DUE_TS})'
+
+def _task_counts_delta(row: str, sign: str) -> str:
+    return f'''
+    INSERT INTO task_counts (completed, due_day, quadrant, tasks, effort_total)
+    VALUES (ifnull({row}.completed, 0), {_due_day_sql(row)}, ifnull({row}.quadrant, 0),
+            {sign}1, {sign}ifnull({row}.effort, 0))
+    ON CONFLICT DO UPDATE SET tasks = tasks + excluded.tasks,
+                              effort_total = effort_total + excluded.effort_total;
+    '''
+
+def create_task_counts(cursor: sqlite3.Cursor):
+    """Create and fill the task_counts summary and the triggers that maintain it.
+    
+    task_counts holds the number of tasks and their total effort for each
+    completion state, due day and quadrant, so dashboard counts add up a
+    few hundred summary rows instead of scanning every task.
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS task_counts (
+        completed INTEGER NOT NULL,
+        due_day INTEGER NOT NULL,
+        quadrant INTEGER NOT NULL,
+        tasks INTEGER NOT NULL,
+        effort_total INTEGER NOT NULL,
+        PRIMARY KEY (completed, due_day, quadrant)
+    ) WITHOUT ROWID
+    ''')
+    
+    # Rebuilt on every schema upgrade, which also repairs a summary that
+    # drifted while an older version without the triggers wrote to it
+    cursor.execute('DELETE FROM task_counts')
+    cursor.execute(f'''
+    INSERT INTO task_counts (completed, due_day, quadrant, tasks, effort_total)
+    SELECT ifnull(completed, 0), {_due_day_sql('tasks')}, ifnull(quadrant, 0),
+           count(*), ifnull(sum(effort), 0)
+    FROM tasks GROUP BY 1, 2, 3
+    ''')
+    
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS task_counts_insert AFTER INSERT ON tasks BEGIN
+    {_task_counts_delta('NEW', '+')}
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS task_counts_delete AFTER DELETE ON tasks BEGIN
+    {_task_counts_delta('OLD', '-')}
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS task_counts_update AFTER UPDATE OF completed, due_ts, quadrant, effort ON tasks
+    WHEN (OLD.completed, OLD.due_ts, OLD.quadrant, OLD.effort) IS NOT (NEW.completed, NEW.due_ts, NEW.quadrant, NEW.effort)
+    BEGIN
+    {_task_counts_delta('OLD', '-')}
+    {_task_counts_delta('NEW', '+')}
+    END
+    ''')
+
+def log_task_event(cursor: sqlite3.Cursor, kind: str, task_id: int = None):
+    """Record a change in the task_events log, inside the caller's transaction."""
+    cursor.execute('INSERT INTO task_events (task_id, kind) VALUES (?, ?)', (task_id, kind))
+
+# Logged changes are kept this long for watchers and SSE clients to catch up
+TASK_EVENT_RETENTION_SECONDS = 7 * SECONDS_PER_DAY
+# Most events one prune deletes; a longer backlog is worked off by later runs
+TASK_EVENT_PRUNE_LIMIT = 10000
+
+def prune_task_events(cursor: sqlite3.Cursor, now_ts: int) -> int:
+    """Delete logged changes past their retention, inside the caller's transaction.
+    
+    The latest event is always kept, so the change counter never goes
+    back. Only writes when there is something to delete. Returns the
+    number of deleted events.
+    """
+    # Events are logged in time order, so the first one kept bounds the delete
+    # to a seq range, and the lookup stops at the oldest remaining row
+    cursor.execute('''
+    SELECT ifnull(
+        (SELECT seq FROM task_events WHERE created_at >= datetime(?, 'unixepoch') ORDER BY seq LIMIT 1),
+        (SELECT max(seq) FROM task_events)
+    ), (SELECT min(seq) FROM task_events)
+    ''', (now_ts - TASK_EVENT_RETENTION_SECONDS,))
+    keep_from, oldest = cursor.fetchone()
+    if keep_from is None or keep_from <= oldest:
+        return 0
+    cursor.execute('''
+    DELETE FROM task_events WHERE seq < min(?, (SELECT min(seq) FROM task_events) + ?)
+    ''', (keep_from, TASK_EVENT_PRUNE_LIMIT))
+    return cursor.rowcount
+
+def get_change_counter() -> int:
+    """Get the sequence number of the latest change, 0 if nothing has changed."""
+    cursor = get_connection().cursor()
+    cursor.execute('SELECT MAX(seq) FROM task_events')
+    return cursor.fetchone()[0] or 0
+
+def get_oldest_event_seq() -> Optional[int]:
+    """Get the sequence number of the oldest change still logged, None if none is."""
+    cursor = get_connection().cursor()
+    cursor.execute('SELECT MIN(seq) FROM task_events')
+    return cursor.fetchone()[0]
+
+def get_task_events_since(seq: int, limit: int = 1000) -> List[Dict[str, Any]]:
+    """Get logged changes after `seq`, oldest first."""
+    cursor = get_connection().cursor()
+    cursor.row_factory = sqlite3.Row
+    
+    cursor.execute('''
+    SELECT seq, task_id, kind, created_at FROM task_events
+    WHERE seq > ? ORDER BY seq LIMIT ?
+    ''', (seq, limit))
+    
+    return [dict(row) for row in cursor.fetchall()]
+
+def get_tasks_by_ids(task_ids: List[int]) -> List[Task]:
+    """Get the tasks with the given IDs; missing IDs are skipped."""
+    cursor = get_connection().cursor()
+    cursor.row_factory = Task.row_factory
+    
+    tasks = []
+    # Stay well below SQLite's limit on bound parameters
+    for start in range(0, len(task_ids), 500):
+        chunk = task_ids[start:start + 500]
+        cursor.execute(
+            f"SELECT * FROM tasks WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+        )
+        tasks.extend(cursor.fetchall())
+    return tasks
+
+def normalize_due_date(due_date: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """Return the canonical ISO string and epoch seconds for a due date.
+    
+    Accepts both YYYY-MM-DD and full timestamps; naive values are local time.
+    Raises ValueError if the date cannot be parsed.
+    """
+    if not due_date:
+        return None, None
+    
+    parsed = datetime.datetime.fromisoformat(due_date)
+    return parsed.isoformat(), int(parsed.timestamp())
+
+def _task_due_ts(task: Dict[str, Any]) -> Optional[int]:
+    """Get the epoch due date of a task dict, parsing due_date only if needed."""
+    if task.get('due_ts') is not None:
+        return int(task['due_ts'])
+    return normalize_due_date(task.get('due_date'))[1]
+
+def calculate_score(task: Dict[str, Any], now_ts: int = None) -> float:
     """Calculate the score of a task based on various factors."""
     score = 0
     
     # Due date factor
-    if task.get('due_date'):
-        due_date = datetime.datetime.fromisoformat(task['due_date'])
-        now = datetime.datetime.now()
-        days_remaining = (due_date - now).days
+    due_ts = _task_due_ts(task)
+    if due_ts is not None:
+        if now_ts is None:
+            now_ts = int(time.time())
+        days_remaining = (due_ts - now_ts) // SECONDS_PER_DAY
         
-        if days_remaining <= 0:
-            score += 10  # Overdue or due today
-        elif days_remaining <= 2:
-            score += 8   # Due within 2 days
-        elif days_remaining <= 7:
-            score += 5   # Due within a week
+        for max_days, points in DUE_DATE_POINTS:
+            if days_remaining <= max_days:
+                score += points
+                break
         else:
-            score += 2   # Due later
+            score += LATER_DUE_POINTS
     
     # Effort factor (inverted: less effort = higher score)
     score += int(task.get('effort', 5))
@@ -66,17 +445,30 @@ def calculate_score(task: Dict[str, Any]) -> float:
     
     return score
 
-def add_task(title: str, description: str = None, due_date: str = None, 
-             effort: int = 5, consequences: int = 5, desire: int = 5,
-             pre_task: int = None) -> int:
-    """Add a new task to the database."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def calculate_quadrant(task: Dict[str, Any], now_ts: int = None) -> int:
+    """Calculate the Quadrant value of a task for the materialized quadrant column."""
+    try:
+        due_ts = _task_due_ts(task)
+    except ValueError:
+        due_ts = None
+    
+    return Quadrant.classify(
+        due_ts,
+        int(task.get('consequences', 5)),
+        int(task.get('desire', 5)),
+        now_ts
+    ).value
+
+def _insert_task(cursor: sqlite3.Cursor, title: str, description: str = None, due_date: str = None,
+                 effort: int = 5, consequences: int = 5, desire: int = 5,
+                 pre_task: int = None) -> int:
+    due_date, due_ts = normalize_due_date(due_date)
     
     task = {
         'title': title,
         'description': description,
         'due_date': due_date,
+        'due_ts': due_ts,
         'effort': effort,
         'consequences': consequences,
         'desire': desire,
@@ -84,15 +476,23 @@ def add_task(title: str, description: str = None, due_date: str = None,
     }
     
     score = calculate_score(task)
+    quadrant = calculate_quadrant(task)
     
     cursor.execute('''
-    INSERT INTO tasks (title, description, due_date, effort, consequences, desire, pre_task, score)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (title, description, due_date, effort, consequences, desire, pre_task, score))
+    INSERT INTO tasks (title, description, due_date, due_ts, effort, consequences, desire, pre_task, score, quadrant)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (title, description, due_date, due_ts, effort, consequences, desire, pre_task, score, quadrant))
     
     task_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    log_task_event(cursor, 'created', task_id)
+    return task_id
+
+def add_task(title: str, description: str = None, due_date: str = None, 
+             effort: int = 5, consequences: int = 5, desire: int = 5,
+             pre_task: int = None) -> int:
+    """Add a new task to the database."""
+    with transaction() as cursor:
+        task_id = _insert_task(cursor, title, description, due_date, effort, consequences, desire, pre_task)
     
     # After adding, check for similar tasks and potentially merge
     # from utils import check_for_similar_tasks
@@ -100,65 +500,149 @@ def add_task(title: str, description: str = None, due_date: str = None,
     
     return task_id
 
+def add_tasks(tasks: List[Dict[str, Any]]) -> List[int]:
+    """Add several tasks in one transaction; either all are added or none.
+    
+    Each task is a dict of add_task keyword arguments. Returns the new IDs
+    in the same order.
+    """
+    with transaction() as cursor:
+        return [_insert_task(cursor, **task) for task in tasks]
+
 def get_task(task_id: int) -> Dict[str, Any]:
     """Get a task by its ID."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
+    cursor.row_factory = sqlite3.Row
     
     cursor.execute('''
     SELECT * FROM tasks WHERE id = ?
     ''', (task_id,))
     
     task = cursor.fetchone()
-    conn.close()
     
     if task:
         return dict(task)
     return None
 
-def get_highest_score_task() -> Dict[str, Any]:
-    """Get the task with the highest score that isn't completed."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+# Top open task per (database, scoring profile):
+# (change counter, ranked at, task id, its score)
+_profile_tops = {}
+
+def _profile_top_id(name: str) -> Tuple[Optional[int], str, List[Any]]:
+    """Rank open tasks under a profile; returns the top id and the compiled score.
     
-    cursor.execute('''
-    SELECT * FROM tasks 
-    WHERE completed = 0 
-    ORDER BY score DESC 
-    LIMIT 1
-    ''')
+    A full ranking evaluates the profile on every open task. Until the next
+    logged change, only tasks whose due date has since crossed one of the
+    profile's bucket boundaries can have a new score, so later calls compare
+    those with the previous winner. Raises ValueError if the profile doesn't exist.
+    """
+    profile = get_scoring_profile(name)
+    if profile is None:
+        raise ValueError(f"Unknown scoring profile: {name}")
+    now_ts = int(time.time())
+    score_sql, params = compile_profile(profile, now_ts)
+    
+    # Read before ranking, so a concurrent change can only make the entry stale
+    counter = get_change_counter()
+    cursor = get_connection().cursor()
+    top = None
+    cached = _profile_tops.get((DB_PATH, name))
+    if cached is not None and cached[0] == counter and cached[1] <= now_ts:
+        _, ranked_at, task_id, score = cached
+        if task_id is None:
+            return None, score_sql, params
+        cursor.execute(f'SELECT {score_sql} FROM tasks WHERE id = ?', params + [task_id])
+        row = cursor.fetchone()
+        # If the winner's own score dropped, any other task may have overtaken it
+        if row is not None and row[0] >= score:
+            top = (task_id, row[0])
+            crossed = []
+            crossed_params = []
+            for max_days, _ in profile.due_buckets:
+                crossed.append(f'SELECT id, {score_sql} FROM tasks WHERE completed = 0 AND due_ts >= ? AND due_ts < ?')
+                crossed_params += params + [ranked_at + (int(max_days) + 1) * SECONDS_PER_DAY,
+                                            now_ts + (int(max_days) + 1) * SECONDS_PER_DAY]
+            if crossed:
+                cursor.execute(' UNION ALL '.join(crossed), crossed_params)
+                top = max([top] + cursor.fetchall(), key=lambda candidate: candidate[1])
+    
+    if top is None:
+        cursor.execute(f'SELECT id, {score_sql} FROM tasks WHERE completed = 0 ORDER BY 2 DESC LIMIT 1', params)
+        top = cursor.fetchone() or (None, None)
+    _profile_tops[(DB_PATH, name)] = (counter, now_ts, top[0], top[1])
+    return top[0], score_sql, params
+
+def get_highest_score_task(as_tasks: bool = False, profile: str = None) -> Dict[str, Any]:
+    """Get the task with the highest score that isn't completed.
+    
+    With as_tasks=True the row is returned as a Task built by its row factory.
+    With a scoring profile name the ranking is computed by SQLite from the
+    profile and returned as the task's score; stored scores are untouched.
+    That ranking scans every open task, and is only repeated after a
+    change is logged (see _profile_top_id).
+    """
+    if profile is not None:
+        task_id, score_sql, params = _profile_top_id(profile)
+        if task_id is None:
+            return None
+    
+    cursor = get_connection().cursor()
+    cursor.row_factory = Task.row_factory if as_tasks else sqlite3.Row
+    
+    if profile is None:
+        cursor.execute('''
+        SELECT * FROM tasks 
+        WHERE completed = 0 
+        ORDER BY score DESC 
+        LIMIT 1
+        ''')
+    else:
+        cursor.execute(f'SELECT {_select_with_score(TASK_FIELDS, score_sql)} FROM tasks WHERE id = ?',
+                       params + [task_id])
     
     task = cursor.fetchone()
-    conn.close()
     
+    if task and as_tasks:
+        return task
     if task:
         return dict(task)
     return None
 
-def update_task(task_id: int, **kwargs) -> bool:
-    """Update a task by its ID."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def _update_task(cursor: sqlite3.Cursor, task_id: int, kwargs: Dict[str, Any]) -> bool:
+    # Keep the epoch column in sync with the canonical due date string
+    if 'due_date' in kwargs:
+        kwargs['due_date'], kwargs['due_ts'] = normalize_due_date(kwargs['due_date'])
+    
+    cursor.row_factory = sqlite3.Row
     
     # Get the current task data
     cursor.execute('SELECT * FROM tasks WHERE id = ?', (task_id,))
-    task = dict(cursor.fetchone())
+    row = cursor.fetchone()
+    if row is None:
+        return False
+    task = dict(row)
+    
+    if 'completed' in kwargs:
+        if not kwargs['completed']:
+            kwargs['completed_ts'] = None
+        elif not task['completed']:
+            kwargs['completed_ts'] = int(time.time())
     
     # Update the task data with new values
     task.update(kwargs)
     
-    # Recalculate score
+    # Recalculate score and quadrant
     score = calculate_score(task)
+    quadrant = calculate_quadrant(task)
     task['score'] = score
+    task['quadrant'] = quadrant
     
     # Build the SET clause for the SQL query
     set_clause = ', '.join([f"{key} = ?" for key in kwargs.keys()])
-    set_clause += ', score = ?, updated_at = CURRENT_TIMESTAMP'
+    set_clause += ', score = ?, quadrant = ?, updated_at = CURRENT_TIMESTAMP'
     
     # Build the parameters for the query
-    params = list(kwargs.values()) + [score, task_id]
+    params = list(kwargs.values()) + [score, quadrant, task_id]
     
     # Execute the update
     cursor.execute(f'''
@@ -166,51 +650,690 @@ def update_task(task_id: int, **kwargs) -> bool:
     ''', params)
     
     success = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
-    
+    if success:
+        log_task_event(cursor, 'completed' if kwargs.get('completed') else 'updated', task_id)
     return success
 
+def update_task(task_id: int, **kwargs) -> bool:
+    """Update a task by its ID."""
+    with transaction() as cursor:
+        return _update_task(cursor, task_id, kwargs)
+
 def complete_task(task_id: int) -> bool:
     """Mark a task as completed."""
     return update_task(task_id, completed=1)
 
-def get_all_tasks(completed: bool = None) -> List[Dict[str, Any]]:
-    """Get all tasks, optionally filtered by completion status."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+def complete_tasks(task_ids: List[int]) -> List[int]:
+    """Mark several tasks as completed in one transaction.
     
-    query = 'SELECT * FROM tasks'
+    Returns the IDs that were found and completed, each once.
+    """
+    with transaction() as cursor:
+        return [task_id for task_id in dict.fromkeys(task_ids) if _update_task(cursor, task_id, {'completed': 1})]
+
+# Timestamps written by SQLite use a space; JSON output uses ISO 'T'
+_JSON_COLUMN_SQL = {
+    'created_at': "replace(created_at, ' ', 'T') AS created_at",
+    'updated_at': "replace(updated_at, ' ', 'T') AS updated_at",
+}
+
+def parse_fields(fields: str) -> List[str]:
+    """Parse a comma-separated field list, raising ValueError on unknown names."""
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in names if name not in TASK_FIELDS]
+    if unknown or not names:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Valid fields: {', '.join(TASK_FIELDS)}"
+                         if unknown else "No fields given")
+    return list(dict.fromkeys(names))
+
+def _tasks_query(completed: bool = None, quadrant: int = None, profile: str = None,
+                 fields: List[str] = None, limit: int = None,
+                 offset: int = None, after: Tuple[float, int] = None) -> Tuple[str, List[Any]]:
+    """Build the ranked task listing query shared by get_all_tasks and iter_tasks."""
+    columns = "*"
     params = []
+    if fields is not None:
+        # The profile score is selected even when not requested, to rank by it
+        selected = fields if profile is None or 'score' in fields else fields + ['score']
+        columns = ', '.join(_JSON_COLUMN_SQL.get(name, name) for name in selected)
+    if profile is not None:
+        score_sql, params = _load_compiled_profile(profile)
+        score_params = list(params)
+        if fields is not None:
+            columns = ', '.join(
+                f'{score_sql} AS score' if name == 'score' else _JSON_COLUMN_SQL.get(name, name)
+                for name in selected
+            )
+        else:
+            columns = _select_with_score(TASK_FIELDS, score_sql)
+    
+    query = f'SELECT {columns} FROM tasks'
+    conditions = []
     
     if completed is not None:
-        query += ' WHERE completed = ?'
+        conditions.append('completed = ?')
         params.append(int(completed))
     
-    query += ' ORDER BY score DESC'
+    if quadrant is not None:
+        conditions.append('quadrant = ?')
+        params.append(int(quadrant))
+    
+    if after is not None:
+        # Keyset pagination; the leading range term lets the score index seek
+        score, task_id = after
+        if profile is None:
+            conditions.append('score <= ? AND (score < ? OR id > ?)')
+            params.extend([score, score, task_id])
+        else:
+            conditions.append(f'{score_sql} <= ? AND ({score_sql} < ? OR id > ?)')
+            params.extend(score_params + [score] + score_params + [score, task_id])
+    
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    
+    query += ' ORDER BY score DESC, id'
+    
+    if limit is not None or offset is not None:
+        query += ' LIMIT ? OFFSET ?'
+        params.extend([-1 if limit is None else int(limit), int(offset or 0)])
+    
+    return query, params
+
+def get_all_tasks(completed: bool = None, quadrant: int = None,
+                  as_tasks: bool = False,
+                  profile: str = None, fields: List[str] = None,
+                  limit: int = None, after: Tuple[float, int] = None) -> List[Dict[str, Any]]:
+    """Get all tasks, optionally filtered by completion status and quadrant.
+    
+    With as_tasks=True rows are returned as Task objects built directly by
+    the sqlite3 row factory, skipping the intermediate dicts. With a scoring profile name, tasks are ranked by that profile and its
+    score is returned in place of the stored one. With a list of fields,
+    only those columns are selected and each task is a JSON-ready dict.
+    
+    Tasks are ordered by score, highest first, then by id. Pass the
+    (score, id) of the last task seen as `after` to get the next page.
+    """
+    query, params = _tasks_query(completed, quadrant, profile, fields, limit, after=after)
+    
+    cursor = get_connection().cursor()
+    if as_tasks and fields is None:
+        cursor.row_factory = Task.row_factory
+    else:
+        cursor.row_factory = None if fields is not None else sqlite3.Row
     
     cursor.execute(query, params)
-    tasks = [dict(task) for task in cursor.fetchall()]
-    conn.close()
+    if fields is not None:
+        tasks = [dict(zip(fields, row)) for row in cursor]
+    elif as_tasks:
+        tasks = cursor.fetchall()
+    else:
+        tasks = [dict(task) for task in cursor.fetchall()]
     
     return tasks
 
+def iter_tasks(fields: List[str], completed: bool = None, quadrant: int = None,
+               profile: str = None, limit: int = None, offset: int = None,
+               batch_size: int = 1000) -> Iterator[Tuple[Any, ...]]:
+    """Yield ranked tasks as plain tuples of `fields`, a batch of rows at a time.
+    
+    Takes the same filters as get_all_tasks, but nothing is built per row
+    beyond the tuple sqlite3 returns, and the first rows are available
+    before the rest are read.
+    """
+    query, params = _tasks_query(completed, quadrant, profile, fields, limit=limit, offset=offset)
+    
+    cursor = get_connection().cursor()
+    cursor.row_factory = None
+    cursor.execute(query, params)
+    width = len(fields)
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                # Drop the profile score when it was only selected for ranking
+                yield row if len(row) == width else row[:width]
+    finally:
+        cursor.close()
+
+def count_tasks(completed: bool = None, quadrant: int = None) -> int:
+    """Count tasks matching the get_all_tasks filters, read from task_counts."""
+    conditions, params = [], []
+    if completed is not None:
+        conditions.append('completed = ?')
+        params.append(int(completed))
+    if quadrant is not None:
+        conditions.append('quadrant = ?')
+        params.append(int(quadrant))
+    
+    query = 'SELECT ifnull(sum(tasks), 0) FROM task_counts'
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    return get_connection().execute(query, params).fetchone()[0]
+
+def get_top_tasks_by_quadrant(limits: Dict[int, int]) -> Dict[int, List[Task]]:
+    """Get the highest-ranked open tasks of several quadrants in one query.
+    
+    `limits` maps each quadrant to the number of tasks wanted from it.
+    Each quadrant is a UNION ALL branch that stops at its limit on the
+    quadrant index, so only the rows returned are read, however many
+    tasks each quadrant holds.
+    """
+    tasks = {quadrant: [] for quadrant in limits}
+    branches, params = [], []
+    for quadrant, limit in limits.items():
+        branches.append('SELECT * FROM (SELECT * FROM tasks WHERE completed = 0 AND quadrant = ? '
+                        'ORDER BY score DESC, id LIMIT ?)')
+        params.extend([int(quadrant), int(limit)])
+    if not branches:
+        return tasks
+    
+    cursor = get_connection().cursor()
+    cursor.row_factory = Task.row_factory
+    cursor.execute(' UNION ALL '.join(branches) + ' ORDER BY quadrant, score DESC, id', params)
+    for task in cursor:
+        tasks[task.quadrant].append(task)
+    
+    return tasks
+
+def get_task_key_at(position: int, completed: bool, quadrant: int = None) -> Optional[Tuple[float, int]]:
+    """Get the (score, id) of the task at `position` in the ranked listing.
+    
+    The result is an `after` key for get_all_tasks, so a page can start
+    anywhere in the list. With `completed` given the seek runs on a
+    covering index and reads no task rows. None when the list is shorter.
+    """
+    query = 'SELECT score, id FROM tasks WHERE completed = ?'
+    params = [int(completed)]
+    if quadrant is not None:
+        query += ' AND quadrant = ?'
+        params.append(int(quadrant))
+    query += ' ORDER BY score DESC, id LIMIT 1 OFFSET ?'
+    params.append(int(position))
+    
+    row = get_connection().execute(query, params).fetchone()
+    return tuple(row) if row else None
+
 def increase_repetition(task_id: int) -> bool:
     """Increase the repetition count for a task and update its score."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with transaction() as cursor:
+        cursor.execute('''
+        UPDATE tasks 
+        SET repetitions = repetitions + 1,
+            score = score + 1,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+        ''', (task_id,))
+        
+        success = cursor.rowcount > 0
+        if success:
+            log_task_event(cursor, 'repeated', task_id)
+    
+    return success
+
+def get_tasks_due_between(start_ts: int, end_ts: int, completed: bool = False) -> List[Dict[str, Any]]:
+    """Get tasks due in [start_ts, end_ts] (epoch seconds), soonest first."""
+    cursor = get_connection().cursor()
+    cursor.row_factory = sqlite3.Row
     
     cursor.execute('''
-    UPDATE tasks 
-    SET repetitions = repetitions + 1,
-        score = score + 1,
-        updated_at = CURRENT_TIMESTAMP
-    WHERE id = ?
-    ''', (task_id,))
+    SELECT * FROM tasks
+    WHERE completed = ? AND due_ts BETWEEN ? AND ?
+    ORDER BY due_ts
+    ''', (int(completed), start_ts, end_ts))
     
-    success = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
+    tasks = [dict(task) for task in cursor.fetchall()]
     
-    return success
+    return tasks
+
+def _due_count_sql(start_ts: Optional[int], end_ts: int) -> Tuple[str, List[int]]:
+    """SQL expression counting open tasks due in [start_ts, end_ts).
+    
+    Whole UTC days are summed from task_counts; only the partial days at
+    either end are counted on the tasks index, so the cost doesn't grow
+    with the number of tasks in the range. No start_ts means no lower bound.
+    """
+    edge = '(SELECT count(*) FROM tasks WHERE completed = 0 AND due_ts >= ? AND due_ts < ?)'
+    first_day = NO_DUE_TS + 1 if start_ts is None else -(-start_ts // SECONDS_PER_DAY)
+    last_day = end_ts // SECONDS_PER_DAY
+    if start_ts is not None and first_day >= last_day:
+        return edge, [start_ts, end_ts]
+    
+    parts = ['(SELECT ifnull(sum(tasks), 0) FROM task_counts '
+             'WHERE completed = 0 AND due_day >= ? AND due_day < ?)']
+    params = [first_day, last_day]
+    if start_ts is not None:
+        parts.append(edge)
+        params += [start_ts, first_day * SECONDS_PER_DAY]
+    parts.append(edge)
+    params += [last_day * SECONDS_PER_DAY, end_ts]
+    return ' + '.join(parts), params
+
+def _local_midnight(day: datetime.date) -> int:
+    return int(datetime.datetime.combine(day, datetime.time()).timestamp())
+
+def get_task_stats(now_ts: int = None, days: int = 7, weeks: int = 4,
+                   soon_days: int = DUE_SOON_DAYS) -> Dict[str, Any]:
+    """Dashboard counts, aggregated by SQLite without reading any task rows.
+    
+    Returns open and completed totals, open tasks per quadrant and their
+    average effort, overdue tasks (due before today) and tasks due today
+    or within the next soon_days days, plus completions on each of the
+    last `days` local days and in each of the last `weeks` weeks starting
+    on Monday, oldest first.
+    """
+    if now_ts is None:
+        now_ts = int(time.time())
+    today = datetime.date.fromtimestamp(now_ts)
+    today_ts = _local_midnight(today)
+    soon_ts = _local_midnight(today + datetime.timedelta(days=soon_days + 1))
+    
+    day_starts = [today - datetime.timedelta(days=n) for n in range(days - 1, -1, -1)]
+    monday = today - datetime.timedelta(days=today.weekday())
+    week_starts = [monday - datetime.timedelta(weeks=n) for n in range(weeks - 1, -1, -1)]
+    ranges = [(_local_midnight(start), _local_midnight(start + datetime.timedelta(days=1)))
+              for start in day_starts]
+    ranges += [(_local_midnight(start), _local_midnight(start + datetime.timedelta(weeks=1)))
+               for start in week_starts]
+    
+    conn = get_connection()
+    totals = {0: 0, 1: 0}
+    quadrants = {q.value: 0 for q in Quadrant}
+    open_effort = 0
+    for completed, quadrant, tasks, effort_total in conn.execute('''
+    SELECT completed, quadrant, sum(tasks), sum(effort_total) FROM task_counts
+    GROUP BY completed, quadrant
+    '''):
+        totals[completed] = totals.get(completed, 0) + tasks
+        if not completed:
+            open_effort += effort_total
+            if quadrant in quadrants:
+                quadrants[quadrant] += tasks
+    
+    # Everything time-dependent is one statement of scalar subqueries
+    overdue_sql, overdue_params = _due_count_sql(None, today_ts)
+    soon_sql, soon_params = _due_count_sql(today_ts, soon_ts)
+    completed_sql = '(SELECT count(*) FROM tasks WHERE completed_ts >= ? AND completed_ts < ?)'
+    counts = conn.execute(
+        f"SELECT {overdue_sql}, {soon_sql}" + f", {completed_sql}" * len(ranges),
+        overdue_params + soon_params + [ts for bound in ranges for ts in bound]
+    ).fetchone()
+    
+    completions = counts[2:]
+    return {
+        'open': totals[0],
+        'completed': totals[1],
+        'quadrants': quadrants,
+        'average_effort': round(open_effort / totals[0], 2) if totals[0] else None,
+        'overdue': counts[0],
+        'due_soon': counts[1],
+        'completed_per_day': [
+            {'date': start.isoformat(), 'count': count}
+            for start, count in zip(day_starts, completions[:days])
+        ],
+        'completed_per_week': [
+            {'week_start': start.isoformat(), 'count': count}
+            for start, count in zip(week_starts, completions[days:])
+        ],
+    }
+
+# Day offsets at which a task's score or quadrant changes as its due date nears
+_SCORE_BOUNDARY_DAYS = sorted({max_days + 1 for max_days, _ in DUE_DATE_POINTS} | {URGENT_DAYS + 1})
+
+def get_state(key: str) -> Optional[str]:
+    """Get a value from the app_state key/value table."""
+    row = get_connection().execute('SELECT value FROM app_state WHERE key = ?', (key,)).fetchone()
+    return row[0] if row else None
+
+def set_state(key: str, value: str) -> None:
+    with transaction() as cursor:
+        cursor.execute('INSERT OR REPLACE INTO app_state (key, value) VALUES (?, ?)', (key, value))
+
+def delete_state(key: str) -> None:
+    with transaction() as cursor:
+        cursor.execute('DELETE FROM app_state WHERE key = ?', (key,))
+
+# Column order of the rows taken by import_task_rows
+IMPORT_COLUMNS = (
+    'title', 'description', 'due_date', 'due_ts', 'effort', 'consequences',
+    'desire', 'repetitions', 'completed', 'completed_ts', 'score', 'quadrant',
+)
+
+def import_task_rows(rows: List[Tuple[Any, ...]], dedupe: bool = False,
+                     state: Tuple[str, str] = None) -> int:
+    """Insert a chunk of already scored task rows in one transaction.
+    
+    Rows are tuples in IMPORT_COLUMNS order. With dedupe, rows whose title
+    matches an open task, or an earlier row of the chunk, are skipped. An
+    app_state (key, value) pair can be written in the same transaction, so
+    recorded import progress always matches what was committed. Each
+    inserted task is logged as an 'imported' event, so listeners can load
+    just the new tasks. Returns the number inserted.
+    """
+    with transaction() as cursor:
+        if dedupe:
+            cursor.execute(
+                # Without statistics the planner would scan every open task instead
+                'SELECT title FROM tasks INDEXED BY idx_tasks_title '
+                'WHERE title IN (SELECT value FROM json_each(?)) AND completed = 0',
+                (json.dumps([row[0] for row in rows]),)
+            )
+            seen = {title for title, in cursor.fetchall()}
+            unique = []
+            for row in rows:
+                if row[0] not in seen:
+                    seen.add(row[0])
+                    unique.append(row)
+            rows = unique
+        
+        cursor.executemany(
+            f"INSERT INTO tasks ({', '.join(IMPORT_COLUMNS)}) VALUES ({', '.join('?' * len(IMPORT_COLUMNS))})",
+            rows
+        )
+        # Nothing else can insert during this transaction, so the highest IDs are this chunk's
+        cursor.execute('''
+        INSERT INTO task_events (task_id, kind)
+        SELECT id, 'imported' FROM (SELECT id FROM tasks ORDER BY id DESC LIMIT ?) ORDER BY id
+        ''', (len(rows),))
+        if state is not None:
+            cursor.execute('INSERT OR REPLACE INTO app_state (key, value) VALUES (?, ?)', state)
+    
+    return len(rows)
+
+def get_last_due_crossing(offsets: List[int], now_ts: int = None) -> Optional[int]:
+    """When an open task's due date last came within one of `offsets` seconds of now.
+    
+    Anything ranked or counted by how close due dates are, such as profile
+    scores, only changes at these moments. One index seek per offset; None
+    if no due date has crossed any of them.
+    """
+    if not offsets:
+        return None
+    if now_ts is None:
+        now_ts = int(time.time())
+    crossings = ' UNION ALL '.join(
+        f'SELECT (SELECT max(due_ts) FROM tasks WHERE completed = 0 AND due_ts < :now + {int(offset)}) - {int(offset)} AS crossing'
+        for offset in offsets
+    )
+    return get_connection().execute(f'SELECT max(crossing) FROM ({crossings})', {'now': now_ts}).fetchone()[0]
+
+def _next_boundary_crossing(cursor: sqlite3.Cursor, since_ts: int) -> Optional[int]:
+    """When the first open task's due date crosses a boundary after since_ts.
+    
+    Due within k days becomes true at due_ts - k * day, so each boundary is
+    one seek on the (completed, due_ts) index. None if no task ever will.
+    """
+    crossings = ' UNION ALL '.join(
+        f'SELECT (SELECT min(due_ts) FROM tasks WHERE completed = 0 AND due_ts >= :since + {days * SECONDS_PER_DAY})'
+        f' - {days * SECONDS_PER_DAY} AS crossing'
+        for days in _SCORE_BOUNDARY_DAYS
+    )
+    cursor.execute(f'SELECT min(crossing) FROM ({crossings})', {'since': since_ts})
+    return cursor.fetchone()[0]
+
+# Task IDs per transaction of a full rescore pass that can be stopped part way
+RESCORE_CHUNK_IDS = 5000
+
+_NEWER_RESCORE_SQL = "SELECT 1 FROM app_state WHERE key = 'rescored_at' AND CAST(value AS INTEGER) > :now"
+
+def rescore_tasks(now_ts: int = None, full: bool = False,
+                  should_stop: Callable[[], bool] = None) -> int:
+    """Recalculate time-dependent scores and quadrants of active tasks.
+    
+    Scores and quadrants depend on how close the due date is, so they drift
+    as time passes. The recalculation runs inside SQLite on the epoch due
+    column and only rows whose values actually changed are written.
+    
+    Scores only change when a due date comes within one of the bucket
+    boundaries, so after the first run only tasks that crossed a boundary
+    since the previous rescore are examined. When none has, nothing is
+    written at all, so frequent calls (every CLI run, the GUI's job) don't
+    take the write lock or wake other processes' change watchers. Logged
+    changes past their retention are pruned in the same transaction.
+    
+    With should_stop, a full pass commits RESCORE_CHUNK_IDS tasks at a time
+    and returns early once should_stop() is true; the next call with
+    should_stop resumes it, at the time it started. Returns the number of
+    updated tasks.
+    """
+    if now_ts is None:
+        now_ts = int(time.time())
+    
+    with transaction() as cursor:
+        cursor.execute("SELECT value FROM app_state WHERE key = 'rescored_at'")
+        row = cursor.fetchone()
+        last_ts = int(row[0]) if row else None
+        cursor.execute("SELECT value FROM app_state WHERE key = 'rescore_resume'")
+        resume = cursor.fetchone()
+        
+        if resume is not None and should_stop is not None and not full:
+            # Finish the full pass a previous call stopped part way, at its time
+            pass_ts, after_id = map(int, resume[0].split())
+            full = True
+        else:
+            if not full and last_ts is not None and 0 <= now_ts - last_ts:
+                crossing = _next_boundary_crossing(cursor, last_ts)
+                if crossing is None or crossing >= now_ts:
+                    prune_task_events(cursor, now_ts)
+                    return 0
+            pass_ts, after_id = now_ts, 0
+    
+    params = {'now': pass_ts}
+    candidates = ''
+    # Past a day the boundary windows overlap; a full pass is as cheap
+    if not full and last_ts is not None and 0 <= pass_ts - last_ts < SECONDS_PER_DAY:
+        # Due within k days is due_ts - now < k * day: it became true
+        # for due_ts in [last + k * day, now + k * day)
+        ranges = []
+        for i, days in enumerate(_SCORE_BOUNDARY_DAYS):
+            ranges.append(f'SELECT id FROM tasks WHERE completed = 0 AND due_ts >= :lo{i} AND due_ts < :hi{i}')
+            params[f'lo{i}'] = last_ts + days * SECONDS_PER_DAY
+            params[f'hi{i}'] = pass_ts + days * SECONDS_PER_DAY
+        candidates = f"AND id IN ({' UNION ALL '.join(ranges)})"
+    
+    # Only full passes are long enough to split; tasks added meanwhile are scored as they are inserted
+    max_id = get_connection().execute('SELECT ifnull(max(id), 0) FROM tasks').fetchone()[0]
+    chunk_ids = RESCORE_CHUNK_IDS if should_stop is not None and not candidates else max_id
+    updated = 0
+    while True:
+        params['after'], params['upto'] = after_id, after_id + chunk_ids
+        done = params['upto'] >= max_id
+        with transaction() as cursor:
+            cursor.execute(f'''
+            UPDATE tasks
+            SET score = {_SCORE_SQL}, quadrant = {_QUADRANT_SQL}
+            WHERE completed = 0 AND due_ts IS NOT NULL {candidates}
+              AND id > :after AND id <= :upto
+              AND (score IS NOT {_SCORE_SQL} OR quadrant IS NOT {_QUADRANT_SQL})
+              AND NOT EXISTS ({_NEWER_RESCORE_SQL})
+            RETURNING id
+            ''', params)
+            
+            ids = [row[0] for row in cursor.fetchall()]
+            cursor.executemany(
+                "INSERT INTO task_events (task_id, kind) VALUES (?, 'rescored')",
+                [(task_id,) for task_id in ids]
+            )
+            # Another process finished a later pass since this one started
+            superseded = cursor.execute(_NEWER_RESCORE_SQL, params).fetchone() is not None
+            if superseded:
+                done = True
+            elif done:
+                cursor.execute(
+                    "INSERT OR REPLACE INTO app_state (key, value) VALUES ('rescored_at', ?)",
+                    (str(pass_ts),)
+                )
+                cursor.execute("DELETE FROM app_state WHERE key = 'rescore_resume'")
+                prune_task_events(cursor, now_ts)
+            else:
+                cursor.execute(
+                    "INSERT OR REPLACE INTO app_state (key, value) VALUES ('rescore_resume', ?)",
+                    (f"{pass_ts} {params['upto']}",)
+                )
+        updated += len(ids)
+        after_id = params['upto']
+        if done or should_stop():
+            return updated
+
+def _profile_row(profile: ScoringProfile) -> Tuple[Any, ...]:
+    """Column values of a scoring_profiles row."""
+    return (
+        profile.name, profile.effort_weight, profile.consequences_weight,
+        profile.desire_weight, profile.repetitions_weight,
+        json.dumps([list(bucket) for bucket in profile.due_buckets]),
+        profile.later_due_points, profile.no_due_points,
+    )
+
+def save_scoring_profile(profile: ScoringProfile) -> None:
+    """Create or replace a named scoring profile."""
+    with transaction() as cursor:
+        cursor.execute('''
+        INSERT OR REPLACE INTO scoring_profiles
+        (name, effort_weight, consequences_weight, desire_weight, repetitions_weight,
+         due_buckets, later_due_points, no_due_points)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', _profile_row(profile))
+        # Rankings under this profile may have changed
+        log_task_event(cursor, 'profile_saved')
+
+def get_scoring_profile(name: str) -> Optional[ScoringProfile]:
+    """Get a scoring profile by name."""
+    cursor = get_connection().cursor()
+    
+    cursor.execute('''
+    SELECT name, effort_weight, consequences_weight, desire_weight, repetitions_weight,
+           due_buckets, later_due_points, no_due_points
+    FROM scoring_profiles WHERE name = ?
+    ''', (name,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    
+    return ScoringProfile(
+        name=row[0], effort_weight=row[1], consequences_weight=row[2],
+        desire_weight=row[3], repetitions_weight=row[4],
+        due_buckets=[tuple(bucket) for bucket in json.loads(row[5])],
+        later_due_points=row[6], no_due_points=row[7],
+    )
+
+def list_scoring_profiles() -> List[str]:
+    """Get the names of all scoring profiles."""
+    cursor = get_connection().cursor()
+    
+    cursor.execute('SELECT name FROM scoring_profiles ORDER BY name')
+    names = [row[0] for row in cursor.fetchall()]
+    
+    return names
+
+def compile_profile(profile: ScoringProfile, now_ts: int = None) -> Tuple[str, List[Any]]:
+    """Compile a scoring profile into a parameterized SQL ranking expression.
+    
+    Only the number of due buckets shapes the SQL text; all weights, bucket
+    bounds and the current time are bound parameters, so profiles share
+    cached statements. Returns the expression and its positional parameters.
+    """
+    if now_ts is None:
+        now_ts = int(time.time())
+    
+    due_cases = []
+    params = [profile.no_due_points]
+    for max_days, points in profile.due_buckets:
+        # floor((due_ts - now) / day) <= max_days, in integer arithmetic
+        due_cases.append('WHEN due_ts < ? THEN ?')
+        params.extend([now_ts + (int(max_days) + 1) * SECONDS_PER_DAY, points])
+    params.extend([
+        profile.later_due_points,
+        profile.effort_weight, profile.consequences_weight,
+        profile.desire_weight, profile.repetitions_weight,
+    ])
+    
+    sql = (
+        f"(CASE WHEN due_ts IS NULL THEN ? {' '.join(due_cases)} ELSE ? END"
+        " + ? * effort + ? * consequences + ? * desire + ? * (repetitions - 1))"
+    )
+    return sql, params
+
+def _load_compiled_profile(name: str) -> Tuple[str, List[Any]]:
+    """Load and compile a profile, raising ValueError if it doesn't exist."""
+    profile = get_scoring_profile(name)
+    if profile is None:
+        raise ValueError(f"Unknown scoring profile: {name}")
+    return compile_profile(profile)
+
+def _select_with_score(columns: Tuple[str, ...], score_sql: str) -> str:
+    """Build a SELECT list that returns score_sql in place of the score column."""
+    return ', '.join(f'{score_sql} AS score' if column == 'score' else column for column in columns)
+
+def get_cached_extraction(key: str, ttl_seconds: int) -> Optional[Dict[str, Any]]:
+    """Get a cached extraction result younger than the TTL, marking it used."""
+    now_ts = int(time.time())
+    cursor = get_connection().cursor()
+    
+    cursor.execute('''
+    SELECT result FROM llm_cache WHERE key = ? AND created_ts > ?
+    ''', (key, now_ts - ttl_seconds))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    
+    with transaction() as cursor:
+        cursor.execute('UPDATE llm_cache SET used_ts = ? WHERE key = ?', (now_ts, key))
+    
+    return json.loads(row[0])
+
+def put_cached_extraction(key: str, result: Dict[str, Any], ttl_seconds: int, max_entries: int) -> None:
+    """Store an extraction result, then drop expired and least recently used entries."""
+    now_ts = int(time.time())
+    
+    with transaction() as cursor:
+        cursor.execute('''
+        INSERT OR REPLACE INTO llm_cache (key, result, created_ts, used_ts)
+        VALUES (?, ?, ?, ?)
+        ''', (key, json.dumps(result), now_ts, now_ts))
+        
+        cursor.execute('DELETE FROM llm_cache WHERE created_ts <= ?', (now_ts - ttl_seconds,))
+        cursor.execute('''
+        DELETE FROM llm_cache WHERE key IN (
+            SELECT key FROM llm_cache ORDER BY used_ts DESC LIMIT -1 OFFSET ?
+        )
+        ''', (max_entries,))
+
+# Finished NLP jobs are kept this long for clients to poll
+NLP_JOB_RETENTION_SECONDS = 86400
+
+def create_nlp_job(job_id: str) -> None:
+    """Record a queued NLP job and drop finished jobs past their retention."""
+    now_ts = int(time.time())
+    
+    with transaction() as cursor:
+        cursor.execute('''
+        INSERT INTO nlp_jobs (id, status, created_ts, updated_ts) VALUES (?, 'queued', ?, ?)
+        ''', (job_id, now_ts, now_ts))
+        cursor.execute('''
+        DELETE FROM nlp_jobs WHERE status IN ('succeeded', 'failed') AND updated_ts < ?
+        ''', (now_ts - NLP_JOB_RETENTION_SECONDS,))
+
+def update_nlp_job(job_id: str, status: str, task_id: int = None,
+                   result: Dict[str, Any] = None, error: str = None) -> None:
+    """Set the status of an NLP job and, once finished, its outcome."""
+    with transaction() as cursor:
+        cursor.execute('''
+        UPDATE nlp_jobs SET status = ?, task_id = ?, result = ?, error = ?, updated_ts = ?
+        WHERE id = ?
+        ''', (status, task_id, json.dumps(result) if result is not None else None,
+              error, int(time.time()), job_id))
+
+def get_nlp_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Get an NLP job by its ID."""
+    cursor = get_connection().cursor()
+    cursor.row_factory = sqlite3.Row
+    
+    cursor.execute('SELECT * FROM nlp_jobs WHERE id = ?', (job_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    
+    job = dict(row)
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
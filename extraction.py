@@ -0,0 +1,134 @@
+"""LLM-based task extraction with a persistent, content-addressed cache."""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, Any
+
+from dotenv import load_dotenv
+
+import database
+from utils import extract_task_info_from_text
+
+TASK_EXTRACTION_TEMPLATE = """
+    Extract task information from the following text:
+    
+    {text}
+    
+    Return a JSON object with these fields:
+    - title: A short title for the task
+    - description: A longer description (if available)
+    - due_date: Due date in YYYY-MM-DD format or null if not specified
+    - effort: A score from 1-10 indicating effort (10 = minimal effort)
+    - consequences: A score from 1-10 indicating consequences (10 = severe)
+    - desire: A score from 1-10 indicating desire to complete (10 = high desire)
+    """
+
+# Load environment variables before reading the settings below
+load_dotenv()
+
+# Editing the prompt changes its version, so stale results are never served
+PROMPT_VERSION = hashlib.sha256(TASK_EXTRACTION_TEMPLATE.encode()).hexdigest()[:12]
+
+# Set GTD_LLM_MODEL=stub to extract with the local StubLLM instead of OpenAI;
+# GTD_LLM_STUB_LATENCY sets its simulated delay in seconds
+MODEL_NAME = os.environ.get("GTD_LLM_MODEL", "gpt-3.5-turbo-instruct")
+CACHE_TTL_SECONDS = int(os.environ.get("GTD_LLM_CACHE_TTL", 30 * 86400))
+CACHE_MAX_ENTRIES = int(os.environ.get("GTD_LLM_CACHE_MAX_ENTRIES", 10000))
+# Inputs the rule-based extraction handles with less confidence go to the LLM
+LLM_CONFIDENCE_THRESHOLD = float(os.environ.get("GTD_LLM_CONFIDENCE_THRESHOLD", 0.6))
+# Bounds how long one LLM request can hold a worker thread
+LLM_TIMEOUT_SECONDS = float(os.environ.get("GTD_LLM_TIMEOUT", 30))
+
+class StubLLM:
+    """A local stand-in for the LLM chain, for tests and benchmarks.
+    
+    Answers with the rule-based extraction as JSON after an optional delay,
+    and counts how often it was called.
+    """
+    
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def invoke(self, text: str) -> str:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return json.dumps(extract_task_info_from_text(text))
+
+_chain = None
+_chain_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+def get_extraction_chain():
+    """Get the extraction chain, building the LLM client on first use."""
+    global _chain
+    with _chain_lock:
+        if _chain is None:
+            if MODEL_NAME == "stub":
+                _chain = StubLLM(latency=float(os.environ.get("GTD_LLM_STUB_LATENCY", 0)))
+            else:
+                from langchain_openai import OpenAI
+                from langchain.prompts import PromptTemplate
+                
+                prompt = PromptTemplate(input_variables=["text"], template=TASK_EXTRACTION_TEMPLATE)
+                llm = OpenAI(
+                    model=MODEL_NAME,
+                    openai_api_key=os.environ.get("OPENAI_API_KEY"),
+                    temperature=0.7,
+                    timeout=LLM_TIMEOUT_SECONDS
+                )
+                _chain = prompt | llm
+        return _chain
+
+def set_extraction_chain(chain):
+    """Replace the extraction chain, e.g. with a StubLLM."""
+    global _chain
+    with _chain_lock:
+        _chain = chain
+
+def normalize_text(text: str) -> str:
+    """Canonical form of the input, so trivially different copies share a cache entry."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+def cache_key(text: str) -> str:
+    """Hash of the normalized text, the prompt version and the model."""
+    material = "\0".join((PROMPT_VERSION, MODEL_NAME, normalize_text(text)))
+    return hashlib.sha256(material.encode()).hexdigest()
+
+def extract_task_info_with_llm(text: str) -> Dict[str, Any]:
+    """Extract task information with the LLM, serving repeated inputs from the cache.
+    
+    Raises ValueError if the LLM output is not a JSON object.
+    """
+    key = cache_key(text)
+    task_info = database.get_cached_extraction(key, CACHE_TTL_SECONDS)
+    with _stats_lock:
+        _stats["hits" if task_info is not None else "misses"] += 1
+    if task_info is not None:
+        return task_info
+    
+    result = get_extraction_chain().invoke(text)
+    # Chat models return a message, completion models a string
+    result = getattr(result, "content", result)
+    task_info = json.loads(result)
+    if not isinstance(task_info, dict):
+        raise ValueError(f"LLM output is not a JSON object: {result}")
+    
+    database.put_cached_extraction(key, task_info, CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES)
+    return task_info
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit and miss counts of the extraction cache in this process."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
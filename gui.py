@@ -1,18 +1,280 @@
 import flet as ft
 from flet import (
     AppBar, ElevatedButton, Page, Row, Column, Text, TextField,
-    Dropdown, Tab, Tabs, DataTable, DataColumn, DataRow, DataCell,
-    Card, Icon, icons, Colors, DatePicker, Slider, AlertDialog,
-    Container, IconButton, FloatingActionButton, ListTile, Divider,
+    Dropdown, Tab, Tabs, ListView, Card, Icon, icons, Colors,
+    DatePicker, Slider, AlertDialog, Container, IconButton,
+    FloatingActionButton, ListTile, Divider,
 )
 import datetime
+from typing import Callable, List
 import database
 from models import Task, Quadrant
-import asyncio
-from utils import check_for_similar_tasks
-from statusbar import StatusBarApp
+from background import BackgroundWorker, Job, SimilarityMerger
+from changes import ChangeWatcher
 import threading
 
+# Refreshes covering more logged changes than this reload the whole list
+FULL_RELOAD_EVENTS = 500
+# Every row has the same height, so a scroll offset maps straight to a list position
+ROW_HEIGHT = 48
+# Tasks per query; the list keeps the pages in view plus one either side
+PAGE_SIZE = 20
+LIST_HEIGHT = 480
+# Column titles and widths of the task list, in TaskRow.values order
+COLUMNS = (("ID", 60), ("Title", 280), ("Due Date", 100), ("Score", 70), ("Quadrant", 190), ("Status", 90))
+# Tasks a quadrant card shows at first, and how many more "Load more" adds
+QUADRANT_PAGE_SIZE = 10
+# Background jobs: seconds between runs and time budget per run in seconds
+MERGE_INTERVAL, MERGE_BUDGET = 5, 0.05
+RESCORE_INTERVAL, RESCORE_BUDGET = 60, 0.05
+# app_state key of the auto-merge setting, "1" when turned on
+AUTO_MERGE_KEY = "auto_merge"
+
+class TaskRow(Container):
+    """List row for one task, kept and updated in place while it stays loaded.
+    
+    Rows are isolated, so updating the list only diffs which rows it
+    holds; a row whose task changed is sent by updating the row itself.
+    """
+    
+    def __init__(self, task: Task, actions: Row):
+        self.cells = [
+            Text(value, width=width, no_wrap=True, overflow=ft.TextOverflow.ELLIPSIS)
+            for value, (_, width) in zip(self.values(task), COLUMNS)
+        ]
+        super().__init__(
+            content=Row(self.cells + [actions]),
+            height=ROW_HEIGHT,
+            border=ft.border.only(bottom=ft.border.BorderSide(1, Colors.BLACK12)),
+        )
+        self.data = task
+    
+    @staticmethod
+    def values(task: Task) -> tuple:
+        return (
+            str(task.id),
+            task.title,
+            task.due_date.strftime("%Y-%m-%d") if task.due_date else "N/A",
+            f"{task.score:.2f}",
+            task.get_quadrant().name.replace("_", " "),
+            "Completed" if task.completed else "Active",
+        )
+    
+    def set_task(self, task: Task) -> bool:
+        """Show `task` in this row; returns whether any cell changed."""
+        self.data = task
+        changed = False
+        for cell, value in zip(self.cells, self.values(task)):
+            if cell.value != value:
+                cell.value = value
+                changed = True
+        return changed
+    
+    def is_isolated(self) -> bool:
+        return True
+
+class TaskList(Column):
+    """Ranked task list that only holds controls for the rows around the viewport.
+    
+    The list is as tall as if every matching task had a row: spacers stand
+    in for the rows above and below the loaded window. As the user scrolls,
+    the window moves a page at a time and its tasks are fetched in SQL
+    rank order with keyset queries, seeking on the score index when the
+    user jumps to a part of the list not seen yet.
+    """
+    
+    def __init__(self, new_row: Callable[[Task], TaskRow]):
+        self._new_row = new_row
+        self._lock = threading.Lock()
+        self.completed = False
+        self.quadrant = None
+        # (completed, task count) of each part of the list, in display order
+        self._segments = []
+        # (score, id) of the last task of each page seen, by list position
+        self._keys = {}
+        # Rows of the loaded window [_start, _end), by task ID
+        self._rows = {}
+        self._start = self._end = 0
+        self._top = Container(height=0)
+        self._bottom = Container(height=0)
+        self.list_view = ListView(
+            controls=[self._top, self._bottom],
+            height=LIST_HEIGHT,
+            on_scroll=self._on_scroll,
+            on_scroll_interval=100,
+        )
+        header = Row(
+            [Text(title, width=width, weight=ft.FontWeight.BOLD) for title, width in COLUMNS]
+            + [Text("Actions", weight=ft.FontWeight.BOLD)]
+        )
+        super().__init__(controls=[header, Divider(height=1), self.list_view], spacing=0)
+    
+    @property
+    def total(self) -> int:
+        return sum(count for _, count in self._segments)
+    
+    def set_filter(self, completed: bool, quadrant: int = None) -> list:
+        """Show tasks matching the filters from the top; returns the rows to send."""
+        with self._lock:
+            self.completed = completed
+            self.quadrant = quadrant
+            self._start = self._end = 0
+            return self._reload()
+    
+    def reload(self) -> list:
+        """Re-read the counts and the loaded window; returns the rows to send."""
+        with self._lock:
+            return self._reload()
+    
+    def show(self, changed: list, *controls):
+        """Send changed rows, then the list's new contents, to the client."""
+        # Changed rows go first: a row that also moved is then re-added with its new values
+        self.page.update(*changed, self.list_view, *controls)
+    
+    def _reload(self) -> list:
+        # All tasks lists open tasks first, so each part stays on its score index
+        parts = [False, True] if self.completed is None else [self.completed]
+        self._segments = [(completed, database.count_tasks(completed, self.quadrant)) for completed in parts]
+        self._keys.clear()
+        start = min(self._start, max(self.total - 1, 0) // PAGE_SIZE * PAGE_SIZE)
+        return self._load(start, max(self._end, start + 2 * PAGE_SIZE))
+    
+    def _on_scroll(self, e):
+        first = int(e.pixels // ROW_HEIGHT)
+        last = int((e.pixels + e.viewport_dimension) // ROW_HEIGHT)
+        start = max(first // PAGE_SIZE - 1, 0) * PAGE_SIZE
+        end = (last // PAGE_SIZE + 2) * PAGE_SIZE
+        with self._lock:
+            if (start, min(end, self.total)) == (self._start, self._end):
+                return
+            changed = self._load(start, end)
+        self.show(changed)
+    
+    def _load(self, start: int, end: int) -> list:
+        """Load list positions [start, end), reusing rows already loaded."""
+        tasks = []
+        offset = 0
+        for completed, count in self._segments:
+            first, last = max(start - offset, 0), min(end - offset, count)
+            if first < last:
+                tasks += self._fetch(completed, offset, first, last)
+            offset += count
+        
+        rows, changed = {}, []
+        for task in tasks:
+            row = self._rows.get(task.id)
+            if row is None:
+                row = self._new_row(task)
+            elif row.set_task(task):
+                changed.append(row)
+            rows[task.id] = row
+        
+        self._rows = rows
+        self._start, self._end = start, start + len(tasks)
+        self._top.height = start * ROW_HEIGHT
+        self._bottom.height = (self.total - self._end) * ROW_HEIGHT
+        self.list_view.controls = [self._top, *rows.values(), self._bottom]
+        return changed
+    
+    def _fetch(self, completed: bool, offset: int, first: int, last: int) -> List[Task]:
+        """Fetch positions [first, last) of one part of the list, `offset` rows down."""
+        after = None
+        if first:
+            after = self._keys.get(offset + first - 1)
+            if after is None:
+                after = database.get_task_key_at(first - 1, completed, self.quadrant)
+        tasks = database.get_all_tasks(completed=completed, quadrant=self.quadrant, as_tasks=True,
+                                       limit=last - first, after=after)
+        for position, task in enumerate(tasks, offset + first):
+            if (position + 1) % PAGE_SIZE == 0:
+                self._keys[position] = (task.score, task.id)
+        return tasks
+
+class QuadrantItem(Row):
+    """One task on a quadrant card, kept and updated in place like TaskRow."""
+    
+    def __init__(self, task: Task, on_complete: Callable[[Task], None]):
+        self._title = Text(task.title, expand=True, no_wrap=True, overflow=ft.TextOverflow.ELLIPSIS)
+        self._score = Text(f"{task.score:.1f}")
+        super().__init__([
+            self._title,
+            self._score,
+            IconButton(icon=icons.CHECK_CIRCLE_OUTLINE, on_click=lambda e: on_complete(self.data)),
+        ])
+        self.data = task
+    
+    def set_task(self, task: Task) -> bool:
+        """Show `task` in this item; returns whether anything changed."""
+        self.data = task
+        title, score = task.title, f"{task.score:.1f}"
+        if (self._title.value, self._score.value) == (title, score):
+            return False
+        self._title.value, self._score.value = title, score
+        return True
+    
+    def is_isolated(self) -> bool:
+        return True
+
+class QuadrantCard(Card):
+    """Card listing the top open tasks of one quadrant, with "Load more"."""
+    
+    def __init__(self, quadrant: Quadrant, title: str, color: str,
+                 on_complete: Callable[[Task], None], on_load_more: Callable[["QuadrantCard"], None]):
+        self.quadrant = quadrant
+        # Number of tasks to show; "Load more" raises it a page at a time
+        self.limit = QUADRANT_PAGE_SIZE
+        self._on_complete = on_complete
+        self._items = {}
+        self._count = Text()
+        self.tasks_column = Column([], scroll=ft.ScrollMode.AUTO, height=200)
+        self._more = ft.TextButton("Load more", on_click=lambda e: on_load_more(self), visible=False)
+        super().__init__(
+            content=Container(
+                content=Column(
+                    controls=[
+                        Row([Text(title, weight=ft.FontWeight.BOLD, size=16, expand=True), self._count]),
+                        Divider(),
+                        self.tasks_column,
+                        self._more,
+                    ],
+                    spacing=10,
+                ),
+                padding=15,
+                border_radius=10,
+            ),
+            color=color,
+            width=350,
+            height=340,
+        )
+    
+    @property
+    def last_key(self):
+        """(score, id) of the last task shown, to fetch the next page after."""
+        if not self.tasks_column.controls:
+            return None
+        task = self.tasks_column.controls[-1].data
+        return (task.score, task.id)
+    
+    def set_tasks(self, tasks: List[Task], total: int, append: bool = False) -> list:
+        """Show `tasks`, reusing items by task ID; returns the items to send."""
+        if append:
+            tasks = [item.data for item in self.tasks_column.controls] + tasks
+        
+        items, changed = {}, []
+        for task in tasks:
+            item = self._items.get(task.id)
+            if item is None:
+                item = QuadrantItem(task, self._on_complete)
+            elif item.set_task(task):
+                changed.append(item)
+            items[task.id] = item
+        
+        self._items = items
+        self.tasks_column.controls = list(items.values())
+        self._count.value = f"{len(items)} of {total}"
+        self._more.visible = len(items) < total
+        return changed
+
 class GTDApp:
     def __init__(self, page: ft.Page):
         self.page = page
@@ -21,14 +283,39 @@ class GTDApp:
         self.page.window_width = 800
         self.page.window_height = 600
         
+        # Prerequisite options on screen, by task ID
+        self._options = {}
+        # Last task_events seq applied to the list and options, both loaded below
+        self._seen_seq = database.get_change_counter()
+        # Changes are applied from UI handlers and the change watcher
+        self._sync_lock = threading.RLock()
+        
+        self.worker = BackgroundWorker(
+            jobs=[
+                Job("Auto-merge", SimilarityMerger(), MERGE_BUDGET, MERGE_INTERVAL,
+                    enabled=lambda: self.auto_merge_switch.value),
+                Job("Rescore", lambda should_stop: database.rescore_tasks(should_stop=should_stop),
+                    RESCORE_BUDGET, RESCORE_INTERVAL),
+            ],
+            on_run=self.show_job_timing,
+        )
+        
+        # Picks up commits from other processes, such as `gtd create` or the API,
+        # and from the background jobs, which commit on their own connection
+        self.watcher = ChangeWatcher()
+        self.watcher.subscribe(lambda events: self.sync_changes())
+        
         self.setup_ui()
         self.load_tasks()
         
         # Start background tasks for auto-merge and priority adjustments
-        asyncio.create_task(self.background_tasks())
+        self.page.on_close = self.shutdown
+        self.page.run_task(self.background_tasks)
+        self.watcher.start()
     
     def setup_ui(self):
         # Create the tabs
+        self.dashboard_tab = self.create_dashboard_tab()
         self.tasks_tab = self.create_tasks_tab()
         self.add_task_tab = self.create_add_task_tab()
         self.settings_tab = self.create_settings_tab()
@@ -38,6 +325,7 @@ class GTDApp:
             selected_index=0,
             animation_duration=300,
             tabs=[
+                Tab(text="Dashboard", icon=icons.DASHBOARD, content=self.dashboard_tab),
                 Tab(text="Tasks", icon=icons.LIST_ALT, content=self.tasks_tab),
                 Tab(text="Add Task", icon=icons.ADD, content=self.add_task_tab),
                 Tab(text="Settings", icon=icons.SETTINGS, content=self.settings_tab),
@@ -67,27 +355,10 @@ class GTDApp:
         self.page.appbar = self.app_bar
         self.page.add(self.tabs)
         self.page.floating_action_button = self.fab
-        
+    
     def create_tasks_tab(self):
-        # Create data table for tasks
-        self.tasks_table = DataTable(
-            columns=[
-                DataColumn(Text("ID")),
-                DataColumn(Text("Title")),
-                DataColumn(Text("Due Date")),
-                DataColumn(Text("Score")),
-                DataColumn(Text("Quadrant")),
-                DataColumn(Text("Status")),
-                DataColumn(Text("Actions")),
-            ],
-            rows=[],
-            border=ft.border.all(1, Colors.BLACK12),
-            border_radius=10,
-            vertical_lines=ft.border.BorderSide(1, Colors.BLACK12),
-            horizontal_lines=ft.border.BorderSide(1, Colors.BLACK12),
-            sort_column_index=3,  # Sort by score by default
-            sort_ascending=False,  # Descending order
-        )
+        # Only the rows around the viewport are built, however long the list
+        self.task_list = TaskList(self._new_row)
         
         # Filter controls
         self.filter_dropdown = Dropdown(
@@ -101,37 +372,47 @@ class GTDApp:
             width=200,
         )
         
+        self.quadrant_dropdown = Dropdown(
+            options=[ft.dropdown.Option("all", "All Quadrants")] + [
+                ft.dropdown.Option(str(quadrant.value), quadrant.name.replace("_", " ").title())
+                for quadrant in Quadrant
+            ],
+            value="all",
+            on_change=self.filter_tasks,
+            width=250,
+        )
+        
         filter_row = Row([
             Text("Show:"),
             self.filter_dropdown,
+            self.quadrant_dropdown,
             ElevatedButton("Refresh", on_click=self.refresh_tasks),
         ])
         
-        # Quadrant view
-        self.quadrant_view = Column(
+        return Column(
             controls=[
-                Text("Four Quadrant View", size=20, weight=ft.FontWeight.BOLD),
-                Row(
-                    controls=[
-                        self.create_quadrant_card(Quadrant.URGENT_IMPORTANT),
-                        self.create_quadrant_card(Quadrant.NOT_URGENT_IMPORTANT),
-                        self.create_quadrant_card(Quadrant.URGENT_NOT_IMPORTANT),
-                        self.create_quadrant_card(Quadrant.NOT_URGENT_NOT_IMPORTANT),
-                    ],
-                    spacing=10,
-                ),
+                filter_row,
+                self.task_list,
             ],
             spacing=20,
         )
+    
+    def create_dashboard_tab(self):
+        """Create the four-quadrant dashboard."""
+        self.quadrant_cards = {quadrant: self.create_quadrant_card(quadrant) for quadrant in Quadrant}
         
         return Column(
             controls=[
-                filter_row,
-                self.tasks_table,
-                Divider(),
-                self.quadrant_view,
+                Text("Four Quadrant View", size=20, weight=ft.FontWeight.BOLD),
+                Row(
+                    controls=list(self.quadrant_cards.values()),
+                    spacing=10,
+                    wrap=True,
+                ),
             ],
             spacing=20,
+            scroll=ft.ScrollMode.AUTO,
+            expand=True,
         )
     
     def create_quadrant_card(self, quadrant: Quadrant):
@@ -150,24 +431,8 @@ class GTDApp:
             Quadrant.NOT_URGENT_NOT_IMPORTANT: Colors.GREEN_400,
         }
         
-        return Card(
-            content=Container(
-                content=Column(
-                    controls=[
-                        Text(title_map[quadrant], weight=ft.FontWeight.BOLD, size=16),
-                        Divider(),
-                        # Tasks will be populated here
-                        Column([], scroll=ft.ScrollMode.AUTO, height=200),
-                    ],
-                    spacing=10,
-                ),
-                padding=15,
-                border_radius=10,
-            ),
-            color=color_map[quadrant],
-            width=350,
-            height=300,
-        )
+        return QuadrantCard(quadrant, title_map[quadrant], color_map[quadrant],
+                            on_complete=self.mark_complete, on_load_more=self.load_more)
     
     def create_add_task_tab(self):
         """Create the tab for adding new tasks."""
@@ -248,6 +513,20 @@ class GTDApp:
     
     def create_settings_tab(self):
         """Create the settings tab."""
+        # Merging deletes tasks, so it stays off until turned on
+        self.auto_merge_switch = ft.Switch(value=database.get_state(AUTO_MERGE_KEY) == "1",
+                                           on_change=self.toggle_auto_merge)
+        
+        # One row per background job, updated after each of its runs
+        self.job_rows = {}
+        for job in self.worker.jobs:
+            self.job_rows[job.name] = ft.DataRow(cells=[ft.DataCell(Text(value)) for value in self._job_timing(job)])
+        self.jobs_table = ft.DataTable(
+            columns=[ft.DataColumn(Text(title)) for title in
+                     ("Job", "Runs", "Last", "Max", "Average", "Budget", "Over budget", "Last result")],
+            rows=list(self.job_rows.values()),
+        )
+        
         return Column(
             controls=[
                 Text("Settings", size=20, weight=ft.FontWeight.BOLD),
@@ -259,7 +538,7 @@ class GTDApp:
                 ListTile(
                     leading=Icon(icons.AUTO_AWESOME),
                     title=Text("Auto-merge similar tasks"),
-                    trailing=ft.Switch(value=True),
+                    trailing=self.auto_merge_switch,
                 ),
                 ListTile(
                     leading=Icon(icons.COLOR_LENS),
@@ -270,17 +549,45 @@ class GTDApp:
                     ),
                 ),
                 ElevatedButton("Save Settings", on_click=self.save_settings),
+                Divider(),
+                Text("Background Jobs", size=16, weight=ft.FontWeight.BOLD),
+                self.jobs_table,
             ],
             spacing=20,
+            scroll=ft.ScrollMode.AUTO,
             expand=True,
             #padding=20,
         )
     
     async def background_tasks(self):
         """Run background tasks such as auto-merge and priority adjustments."""
-        while True:
-            # Check for tasks that need to be adjusted
-            await asyncio.sleep(60)  # Check every minute
+        await self.worker.run()
+    
+    def shutdown(self, e=None):
+        """Stop the background jobs and the change watcher."""
+        self.worker.cancel()
+        self.watcher.stop()
+    
+    @staticmethod
+    def _job_timing(job: Job) -> tuple:
+        average = job.total_ms / job.runs if job.runs else 0
+        return (
+            job.name,
+            str(job.runs),
+            f"{job.last_ms:.1f} ms",
+            f"{job.max_ms:.1f} ms",
+            f"{average:.1f} ms",
+            f"{job.budget * 1000:.0f} ms",
+            str(job.over_budget),
+            f"Error: {job.error}" if job.error else str(job.last_result),
+        )
+    
+    def show_job_timing(self, job: Job):
+        """Show a background job's latest timings in the settings tab."""
+        row = self.job_rows[job.name]
+        for cell, value in zip(row.cells, self._job_timing(job)):
+            cell.content.value = value
+        self.page.update(row)
     
     def on_date_selected(self, e):
         """Handle date selection from the date picker."""
@@ -290,73 +597,114 @@ class GTDApp:
     
     def update_pretask_dropdown(self):
         """Update the prerequisite task dropdown with current active tasks."""
-        tasks = database.get_all_tasks(completed=False)
+        tasks = database.get_all_tasks(completed=False, fields=['id', 'title', 'score'])
         
-        # Clear existing options and add the None option
-        self.pretask_dropdown.options = [ft.dropdown.Option("None", "None")]
-        
-        # Add tasks to the dropdown
+        for task_id in self._options.keys() - {task['id'] for task in tasks}:
+            del self._options[task_id]
         for task in tasks:
-            self.pretask_dropdown.options.append(
-                ft.dropdown.Option(str(task['id']), f"#{task['id']}: {task['title']}")
-            )
-            
+            self._set_option(task['id'], task['title'], task['score'])
+        
+        self._sort_options()
         self.page.update()
     
-    def load_tasks(self):
-        """Load tasks and update the UI."""
-        # Determine which tasks to load based on filter
-        completed_filter = None
+    def _set_option(self, task_id: int, title: str, score: float):
+        option = self._options.get(task_id)
+        if option is None:
+            option = self._options[task_id] = ft.dropdown.Option(str(task_id))
+        option.text = f"#{task_id}: {title}"
+        option.data = (-(score or 0), task_id)
+    
+    def _sort_options(self):
+        # Keep the "None" option first
+        self.pretask_dropdown.options = self.pretask_dropdown.options[:1] + sorted(
+            self._options.values(), key=lambda option: option.data
+        )
+    
+    def _completed_filter(self):
         if self.filter_dropdown.value == "active":
-            completed_filter = False
-        elif self.filter_dropdown.value == "completed":
-            completed_filter = True
-        
-        tasks = database.get_all_tasks(completed=completed_filter)
-        
-        # Clear existing rows
-        self.tasks_table.rows = []
-        
-        # Add tasks to the table
-        for task_data in tasks:
-            task = Task.from_dict(task_data)
-            
-            due_date_str = task.due_date.strftime("%Y-%m-%d") if task.due_date else "N/A"
-            status = "Completed" if task.completed else "Active"
-            quadrant = task.get_quadrant().name.replace("_", " ")
-            
-            # Create action buttons
-            edit_button = IconButton(icon=icons.EDIT, on_click=lambda e, t=task: self.edit_task(t))
-            complete_button = IconButton(icon=icons.CHECK_CIRCLE_OUTLINE, on_click=lambda e, t=task: self.mark_complete(t))
-            delete_button = IconButton(icon=icons.DELETE, on_click=lambda e, t=task: self.delete_task(t))
+            return False
+        if self.filter_dropdown.value == "completed":
+            return True
+        return None
+    
+    def _quadrant_filter(self):
+        if self.quadrant_dropdown.value == "all":
+            return None
+        return int(self.quadrant_dropdown.value)
+    
+    def _new_row(self, task: Task) -> TaskRow:
+        # Handlers read the row's current task, so they outlive updates
+        row = TaskRow(task, Row([
+            IconButton(icon=icons.EDIT, on_click=lambda e: self.edit_task(row.data)),
+            IconButton(icon=icons.CHECK_CIRCLE_OUTLINE, on_click=lambda e: self.mark_complete(row.data)),
+            IconButton(icon=icons.DELETE, on_click=lambda e: self.delete_task(row.data)),
+        ]))
+        return row
+    
+    def load_tasks(self):
+        """Reload the rows in view and the quadrant cards, resending only what changed."""
+        self.task_list.show(self.task_list.reload(), *self._reload_quadrants())
+    
+    def _reload_quadrants(self) -> list:
+        """Refill the quadrant cards from one grouped query; returns the controls to send."""
+        cards = list(self.quadrant_cards.values())
+        tasks = database.get_top_tasks_by_quadrant({card.quadrant.value: card.limit for card in cards})
+        changed = []
+        for card in cards:
+            changed += card.set_tasks(tasks[card.quadrant.value], database.count_tasks(False, card.quadrant.value))
+        # Changed items go before the cards that may have moved them
+        return changed + cards
+    
+    def load_more(self, card: QuadrantCard):
+        """Show the next page of tasks on a quadrant card."""
+        # Syncs on the watcher thread rewrite the same card
+        with self._sync_lock:
+            tasks = database.get_all_tasks(completed=False, quadrant=card.quadrant.value, as_tasks=True,
+                                           limit=QUADRANT_PAGE_SIZE, after=card.last_key)
+            card.limit += QUADRANT_PAGE_SIZE
+            changed = card.set_tasks(tasks, database.count_tasks(False, card.quadrant.value), append=True)
+            self.page.update(*changed, card)
+    
+    def sync_changes(self) -> int:
+        """Apply task changes logged since the last refresh to the list and dropdown.
+        
+        Returns the number of changed tasks.
+        """
+        with self._sync_lock:
+            events = database.get_task_events_since(self._seen_seq, FULL_RELOAD_EVENTS + 1)
+            if not events:
+                return 0
+            task_ids = list({event['task_id'] for event in events})
+            if len(events) > FULL_RELOAD_EVENTS or None in task_ids:
+                # Large batches, such as an import, and changes not tied to a task
+                self.refresh_tasks()
+                return len(events)
+            self._seen_seq = events[-1]['seq']
             
-            actions = Row([edit_button, complete_button, delete_button])
+            tasks = {task.id: task for task in database.get_tasks_by_ids(task_ids)}
+            for task_id in task_ids:
+                task = tasks.get(task_id)
+                if task is None or task.completed:
+                    self._options.pop(task_id, None)
+                else:
+                    self._set_option(task.id, task.title, task.score)
+            self._sort_options()
             
-            self.tasks_table.rows.append(
-                DataRow(
-                    cells=[
-                        DataCell(Text(str(task.id))),
-                        DataCell(Text(task.title)),
-                        DataCell(Text(due_date_str)),
-                        DataCell(Text(f"{task.score:.2f}")),
-                        DataCell(Text(quadrant)),
-                        DataCell(Text(status)),
-                        DataCell(actions),
-                    ]
-                )
-            )
-        
-        # Update the page
-        self.page.update()
+            # The list and cards hold a bounded number of tasks, so re-reading them stays cheap
+            self.task_list.show(self.task_list.reload(), *self._reload_quadrants(), self.pretask_dropdown)
+            return len(task_ids)
     
     def filter_tasks(self, e):
-        """Filter tasks based on dropdown selection."""
-        self.load_tasks()
+        """Filter tasks based on the dropdown selections."""
+        self.task_list.show(self.task_list.set_filter(self._completed_filter(), self._quadrant_filter()))
+        self.task_list.list_view.scroll_to(offset=0)
     
     def refresh_tasks(self, e=None):
-        """Refresh tasks from the database."""
-        self.load_tasks()
-        self.update_pretask_dropdown()
+        """Reload tasks from the database, sending only what changed."""
+        with self._sync_lock:
+            self._seen_seq = database.get_change_counter()
+            self.load_tasks()
+            self.update_pretask_dropdown()
     
     def add_task(self, e):
         """Add a new task from the form data."""
@@ -401,10 +749,10 @@ class GTDApp:
             self.show_success(f"Task created with ID: {task_id}")
             
             # Refresh the task list
-            self.refresh_tasks()
+            self.sync_changes()
             
             # Switch to tasks tab
-            self.tabs.selected_index = 0
+            self.tabs.selected_index = 1
             self.page.update()
             
         except Exception as e:
@@ -416,7 +764,7 @@ class GTDApp:
         
         if success:
             self.show_success(f"Task {task.id} marked as complete")
-            self.refresh_tasks()
+            self.sync_changes()
         else:
             self.show_error(f"Failed to mark task {task.id} as complete")
     
@@ -437,7 +785,7 @@ class GTDApp:
         else:
             self.pretask_dropdown.value = "None"
         
-        self.tabs.selected_index = 1
+        self.tabs.selected_index = 2
         self.page.update()
     
     def delete_task(self, task: Task):
@@ -460,7 +808,7 @@ class GTDApp:
                 try:
                     task_id = database.add_task(title=title)
                     self.show_success(f"Quick task created with ID: {task_id}")
-                    self.refresh_tasks()
+                    self.sync_changes()
                 except Exception as ex:
                     self.show_error(f"Error creating task: {str(ex)}")
             close_dlg(e)
@@ -504,21 +852,19 @@ class GTDApp:
     
     def show_error(self, message: str):
         """Show an error message."""
-        self.page.snack_bar = ft.SnackBar(
+        # Opening it sends just the snack bar instead of diffing the whole page
+        self.page.open(ft.SnackBar(
             content=Text(message),
             bgcolor=Colors.RED_400,
-        )
-        self.page.snack_bar.open = True
-        self.page.update()
+        ))
     
     def show_success(self, message: str):
         """Show a success message."""
-        self.page.snack_bar = ft.SnackBar(
+        # Opening it sends just the snack bar instead of diffing the whole page
+        self.page.open(ft.SnackBar(
             content=Text(message),
             bgcolor=Colors.GREEN_400,
-        )
-        self.page.snack_bar.open = True
-        self.page.update()
+        ))
     
     def toggle_theme_mode(self, e):
         """Toggle between light and dark theme."""
@@ -528,6 +874,10 @@ class GTDApp:
             self.page.theme_mode = ft.ThemeMode.LIGHT
         self.page.update()
     
+    def toggle_auto_merge(self, e):
+        """Remember whether similar tasks are merged in the background."""
+        database.set_state(AUTO_MERGE_KEY, "1" if self.auto_merge_switch.value else "0")
+    
     def save_settings(self, e):
         """Save the application settings."""
         # Implementation of settings saving would go here
@@ -540,6 +890,7 @@ def launch_gui():
         app = GTDApp(page)
     
     # Start the status bar app in a separate thread
+    from statusbar import StatusBarApp
     status_bar_thread = threading.Thread(target=StatusBarApp().run)
     status_bar_thread.daemon = True
     status_bar_thread.start()
@@ -0,0 +1,105 @@
+"""Bounded background execution of NLP task-creation jobs."""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional
+
+import database
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+class NLPJobQueue:
+    """Runs jobs on a fixed pool of threads, with a cap on pending jobs.
+    
+    Job state is kept in the nlp_jobs table, so any server process can
+    answer a poll. Each job gets a deadline `timeout` seconds after it is
+    submitted: a job still queued at its deadline never runs, and the
+    handler receives the deadline and raises TimeoutError once it passes.
+    """
+    
+    def __init__(self, handler: Callable[[str, float], Dict[str, Any]], workers: int = 2,
+                 max_pending: int = 16, timeout: float = 60):
+        self.handler = handler
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nlp-job")
+        # Counts queued plus running jobs
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0, "timed_out": 0}
+    
+    def submit(self, text: str) -> str:
+        """Queue a job and return its ID, or raise QueueFullError."""
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise QueueFullError("NLP job queue is full")
+        
+        job_id = uuid.uuid4().hex
+        try:
+            database.create_nlp_job(job_id)
+            self._executor.submit(self._run, job_id, text, time.monotonic() + self.timeout)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._count("submitted")
+        return job_id
+    
+    def _run(self, job_id: str, text: str, deadline: float):
+        try:
+            if time.monotonic() > deadline:
+                self._fail(job_id, "timed out waiting in the queue", "timed_out")
+                return
+            
+            database.update_nlp_job(job_id, "running")
+            result = self.handler(text, deadline)
+            database.update_nlp_job(job_id, "succeeded", task_id=result.get("task_id"), result=result)
+            self._count("succeeded")
+        except TimeoutError as e:
+            self._fail(job_id, str(e), "timed_out")
+        except Exception as e:
+            self._fail(job_id, str(e), "failed")
+        finally:
+            self._slots.release()
+    
+    def _fail(self, job_id: str, error: str, stat: str):
+        database.update_nlp_job(job_id, "failed", error=error)
+        self._count(stat)
+    
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
+
+_queue = None
+_queue_pid = None
+_queue_lock = threading.Lock()
+
+def get_nlp_queue(handler: Callable[[str, float], Dict[str, Any]]) -> NLPJobQueue:
+    """Get this process's job queue, creating it on first use.
+    
+    Worker threads don't survive a fork, so each server process builds its
+    own pool, sized by GTD_NLP_WORKERS, GTD_NLP_MAX_PENDING and
+    GTD_NLP_JOB_TIMEOUT.
+    """
+    global _queue, _queue_pid
+    with _queue_lock:
+        if _queue is None or _queue_pid != os.getpid():
+            _queue = NLPJobQueue(
+                handler,
+                workers=int(os.environ.get("GTD_NLP_WORKERS", 2)),
+                max_pending=int(os.environ.get("GTD_NLP_MAX_PENDING", 16)),
+                timeout=float(os.environ.get("GTD_NLP_JOB_TIMEOUT", 60)),
+            )
+            _queue_pid = os.getpid()
+        return _queue
+
+def queue_stats() -> Optional[Dict[str, Any]]:
+    """Counters of this process's job queue, or None if it was never used."""
+    if _queue is None or _queue_pid != os.getpid():
+        return None
+    return _queue.get_stats()
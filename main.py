@@ -1,16 +1,9 @@
-import typer
-from typing import Optional
 import os
 import sys
 
 # Add the current directory to the path so we can import from local modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from cli import app as cli_app
-from gui import launch_gui
-from server import start_server
-import database
-
 def validate_date(date_string):
     """Validate and standardize date format."""
     if not date_string:
@@ -43,16 +36,27 @@ def create_task(title, description="", due_date=None, effort=5, consequences=5,
         return False, f"Error creating task: {str(e)}"
 
 def main():
+    # Hand the command to a running `gtd daemon` if there is one
+    from daemon import run_client
+    code = run_client(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+    
+    import database
+    
     # Initialize the database
     database.init_db()
     
-    # Check if the app is in GUI mode or CLI mode
+    # Bring time-dependent scores and quadrants up to date
+    database.rescore_tasks()
+    
+    # Check if the app is in GUI mode or CLI mode; each imports only what it needs
     if len(sys.argv) > 1 and sys.argv[1] == "gui":
+        from gui import launch_gui
         launch_gui()
-    elif len(sys.argv) > 1 and sys.argv[1] == "server":
-        start_server()
     else:
         # Run CLI mode
+        from cli import app as cli_app
         cli_app()
 
 if __name__ == "__main__":
@@ -1,29 +1,283 @@
 
 
-from arrow import get
 from mcp.server.fastmcp import FastMCP, Context, Image
 from cli import create_task as create_task_cli
 
-from database import add_task, get_all_tasks
+from pydantic import BaseModel
+
+from database import (
+    add_task, add_tasks, complete_tasks as complete_tasks_db, get_all_tasks,
+    get_highest_score_task, parse_fields,
+)
+from changes import ChangeWatcher
+import asyncio
+import base64
 import json
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
 
 mcp = FastMCP()
 
-# Tool fixes
+# Rough size of list_tasks responses; about four characters per token
+MCP_TOKEN_BUDGET = int(os.environ.get("GTD_MCP_TOKEN_BUDGET", 2000))
+CHARS_PER_TOKEN = 4
+MAX_LIST_LIMIT = 200
+DEFAULT_LIST_FIELDS = "id,title,due_date,quadrant,score"
+MAX_BATCH_SIZE = 500
+QUADRANT_RESOURCE_LIMIT = 50
+
+class NewTask(BaseModel):
+    title: str
+    description: str = None
+    due_date: str = None
+    effort: int = 5
+    consequences: int = 5
+    desire: int = 5
+
+def encode_cursor(score: float, task_id: int) -> str:
+    """Opaque continuation cursor for the task after (score, task_id)."""
+    return base64.urlsafe_b64encode(json.dumps([score, task_id]).encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        score, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), int(task_id)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+# Tools are async and run their SQLite work in a worker thread, so one
+# slow call never stalls the event loop serving the other sessions
 @mcp.tool(name="create_task", description="when user says remind me, create task, or add task")
-def create_task(title:str , description:str) -> str:
+async def create_task(title:str , description:str) -> str:
     """create a new task with title and optional description"""
-    add_task(title, description)
+    await asyncio.to_thread(add_task, title, description)
     return f"Task created: {title}"
+
+
+@mcp.tool(name="create_tasks", description=(
+    "create several tasks at once, e.g. a list of todos from notes. "
+    "Either all tasks are created or none"))
+async def create_tasks(tasks: list[NewTask]) -> str:
+    """create up to MAX_BATCH_SIZE tasks in one transaction"""
+    if len(tasks) > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} tasks per call")
+    task_ids = await asyncio.to_thread(add_tasks, [task.model_dump() for task in tasks])
+    return json.dumps({"created": task_ids})
+
+
+@mcp.tool(name="complete_tasks", description="mark one or more tasks as done by id")
+async def complete_tasks(task_ids: list[int]) -> str:
+    """complete up to MAX_BATCH_SIZE tasks in one transaction"""
+    if len(task_ids) > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} tasks per call")
+    task_ids = list(dict.fromkeys(task_ids))
+    completed = await asyncio.to_thread(complete_tasks_db, task_ids)
+    done = set(completed)
+    return json.dumps({
+        "completed": completed,
+        "not_found": [task_id for task_id in task_ids if task_id not in done],
+    })
+
+
+def list_tasks_page(status: str = "open", quadrant: int = None, limit: int = 20,
+                    cursor: str = None, fields: str = DEFAULT_LIST_FIELDS, max_tokens: int = None) -> str:
+    """One page of tasks by priority as JSON, within a token budget."""
+    completed = {"open": False, "completed": True, "all": None}.get(status, ...)
+    if completed is ...:
+        raise ValueError(f"Invalid status: {status!r}. Use open, completed or all")
+    names = parse_fields(fields)
+    limit = max(1, min(int(limit), MAX_LIST_LIMIT))
+    # Leave room for the envelope and cursor around the task list
+    budget = (max_tokens or MCP_TOKEN_BUDGET) * CHARS_PER_TOKEN - 64
+    
+    # id and score are always read, to build the continuation cursor
+    selected = names + [name for name in ("id", "score") if name not in names]
+    rows = get_all_tasks(completed=completed, quadrant=quadrant, fields=selected,
+                         limit=limit + 1, after=decode_cursor(cursor) if cursor else None)
+    
+    tasks = []
+    used = 0
+    for row in rows[:limit]:
+        task = {name: row[name] for name in names}
+        size = len(json.dumps(task)) + 2
+        # Always return at least one task so paging makes progress
+        if tasks and used + size > budget:
+            break
+        tasks.append(task)
+        used += size
+    
+    more = len(tasks) < len(rows)
+    last = rows[len(tasks) - 1] if tasks else None
+    return json.dumps({
+        "tasks": tasks,
+        "next_cursor": encode_cursor(last["score"], last["id"]) if more else None,
+    })
+
+
+@mcp.tool(name="list_tasks", description=(
+    "list tasks by priority, when user says list tasks, or what are my tasks etc. "
+    "status is open, completed or all; quadrant is 1-4. fields is a comma-separated "
+    "list of task fields. If next_cursor is set, pass it back as cursor with the same "
+    "filters to get the next page"))
+async def list_tasks(status: str = "open", quadrant: int = None, limit: int = 20,
+                     cursor: str = None, fields: str = DEFAULT_LIST_FIELDS, max_tokens: int = None) -> str:
+    """list tasks a page at a time, within a token budget"""
+    return await asyncio.to_thread(list_tasks_page, status, quadrant, limit, cursor, fields, max_tokens)
+
+
+
+TOP_TASK_URI = "gtd://tasks/top"
+_QUADRANT_URI = re.compile(r"^gtd://quadrant/([1-4])$")
+
+def top_task_json() -> str:
+    task = get_highest_score_task(as_tasks=True)
+    return json.dumps({"task": task.to_json_dict() if task else None})
+
+def quadrant_tasks_json(n: int) -> str:
+    if n not in (1, 2, 3, 4):
+        raise ValueError(f"Invalid quadrant: {n}. Use 1-4")
+    tasks = get_all_tasks(completed=False, quadrant=n, fields=parse_fields(DEFAULT_LIST_FIELDS),
+                          limit=QUADRANT_RESOURCE_LIMIT)
+    return json.dumps({"quadrant": n, "tasks": tasks})
+
+def render_resource(uri: str) -> str:
+    """Current contents of a gtd:// resource, as served to clients."""
+    if uri == TOP_TASK_URI:
+        return top_task_json()
+    match = _QUADRANT_URI.match(uri)
+    if match is None:
+        raise ValueError(f"Unknown resource: {uri}")
+    return quadrant_tasks_json(int(match.group(1)))
+
+
+@mcp.resource(TOP_TASK_URI, name="top_task", mime_type="application/json",
+              description="the open task to work on next; subscribe to hear when it changes")
+async def top_task() -> str:
+    return await asyncio.to_thread(top_task_json)
+
+
+@mcp.resource("gtd://quadrant/{n}", name="quadrant_tasks", mime_type="application/json",
+              description="the highest priority open tasks in Eisenhower quadrant n (1-4)")
+async def quadrant_tasks(n: str) -> str:
+    return await asyncio.to_thread(quadrant_tasks_json, int(n))
+
+
+class ResourceSubscriptions:
+    """Tracks which sessions watch which resources and notifies them on change.
+    
+    A ChangeWatcher thread polls the database's data_version, so nothing is
+    read while the database is idle. After a commit each subscribed
+    resource is rendered once, and subscribers are notified only if the
+    rendered contents differ from what they last saw.
+    """
+    
+    def __init__(self):
+        self._sessions = {}
+        self._contents = {}
+        self._watcher = None
+        self._loop = None
+        self._pending = None
+        self._dirty = False
+        self._lock = threading.Lock()
+    
+    async def subscribe(self, uri: str, session):
+        contents = await asyncio.to_thread(render_resource, uri)
+        self._contents.setdefault(uri, contents)
+        self._sessions.setdefault(uri, set()).add(session)
+        if self._watcher is None:
+            self._loop = asyncio.get_running_loop()
+            self._watcher = ChangeWatcher()
+            self._watcher.subscribe(self._on_change)
+            self._watcher.start()
     
+    def unsubscribe(self, uri: str, session):
+        sessions = self._sessions.get(uri, set())
+        sessions.discard(session)
+        if not sessions:
+            self._sessions.pop(uri, None)
+            self._contents.pop(uri, None)
+    
+    def _on_change(self, events):
+        # Called on the watcher thread; bursts of commits share one refresh
+        with self._lock:
+            self._dirty = True
+            if self._pending is None:
+                self._pending = asyncio.run_coroutine_threadsafe(self.refresh(), self._loop)
+    
+    async def refresh(self):
+        while True:
+            with self._lock:
+                if not self._dirty:
+                    self._pending = None
+                    return
+                self._dirty = False
+            
+            for uri in list(self._sessions):
+                try:
+                    contents = await asyncio.to_thread(render_resource, uri)
+                except Exception:
+                    logger.exception("Could not render %s", uri)
+                    continue
+                if contents == self._contents.get(uri):
+                    continue
+                self._contents[uri] = contents
+                for session in list(self._sessions.get(uri, ())):
+                    try:
+                        await session.send_resource_updated(uri)
+                    except Exception:
+                        # The client went away without unsubscribing
+                        logger.debug("Dropping subscriber to %s", uri, exc_info=True)
+                        self.unsubscribe(uri, session)
+
+subscriptions = ResourceSubscriptions()
+
+
+def _low_level_server(app: FastMCP):
+    """The SDK server behind FastMCP, for the subscription hooks FastMCP lacks.
+    
+    This is private SDK API (tested with mcp 1.3). If a release moved any
+    of it, returns None and resource subscriptions are left off; the
+    resources can still be read.
+    """
+    server = getattr(app, "_mcp_server", None)
+    missing = [name for name in ("subscribe_resource", "unsubscribe_resource", "get_capabilities", "request_context")
+               if not hasattr(type(server), name)]
+    if server is None or missing:
+        logger.warning("Resource subscriptions disabled: this mcp version's FastMCP._mcp_server lacks %s",
+                       ", ".join(missing or ["_mcp_server"]))
+        return None
+    return server
+
+
+def _capabilities_with_subscribe(get_capabilities):
+    # mcp 1.3 always advertises subscribe=False, even with handlers
+    def wrapper(*args, **kwargs):
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+    return wrapper
 
-@mcp.tool(name="list_tasks", description="list all tasks, when user says list tasks, or what are my tasks etc")
-def list_tasks() -> list:
-    """list all tasks"""
-    tasks = get_all_tasks()
-    return tasks
 
+def _enable_subscriptions(server) -> None:
+    """Route resource (un)subscribe requests to `subscriptions` and advertise them."""
+    @server.subscribe_resource()
+    async def subscribe_resource(uri) -> None:
+        await subscriptions.subscribe(str(uri), server.request_context.session)
+    
+    @server.unsubscribe_resource()
+    async def unsubscribe_resource(uri) -> None:
+        subscriptions.unsubscribe(str(uri), server.request_context.session)
+    
+    server.get_capabilities = _capabilities_with_subscribe(server.get_capabilities)
 
+_server = _low_level_server(mcp)
+if _server is not None:
+    _enable_subscriptions(_server)
 
 
 if __name__ == "__main__":
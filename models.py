@@ -1,85 +1,283 @@
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple
+from dataclasses import dataclass, field, FrozenInstanceError
 import datetime
+import time
 from enum import Enum
 
+SECONDS_PER_DAY = 86400
+URGENT_DAYS = 2            # Tasks due within this many days are urgent
+IMPORTANCE_THRESHOLD = 12  # Combined threshold for consequences and desire
+
+# Due date score buckets: (max whole days remaining, points), checked in order
+DUE_DATE_POINTS = [
+    (0, 10),  # Overdue or due today
+    (2, 8),   # Due within 2 days
+    (7, 5),   # Due within a week
+]
+LATER_DUE_POINTS = 2  # Due later
+
 class Quadrant(Enum):
     """Four-quadrant system for task classification."""
     URGENT_IMPORTANT = 1      # Urgent and Important
     NOT_URGENT_IMPORTANT = 2  # Not Urgent but Important
     URGENT_NOT_IMPORTANT = 3  # Urgent but Not Important
     NOT_URGENT_NOT_IMPORTANT = 4  # Neither Urgent nor Important
+    
+    @classmethod
+    def classify(cls, due_ts: Optional[int], consequences: int, desire: int,
+                 now_ts: Optional[int] = None) -> 'Quadrant':
+        """Classify a task from its due date (epoch seconds), consequences and desire."""
+        is_urgent = False
+        is_important = False
+        
+        # Determine urgency based on whole days remaining until the due date
+        if due_ts is not None:
+            if now_ts is None:
+                now_ts = int(time.time())
+            days_remaining = (due_ts - now_ts) // SECONDS_PER_DAY
+            is_urgent = days_remaining <= URGENT_DAYS
+        
+        # Determine importance based on consequences and desire
+        is_important = (consequences + desire) >= IMPORTANCE_THRESHOLD
+        
+        if is_urgent and is_important:
+            return cls.URGENT_IMPORTANT
+        elif not is_urgent and is_important:
+            return cls.NOT_URGENT_IMPORTANT
+        elif is_urgent and not is_important:
+            return cls.URGENT_NOT_IMPORTANT
+        else:
+            return cls.NOT_URGENT_NOT_IMPORTANT
 
 @dataclass
+class ScoringProfile:
+    """Named ranking weights, compiled into SQL by database.compile_profile().
+    
+    The default values reproduce database.calculate_score().
+    """
+    name: str
+    effort_weight: float = 1.0
+    consequences_weight: float = 1.0
+    desire_weight: float = 1.0
+    repetitions_weight: float = 1.0
+    due_buckets: List[Tuple[int, float]] = field(default_factory=lambda: list(DUE_DATE_POINTS))
+    later_due_points: float = LATER_DUE_POINTS
+    no_due_points: float = 0
+
+# Public Task fields, in the column order of the tasks table
+TASK_FIELDS = (
+    'id', 'title', 'description', 'due_date', 'completed', 'effort', 'consequences',
+    'desire', 'repetitions', 'score', 'pre_task', 'created_at', 'updated_at',
+    'quadrant', 'due_ts',
+)
+
+_DATE_FIELDS = ('due_date', 'created_at', 'updated_at')
+
+def _parse_datetime(value: Any) -> Optional[datetime.datetime]:
+    """Parse an ISO date string, passing datetimes and None through."""
+    if isinstance(value, str):
+        try:
+            return datetime.datetime.fromisoformat(value) if value else None
+        except ValueError:
+            return None
+    return value
+
+def _iso_string(value: Any) -> Optional[str]:
+    """Render a raw or parsed date as an ISO string without parsing strings."""
+    if isinstance(value, str):
+        # SQLite's CURRENT_TIMESTAMP uses a space where ISO uses a 'T'
+        if len(value) > 10 and value[10] == ' ':
+            return value[:10] + 'T' + value[11:]
+        return value or None
+    if value is None:
+        return None
+    return value.isoformat()
+
 class Task:
-    """Task model representing a todo item."""
-    id: Optional[int] = None
-    title: str = ""
-    description: Optional[str] = None
-    due_date: Optional[datetime.datetime] = None
-    completed: bool = False
-    effort: int = 5           # 1-10, higher means less effort
-    consequences: int = 5     # 1-10, higher means more severe consequences
-    desire: int = 5           # 1-10, higher means more desire to complete
-    repetitions: int = 1
-    score: float = 0
-    pre_task: Optional[int] = None
-    created_at: Optional[datetime.datetime] = None
-    updated_at: Optional[datetime.datetime] = None
+    """Task model representing a todo item.
+    
+    Fields are stored in __slots__ to keep the per-row footprint small. Date
+    fields keep the raw value they were built with (usually the string read
+    from SQLite) and are only parsed into datetimes on first access.
+    """
+    __slots__ = (
+        'id', 'title', 'description', 'completed', 'effort', 'consequences', 'desire',
+        'repetitions', 'score', 'pre_task', 'quadrant', 'due_ts',
+        '_due_date', '_created_at', '_updated_at',
+    )
+    
+    # (cursor.description, fast path flag) of the last query seen by row_factory
+    _row_layout = (None, False)
+    
+    def __init__(self, id: Optional[int] = None, title: str = "", description: Optional[str] = None,
+                 due_date: Any = None, completed: bool = False,
+                 effort: int = 5,           # 1-10, higher means less effort
+                 consequences: int = 5,     # 1-10, higher means more severe consequences
+                 desire: int = 5,           # 1-10, higher means more desire to complete
+                 repetitions: int = 1, score: float = 0, pre_task: Optional[int] = None,
+                 created_at: Any = None, updated_at: Any = None,
+                 quadrant: Optional[int] = None,  # Materialized Quadrant value, kept in sync by the database
+                 due_ts: Optional[int] = None):   # Due date as epoch seconds, kept in sync by the database
+        setattr_ = object.__setattr__
+        setattr_(self, 'id', id)
+        setattr_(self, 'title', title)
+        setattr_(self, 'description', description)
+        setattr_(self, '_due_date', due_date)
+        setattr_(self, 'completed', bool(completed))
+        setattr_(self, 'effort', effort)
+        setattr_(self, 'consequences', consequences)
+        setattr_(self, 'desire', desire)
+        setattr_(self, 'repetitions', repetitions)
+        setattr_(self, 'score', score)
+        setattr_(self, 'pre_task', pre_task)
+        setattr_(self, '_created_at', created_at)
+        setattr_(self, '_updated_at', updated_at)
+        setattr_(self, 'quadrant', quadrant)
+        setattr_(self, 'due_ts', due_ts)
+    
+    @property
+    def due_date(self) -> Optional[datetime.datetime]:
+        value = self._due_date
+        if isinstance(value, str) or (value is None and self.due_ts is not None):
+            # The epoch column is canonical, so prefer it over string parsing
+            value = datetime.datetime.fromtimestamp(self.due_ts) if self.due_ts is not None else _parse_datetime(value)
+            object.__setattr__(self, '_due_date', value)
+        return value
+    
+    @due_date.setter
+    def due_date(self, value: Any):
+        self._due_date = value
+        self.due_ts = None  # Recomputed by the database when the task is saved
+    
+    @property
+    def created_at(self) -> Optional[datetime.datetime]:
+        value = self._created_at
+        if isinstance(value, str):
+            value = _parse_datetime(value)
+            object.__setattr__(self, '_created_at', value)
+        return value
+    
+    @created_at.setter
+    def created_at(self, value: Any):
+        self._created_at = value
+    
+    @property
+    def updated_at(self) -> Optional[datetime.datetime]:
+        value = self._updated_at
+        if isinstance(value, str):
+            value = _parse_datetime(value)
+            object.__setattr__(self, '_updated_at', value)
+        return value
+    
+    @updated_at.setter
+    def updated_at(self, value: Any):
+        self._updated_at = value
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Task':
         """Create a Task object from a dictionary."""
-        task_data = dict(data)
-        
-        # Convert string dates to datetime objects
-        for date_field in ['due_date', 'created_at', 'updated_at']:
-            if task_data.get(date_field):
-                try:
-                    task_data[date_field] = datetime.datetime.fromisoformat(task_data[date_field])
-                except ValueError:
-                    task_data[date_field] = None
-        
-        # Convert integer to boolean for completed field
-        if 'completed' in task_data:
-            task_data['completed'] = bool(task_data['completed'])
+        return cls(**{k: v for k, v in data.items() if k in TASK_FIELDS})
+    
+    @classmethod
+    def row_factory(cls, cursor: Any, row: tuple) -> 'Task':
+        """sqlite3 row factory that builds Tasks straight from result tuples.
         
-        return cls(**{k: v for k, v in task_data.items() if k in cls.__annotations__})
+        Usage: ``conn.row_factory = Task.row_factory``. Rows whose columns are
+        a prefix of TASK_FIELDS, or start with all of them (e.g. ``SELECT *``),
+        are passed positionally; other projections fall back to keyword
+        construction.
+        """
+        description = cursor.description
+        layout = cls._row_layout
+        if layout[0] is not description:
+            names = tuple(column[0] for column in description)
+            width = len(TASK_FIELDS)
+            layout = (description, names[:width] == TASK_FIELDS[:len(names)], names, len(names) > width)
+            cls._row_layout = layout
+        if layout[1]:
+            return cls(*row[:len(TASK_FIELDS)]) if layout[3] else cls(*row)
+        return cls(**{k: v for k, v in zip(layout[2], row) if k in TASK_FIELDS})
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert Task object to a dictionary."""
-        result = vars(self).copy()
+        result = {field: getattr(self, field) for field in TASK_FIELDS}
         
         # Convert datetime objects to ISO format strings
-        for date_field in ['due_date', 'created_at', 'updated_at']:
+        for date_field in _DATE_FIELDS:
             if result.get(date_field):
                 result[date_field] = result[date_field].isoformat()
         
         # Convert boolean to integer for completed field
-        if 'completed' in result:
-            result['completed'] = int(result['completed'])
-            
+        result['completed'] = int(result['completed'])
+        
         return result
     
-    def get_quadrant(self) -> Quadrant:
-        """Determine which quadrant the task belongs to."""
-        is_urgent = False
-        is_important = False
+    def to_json_dict(self) -> Dict[str, Any]:
+        """Convert Task object to a JSON-ready dictionary without parsing dates.
         
-        # Determine urgency based on due date and score
-        if self.due_date:
-            days_remaining = (self.due_date - datetime.datetime.now()).days
-            is_urgent = days_remaining <= 2  # Consider tasks due within 2 days as urgent
-        
-        # Determine importance based on consequences and desire
-        importance_threshold = 12  # Combined threshold for consequences and desire
-        is_important = (self.consequences + self.desire) >= importance_threshold
+        Produces the same shape as to_dict(), but raw date strings from the
+        database are emitted as ISO strings directly instead of being parsed
+        and re-formatted.
+        """
+        due_date = self._due_date
+        if due_date is None and self.due_ts is not None:
+            due_date = self.due_date
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'due_date': _iso_string(due_date),
+            'completed': int(self.completed),
+            'effort': self.effort,
+            'consequences': self.consequences,
+            'desire': self.desire,
+            'repetitions': self.repetitions,
+            'score': self.score,
+            'pre_task': self.pre_task,
+            'created_at': _iso_string(self._created_at),
+            'updated_at': _iso_string(self._updated_at),
+            'quadrant': self.quadrant,
+            'due_ts': self.due_ts,
+        }
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{field}={getattr(self, field)!r}' for field in TASK_FIELDS)
+        return f'{type(self).__name__}({fields})'
+    
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in TASK_FIELDS)
+    
+    __hash__ = None
+    
+    def get_quadrant(self) -> Quadrant:
+        """Determine which quadrant the task belongs to.
         
-        if is_urgent and is_important:
-            return Quadrant.URGENT_IMPORTANT
-        elif not is_urgent and is_important:
-            return Quadrant.NOT_URGENT_IMPORTANT
-        elif is_urgent and not is_important:
-            return Quadrant.URGENT_NOT_IMPORTANT
-        else:
-            return Quadrant.NOT_URGENT_NOT_IMPORTANT
+        Uses the quadrant stored on the row when available and only falls
+        back to classifying the task in Python for unsaved tasks.
+        """
+        if self.quadrant is not None:
+            return Quadrant(self.quadrant)
+        due_ts = self.due_ts
+        if due_ts is None and self.due_date:
+            due_ts = int(self.due_date.timestamp())
+        return Quadrant.classify(due_ts, self.consequences, self.desire)
+
+
+class FrozenTask(Task):
+    """Immutable, hashable Task for read-only views and caches."""
+    __slots__ = ()
+    
+    def __setattr__(self, name: str, value: Any):
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+    
+    def __delattr__(self, name: str):
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+    
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, field) for field in TASK_FIELDS))
+
+
+# Due day bucket of tasks without a due date in the summary tables
+NO_DUE_TS = -(2 ** 63)
@@ -1,17 +1,24 @@
-from flask import Flask, request, jsonify
-from typing import Dict, Any, Optional
+from flask import Flask, Response, request, jsonify, stream_with_context
+from typing import Callable, Dict, Any, Optional
+import datetime
 import json
 import os
 import database
 from utils import extract_task_info_from_text
 from models import Task
 import threading
+import time
+import gzip
+import zlib
+from collections import OrderedDict
+from functools import wraps
 from dotenv import load_dotenv
 import logging
-import openai
-from langchain_openai import OpenAI
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+from extraction import (
+    extract_task_info_with_llm, cache_stats as extraction_cache_stats, LLM_CONFIDENCE_THRESHOLD,
+)
+from jobs import get_nlp_queue, queue_stats, QueueFullError
+from changes import get_broadcaster
 
 # Load environment variables
 load_dotenv()
@@ -26,35 +33,178 @@ logger = logging.getLogger(__name__)
 # Initialize Flask app
 app = Flask(__name__)
 
-# Configure OpenAI
-openai.api_key = os.environ.get("OPENAI_API_KEY")
-openai.api_base = os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1")
+# Bodies smaller than this aren't worth compressing
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 6
 
-# Initialize LangChain components
-llm = OpenAI(
-    openai_api_key=os.environ.get("OPENAI_API_KEY"),
-    temperature=0.7
-)
+# Idle event streams send a comment this often so dead clients are noticed
+SSE_KEEPALIVE_SECONDS = 15
+
+# Each open event stream holds a request thread for as long as its client
+# stays connected, so the prefork server caps them per worker process
+_stream_slots = None
 
-# Define prompt for task extraction
-task_extraction_prompt = PromptTemplate(
-    input_variables=["text"],
-    template="""
-    Extract task information from the following text:
-    
-    {text}
-    
-    Return a JSON object with these fields:
-    - title: A short title for the task
-    - description: A longer description (if available)
-    - due_date: Due date in YYYY-MM-DD format or null if not specified
-    - effort: A score from 1-10 indicating effort (10 = minimal effort)
-    - consequences: A score from 1-10 indicating consequences (10 = severe)
-    - desire: A score from 1-10 indicating desire to complete (10 = high desire)
+class CoalescingCache:
+    """A small LRU cache where concurrent misses on one key share a computation.
+    
+    The first thread to miss computes the value; threads asking for the same
+    key meanwhile wait for its result instead of repeating the work.
     """
-)
+    
+    class _Pending:
+        def __init__(self):
+            self.event = threading.Event()
+            self.value = None
+            self.error = None
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.not_modified = 0
+    
+    def get_or_compute(self, key, compute, cacheable=lambda value: True):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            pending = self._pending.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._pending[key] = self._Pending()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+        
+        try:
+            pending.value = compute()
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+                if pending.error is None and cacheable(pending.value):
+                    self._entries[key] = pending.value
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            pending.event.set()
+        return pending.value
+    
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self.hits + self.misses + self.coalesced + self.not_modified
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "not_modified": self.not_modified,
+                "hit_rate": (requests - self.misses) / requests if requests else 0.0,
+            }
+
+response_cache = CoalescingCache()
 
-task_extraction_chain = task_extraction_prompt | llm
+def negotiate_encoding() -> Optional[str]:
+    """Pick gzip or deflate from the request's Accept-Encoding, or None."""
+    return request.accept_encodings.best_match(('gzip', 'deflate'))
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == 'gzip':
+        # A fixed mtime keeps the output identical for identical bodies
+        return gzip.compress(body, COMPRESS_LEVEL, mtime=0)
+    return zlib.compress(body, COMPRESS_LEVEL)
+
+@app.after_request
+def compress_response(response):
+    """Compress uncached JSON responses the client accepts compressed."""
+    if response.mimetype != 'application/json' or response.is_streamed:
+        return response
+    response.vary.add('Accept-Encoding')
+    if response.status_code != 200 or 'Content-Encoding' in response.headers:
+        return response
+    
+    encoding = negotiate_encoding()
+    body = response.get_data()
+    if encoding and len(body) >= COMPRESS_MIN_BYTES:
+        response.set_data(compress_body(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+def profile_time_version() -> Optional[int]:
+    """When the requested profile's ranking last changed with the clock alone."""
+    name = request.args.get('profile')
+    profile = database.get_scoring_profile(name) if name is not None else None
+    if profile is None:
+        return None
+    return database.get_last_due_crossing(
+        [(int(max_days) + 1) * database.SECONDS_PER_DAY for max_days, _ in profile.due_buckets])
+
+def local_date() -> str:
+    """Today's date, which the stats' overdue counts and day ranges are relative to."""
+    return datetime.date.today().isoformat()
+
+def conditional_cached(view=None, time_version: Callable[[], Any] = None):
+    """Serve a read endpoint with ETags, 304 responses and the response cache.
+    
+    Responses are versioned by the database change counter, plus
+    time_version() for endpoints whose output also moves with the clock.
+    """
+    if view is None:
+        return lambda view: conditional_cached(view, time_version)
+    
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Read the version before querying, so a concurrent write can only
+        # make a cached body newer than its ETag, never older
+        version = str(database.get_change_counter())
+        clock = time_version() if time_version is not None else None
+        if clock is not None:
+            version += f"-{clock}"
+        
+        if request.if_none_match.contains_weak(version):
+            response_cache.record_not_modified()
+            response = app.response_class(status=304)
+            response.set_etag(version, weak=True)
+            response.vary.add('Accept-Encoding')
+            return response
+        
+        encoding = negotiate_encoding()
+        
+        def render():
+            response = app.make_response(view(*args, **kwargs))
+            body, applied = response.get_data(), None
+            # Compressed once per version, not once per request
+            if response.status_code == 200 and encoding and len(body) >= COMPRESS_MIN_BYTES:
+                body, applied = compress_body(body, encoding), encoding
+            return response.status_code, body, response.mimetype, applied
+        
+        status, body, mimetype, applied = response_cache.get_or_compute(
+            (request.full_path, version, encoding), render, cacheable=lambda value: value[0] == 200
+        )
+        response = app.response_class(body, status=status, mimetype=mimetype)
+        response.vary.add('Accept-Encoding')
+        if applied:
+            response.headers['Content-Encoding'] = applied
+        if status == 200:
+            response.set_etag(version, weak=True)
+        return response
+    return wrapper
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -87,7 +237,61 @@ def create_task():
         logger.error(f"Error creating task: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Report this worker process's cache statistics."""
+    return jsonify({
+        "pid": os.getpid(),
+        "change_counter": database.get_change_counter(),
+        "response_cache": response_cache.stats(),
+        "extraction_cache": extraction_cache_stats(),
+        "nlp_jobs": queue_stats(),
+    })
+
+@app.route('/events', methods=['GET'])
+def stream_events():
+    """Stream task changes as Server-Sent Events.
+    
+    Every message carries the change log sequence number as its ID, so a
+    reconnecting client resumes with Last-Event-ID (or ?last_event_id=).
+    The current top task is sent first as a "top_changed" event. A "reset"
+    event means the changes since Last-Event-ID are no longer logged and
+    the client should reload its tasks.
+    
+    When the worker already serves its maximum number of streams the
+    request is refused with 503, so the other endpoints keep their threads.
+    """
+    broadcaster = get_broadcaster()
+    last_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+    try:
+        cursor = int(last_id) if last_id is not None else broadcaster.latest_seq
+    except ValueError:
+        return jsonify({"error": "Last-Event-ID must be an integer"}), 400
+    
+    slots = _stream_slots
+    if slots is not None and not slots.acquire(blocking=False):
+        return jsonify({"error": "Too many open event streams"}), 503, {"Retry-After": "5"}
+    
+    def generate():
+        nonlocal cursor
+        yield "retry: 2000\n\n" + broadcaster.top_message()
+        while True:
+            messages = broadcaster.read_after(cursor, SSE_KEEPALIVE_SECONDS)
+            if not messages:
+                yield ": keepalive\n\n"
+                continue
+            cursor = messages[-1][0]
+            yield "".join(message for _, message in messages)
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    if slots is not None:
+        # Runs when the stream ends, even if it never started
+        response.call_on_close(slots.release)
+    return response
+
 @app.route('/task/<int:task_id>', methods=['GET'])
+@conditional_cached
 def get_task(task_id):
     """Get a task by ID."""
     task_data = database.get_task(task_id)
@@ -95,17 +299,20 @@ def get_task(task_id):
         return jsonify({"error": "Task not found"}), 404
     
     task = Task.from_dict(task_data)
-    return jsonify(task.to_dict())
+    return jsonify(task.to_json_dict())
 
 @app.route('/task/top', methods=['GET'])
+@conditional_cached(time_version=profile_time_version)
 def get_top_task():
-    """Get the highest priority task."""
-    task_data = database.get_highest_score_task()
-    if not task_data:
+    """Get the highest priority task, optionally ranked by a scoring profile."""
+    try:
+        task = database.get_highest_score_task(as_tasks=True, profile=request.args.get('profile'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not task:
         return jsonify({"message": "No tasks found"}), 404
     
-    task = Task.from_dict(task_data)
-    return jsonify(task.to_dict())
+    return jsonify(task.to_json_dict())
 
 @app.route('/task/<int:task_id>/complete', methods=['POST'])
 def complete_task(task_id):
@@ -117,59 +324,124 @@ def complete_task(task_id):
         return jsonify({"error": "Task not found or could not be completed"}), 404
 
 @app.route('/tasks', methods=['GET'])
+@conditional_cached(time_version=profile_time_version)
 def get_tasks():
-    """Get all tasks, optionally filtered by completion status."""
+    """Get all tasks, optionally filtered by completion status and quadrant.
+    
+    ?fields=id,title,score limits each task to those fields, and only those
+    columns are read from the database.
+    """
     completed_param = request.args.get('completed')
     completed = None
     
     if completed_param is not None:
         completed = completed_param.lower() in ('true', '1', 'yes')
     
-    tasks = database.get_all_tasks(completed=completed)
-    return jsonify([Task.from_dict(task).to_dict() for task in tasks])
+    quadrant = request.args.get('quadrant', type=int)
+    if 'quadrant' in request.args and quadrant not in (1, 2, 3, 4):
+        return jsonify({"error": "quadrant must be an integer between 1 and 4"}), 400
+    
+    try:
+        fields = request.args.get('fields')
+        if fields is not None:
+            return jsonify(database.get_all_tasks(completed=completed, quadrant=quadrant,
+                                                  profile=request.args.get('profile'),
+                                                  fields=database.parse_fields(fields)))
+        tasks = database.get_all_tasks(completed=completed, quadrant=quadrant, as_tasks=True,
+                                       profile=request.args.get('profile'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify([task.to_json_dict() for task in tasks])
+
+@app.route('/stats', methods=['GET'])
+@conditional_cached(time_version=local_date)
+def get_stats():
+    """Task counts per quadrant, overdue and due-soon counts, and recent completions.
+    
+    ?days=, ?weeks= and ?soon= set how many days and weeks of completions
+    are reported and how many days ahead count as due soon.
+    """
+    limits = {'days': (7, 1, 366), 'weeks': (4, 1, 104), 'soon': (database.DUE_SOON_DAYS, 0, 366)}
+    values = {}
+    for name, (default, low, high) in limits.items():
+        if name not in request.args:
+            values[name] = default
+            continue
+        values[name] = request.args.get(name, type=int)
+        if values[name] is None or not low <= values[name] <= high:
+            return jsonify({"error": f"{name} must be an integer between {low} and {high}"}), 400
+    
+    return jsonify(database.get_task_stats(days=values['days'], weeks=values['weeks'],
+                                           soon_days=values['soon']))
+
+def process_nlp_text(text: str, deadline: float = None) -> Dict[str, Any]:
+    """Extract task information from text and create the task.
+    
+    Raises TimeoutError if the monotonic `deadline` passes before the task
+    is created.
+    """
+    # Use built-in extraction unless it is unsure about the input
+    task_info = extract_task_info_from_text(text)
+    if task_info["confidence"] < LLM_CONFIDENCE_THRESHOLD:
+        # Use the LLM for harder inputs; repeated texts hit the cache
+        try:
+            task_info = extract_task_info_with_llm(text)
+        except ValueError as e:
+            logger.error(f"Failed to parse LLM output: {str(e)}")
+    
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError("timed out during extraction")
+    
+    # Create the task
+    task_id = database.add_task(
+        title=task_info.get('title'),
+        description=task_info.get('description'),
+        due_date=task_info.get('due_date'),
+        effort=task_info.get('effort', 5),
+        consequences=task_info.get('consequences', 5),
+        desire=task_info.get('desire', 5)
+    )
+    
+    return {
+        "task_id": task_id,
+        "task_info": task_info,
+        "success": True
+    }
 
 @app.route('/nlp/task', methods=['POST'])
 def create_task_from_text():
-    """Create a task using natural language processing."""
+    """Create a task using natural language processing.
+    
+    With "async": true in the body, or a "Prefer: respond-async" header, the
+    work is queued and 202 is returned with a job ID to poll.
+    """
     if not request.json or 'text' not in request.json:
         return jsonify({"error": "Request must include 'text' field"}), 400
     
     text = request.json['text']
     
+    if request.json.get('async') or 'respond-async' in request.headers.get('Prefer', ''):
+        try:
+            job_id = get_nlp_queue(process_nlp_text).submit(text)
+        except QueueFullError as e:
+            return jsonify({"error": str(e)}), 429, {"Retry-After": "1"}
+        return jsonify({"job_id": job_id, "status": "queued"}), 202, {"Location": f"/nlp/jobs/{job_id}"}
+    
     try:
-        # Use either built-in extraction or LangChain based on complexity
-        if len(text) < 100:
-            # Use built-in extraction for simpler inputs
-            task_info = extract_task_info_from_text(text)
-        else:
-            # Use LangChain for more complex inputs
-            result = task_extraction_chain.run(text)
-            try:
-                task_info = json.loads(result)
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse LLM output: {result}")
-                task_info = extract_task_info_from_text(text)
-        
-        # Create the task
-        task_id = database.add_task(
-            title=task_info.get('title'),
-            description=task_info.get('description'),
-            due_date=task_info.get('due_date'),
-            effort=task_info.get('effort', 5),
-            consequences=task_info.get('consequences', 5),
-            desire=task_info.get('desire', 5)
-        )
-        
-        return jsonify({
-            "task_id": task_id,
-            "task_info": task_info,
-            "success": True
-        })
-        
+        return jsonify(process_nlp_text(text))
     except Exception as e:
         logger.error(f"Error processing NLP request: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/nlp/jobs/<job_id>', methods=['GET'])
+def get_nlp_job(job_id):
+    """Get the status and, once finished, the outcome of an NLP job."""
+    job = database.get_nlp_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    
+    return jsonify(job)
+
 @app.route('/task/<int:task_id>/repeat', methods=['POST'])
 def increment_repetition(task_id):
     """Increment the repetition count for a task."""
@@ -199,5 +471,52 @@ def start_server(host='0.0.0.0', port=5000, debug=False):
     logger.info(f"Starting MCP server on {host}:{port}")
     app.run(host=host, port=port, debug=debug)
 
+def start_production_server(host='0.0.0.0', port=5000, workers=2, threads=4,
+                            backlog=2048, timeout=30, max_streams=None):
+    """Start the API under a prefork gunicorn server.
+    
+    Each worker process serves requests on `threads` threads, and each
+    thread reuses its own connection to the shared WAL database. At most
+    `max_streams` of them (by default half) serve /events at once. Send
+    SIGHUP to the master process to reload workers gracefully. Falls back
+    to Flask's threaded server where gunicorn is unavailable.
+    """
+    global _stream_slots
+    if max_streams is None:
+        max_streams = threads // 2
+    if max_streams >= threads:
+        raise ValueError("max_streams must leave at least one thread for other requests")
+    
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        logger.warning("gunicorn is not installed; falling back to the threaded Flask server")
+        app.run(host=host, port=port, threaded=True)
+        return
+    
+    # Created before forking, so every worker starts with all its slots free
+    _stream_slots = threading.BoundedSemaphore(max_streams)
+    
+    def post_fork(server, worker):
+        # Never share a connection inherited from the master across processes
+        database.close_connection()
+    
+    class GTDApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f"{host}:{port}")
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('backlog', backlog)
+            self.cfg.set('timeout', timeout)
+            self.cfg.set('graceful_timeout', timeout)
+            self.cfg.set('post_fork', post_fork)
+        
+        def load(self):
+            return app
+    
+    logger.info(f"Starting MCP server on {host}:{port} with {workers} workers x {threads} threads")
+    GTDApplication().run()
+
 if __name__ == "__main__":
     start_server(debug=True)
\ No newline at end of file
@@ -3,10 +3,19 @@ import threading
 import database
 import subprocess
 import datetime
+import time
 import os
 import sys
+from changes import ChangeWatcher
 from notifications import send_notification
 
+# Seconds between checks for commits from other processes
+WATCH_INTERVAL_SECONDS = 1.0
+# Tasks due within this many hours are notified
+DUE_SOON_HOURS = 48
+# Changes that can give a task a new due date; rescores and merges can't
+DUE_CHANGE_KINDS = ("created", "updated", "repeated")
+
 class StatusBarApp(rumps.App):
     def __init__(self):
         super(StatusBarApp, self).__init__(
@@ -17,9 +26,38 @@ class StatusBarApp(rumps.App):
         )
         self.menu = ["Show Top Task", "Add Task", "Open GUI", None, "Check for Due Tasks"]
         
+        # Due time each task was last notified for, so changes don't repeat alerts
+        self._notified = {}
+        
         # Schedule task check every 30 minutes
         self._check_timer = rumps.Timer(self.check_due_tasks, 60 * 30)
         self._check_timer.start()
+        
+        # Tasks added or changed elsewhere show up within a second. Checks run
+        # on the main thread's timer, so listeners may update the menu bar.
+        self._watcher = ChangeWatcher()
+        self._watcher.subscribe(self.on_task_changes)
+        self._watch_timer = rumps.Timer(lambda _: self._watcher.check(), WATCH_INTERVAL_SECONDS)
+        self._watch_timer.start()
+        self.update_title()
+    
+    def update_title(self):
+        """Show the number of open tasks in the menu bar."""
+        self.title = f"✓ {database.count_tasks(completed=False)}"
+    
+    def on_task_changes(self, events):
+        """Update the menu bar and notify about tasks whose due time moved into the next 48 hours."""
+        self.update_title()
+        
+        task_ids = list({event['task_id'] for event in events
+                         if event['task_id'] is not None and event['kind'] in DUE_CHANGE_KINDS})
+        now_ts = int(time.time())
+        self.notify_due([
+            task.to_dict() for task in database.get_tasks_by_ids(task_ids)
+            if not task.completed and task.due_ts is not None
+            and now_ts <= task.due_ts <= now_ts + DUE_SOON_HOURS * 3600
+            and self._notified.get(task.id) != task.due_ts
+        ], now_ts)
     
     @rumps.clicked("Show Top Task")
     def show_top_task(self, _):
@@ -36,9 +74,8 @@ class StatusBarApp(rumps.App):
             return
         
         due_str = ""
-        if task.get("due_date"):
-            due_date = datetime.datetime.fromisoformat(task["due_date"])
-            due_str = f" (Due: {due_date.strftime('%Y-%m-%d')})"
+        if task.get("due_ts") is not None:
+            due_str = f" (Due: {time.strftime('%Y-%m-%d', time.localtime(task['due_ts']))})"
         
         rumps.notification(
             title=f"Top Task: {task['title']}",
@@ -61,6 +98,8 @@ class StatusBarApp(rumps.App):
         if response.clicked and response.text:
             try:
                 task_id = database.add_task(title=response.text)
+                # The watcher shares this thread's connection, which never sees its own commits
+                self.update_title()
                 rumps.notification(
                     title="GTD",
                     subtitle=f"Task created with ID: {task_id}",
@@ -99,42 +138,36 @@ class StatusBarApp(rumps.App):
     
     def check_due_tasks(self, _):
         """Check for tasks due in the next 48 hours."""
-        now = datetime.datetime.now()
-        due_soon = []
-        
-        tasks = database.get_all_tasks(completed=False)
-        
-        for task in tasks:
-            if task.get("due_date"):
-                due_date = datetime.datetime.fromisoformat(task["due_date"])
-                hours_remaining = (due_date - now).total_seconds() / 3600
-                
-                # Check if task is due within 48 hours
-                if 0 <= hours_remaining <= 48:
-                    due_soon.append(task)
+        now_ts = int(time.time())
         
-        # Send notifications for tasks due soon
-        if due_soon:
-            for task in due_soon:
-                due_date = datetime.datetime.fromisoformat(task["due_date"])
-                hours_remaining = (due_date - now).total_seconds() / 3600
-                
-                if hours_remaining <= 2:
-                    time_str = "due very soon!"
-                elif hours_remaining <= 24:
-                    time_str = f"due in {int(hours_remaining)} hours"
-                else:
-                    time_str = f"due in {int(hours_remaining / 24)} days"
-                
-                send_notification(
-                    title=f"Task Due Soon: {task['title']}",
-                    subtitle=time_str,
-                    message=task.get("description", ""),
-                    sound=True
-                )
+        # Range scan on the epoch due index instead of parsing every active task
+        due_soon = database.get_tasks_due_between(now_ts, now_ts + DUE_SOON_HOURS * 3600)
         
+        # Everything due soon is notified again, so only those need remembering
+        self._notified = {}
+        self.notify_due(due_soon, now_ts)
         return due_soon
-
+    
+    def notify_due(self, tasks, now_ts: int):
+        """Send a notification for each task, saying how soon it is due."""
+        for task in tasks:
+            self._notified[task["id"]] = task["due_ts"]
+            hours_remaining = (task["due_ts"] - now_ts) / 3600
+            
+            if hours_remaining <= 2:
+                time_str = "due very soon!"
+            elif hours_remaining <= 24:
+                time_str = f"due in {int(hours_remaining)} hours"
+            else:
+                time_str = f"due in {int(hours_remaining / 24)} days"
+            
+            send_notification(
+                title=f"Task Due Soon: {task['title']}",
+                subtitle=time_str,
+                message=task.get("description", ""),
+                sound=True
+            )
+    
     def run(self):
         """Run the status bar app."""
         # Check for due tasks immediately on start
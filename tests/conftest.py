@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh, initialized database for the test, used by every module and subprocess."""
+    path = str(tmp_path / "gtd.db")
+    monkeypatch.setenv("GTD_DB_PATH", path)
+    monkeypatch.setattr(database, "DB_PATH", path)
+    database.init_db()
+    yield path
+    database.close_connection()
@@ -0,0 +1,17 @@
+import database
+import bulk
+
+def test_imported_tasks_are_logged_one_by_one(db, tmp_path):
+    existing = database.add_task("Already here")
+    path = tmp_path / "tasks.csv"
+    path.write_text("title,effort\nFirst,3\nSecond,4\nThird,5\n")
+    seq = database.get_change_counter()
+    
+    stats = bulk.import_tasks(str(path), chunk_size=2)
+    
+    assert stats.inserted == 3
+    events = database.get_task_events_since(seq)
+    assert [event['kind'] for event in events] == ['imported'] * 3
+    task_ids = [event['task_id'] for event in events]
+    assert task_ids == list(range(existing + 1, existing + 4))
+    assert [task.title for task in database.get_tasks_by_ids(task_ids)] == ["First", "Second", "Third"]
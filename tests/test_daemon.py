@@ -0,0 +1,40 @@
+import sqlite3
+import tempfile
+import threading
+
+import pytest
+
+import daemon
+import database
+
+@pytest.fixture
+def running_daemon(db, monkeypatch):
+    socket_dir = tempfile.mkdtemp(prefix="gtd-test-")
+    monkeypatch.setenv("GTD_SOCKET", f"{socket_dir}/d.sock")
+    monkeypatch.delenv("GTD_NO_DAEMON", raising=False)
+    
+    connects = []
+    connect = sqlite3.connect
+    def counting_connect(path, *args, **kwargs):
+        if path == db:
+            connects.append(threading.current_thread().name)
+        return connect(path, *args, **kwargs)
+    monkeypatch.setattr(database.sqlite3, "connect", counting_connect)
+    
+    ready = threading.Event()
+    resident = daemon.Daemon()
+    threading.Thread(target=resident.serve_forever, kwargs={"ready": ready.set}, daemon=True).start()
+    assert ready.wait(30)
+    return connects
+
+def test_commands_reuse_the_warmed_up_connection(running_daemon):
+    database.add_task(title="Water the plants")
+    for argv in (["getone"], ["list", "-n", "5"], ["stats"]):
+        assert daemon.run_client(argv) == 0
+    
+    # Opened once by warm-up on the command thread, then reused by every command
+    assert len(running_daemon) == 1
+    assert running_daemon[0].startswith("gtd-daemon-command")
+
+def test_pager_is_never_forwarded(running_daemon):
+    assert daemon.run_client(["list", "--pager"]) is None
@@ -0,0 +1,38 @@
+import threading
+import time
+
+import database
+import server
+from changes import ChangeWatcher, EventBroadcaster
+
+def test_resuming_before_the_pruned_log_sends_reset(db):
+    for i in range(3):
+        database.add_task(f"Task {i}")
+    with database.transaction() as cursor:
+        cursor.execute("UPDATE task_events SET created_at = datetime('now', '-30 days') WHERE seq < 3")
+        assert database.prune_task_events(cursor, int(time.time())) == 2
+    broadcaster = EventBroadcaster(ChangeWatcher())
+    
+    messages = broadcaster.read_after(0, 0)
+    assert [seq for seq, _ in messages] == [3]
+    assert messages[0][1].startswith("id: 3\nevent: reset\n")
+    # A client that has seen everything up to the oldest kept event replays normally
+    assert "event: created" in broadcaster.read_after(2, 0)[0][1]
+
+def test_event_streams_are_capped_per_worker(db, monkeypatch):
+    monkeypatch.setattr(server, "_stream_slots", threading.BoundedSemaphore(1))
+    # A broadcaster whose watcher isn't started, so no thread outlives the test
+    broadcaster = EventBroadcaster(ChangeWatcher())
+    monkeypatch.setattr(server, "get_broadcaster", lambda: broadcaster)
+    client = server.app.test_client()
+    
+    first = client.get("/events", buffered=False)
+    assert first.status_code == 200
+    refused = client.get("/events", buffered=False)
+    assert refused.status_code == 503
+    assert client.get("/stats").status_code == 200
+    
+    first.close()
+    second = client.get("/events", buffered=False)
+    assert second.status_code == 200
+    second.close()
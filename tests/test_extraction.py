@@ -0,0 +1,32 @@
+import pytest
+
+import extraction
+
+@pytest.fixture
+def stub_llm(db, monkeypatch):
+    """Extract with the local StubLLM, built the way GTD_LLM_MODEL=stub selects it."""
+    monkeypatch.setenv("GTD_LLM_MODEL", "stub")
+    monkeypatch.setattr(extraction, "MODEL_NAME", "stub")
+    monkeypatch.setattr(extraction, "_chain", None)
+    monkeypatch.setattr(extraction, "_stats", {"hits": 0, "misses": 0})
+    chain = extraction.get_extraction_chain()
+    assert isinstance(chain, extraction.StubLLM)
+    return chain
+
+def test_repeated_text_is_served_from_the_cache(stub_llm):
+    first = extraction.extract_task_info_with_llm("Call the dentist tomorrow")
+    assert stub_llm.calls == 1
+    
+    # Extra whitespace normalizes to the same entry
+    assert extraction.extract_task_info_with_llm("  Call the dentist   tomorrow ") == first
+    assert stub_llm.calls == 1
+    
+    extraction.extract_task_info_with_llm("Water the plants")
+    assert stub_llm.calls == 2
+    assert extraction.cache_stats() == {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
+
+def test_cache_entries_are_per_model(stub_llm, monkeypatch):
+    extraction.extract_task_info_with_llm("Call the dentist tomorrow")
+    monkeypatch.setattr(extraction, "MODEL_NAME", "another-model")
+    extraction.extract_task_info_with_llm("Call the dentist tomorrow")
+    assert stub_llm.calls == 2
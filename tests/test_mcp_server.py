@@ -0,0 +1,68 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.server.lowlevel import NotificationOptions
+
+import database
+import mcp_server
+
+def test_resource_subscriptions_are_advertised():
+    capabilities = mcp_server._server.get_capabilities(NotificationOptions(), {})
+    assert capabilities.resources.subscribe is True
+
+def test_subscriptions_are_left_off_without_the_private_server(monkeypatch):
+    app = FastMCP()
+    monkeypatch.delattr(app, "_mcp_server")
+    assert mcp_server._low_level_server(app) is None
+
+def test_batches_commit_whole_under_concurrency(db):
+    batches, size = 8, 50
+    sizes = []
+    stop = threading.Event()
+    def count_tasks():
+        # A reader must never see part of a batch
+        while not stop.is_set():
+            sizes.append(database.get_connection().execute('SELECT count(*) FROM tasks').fetchone()[0])
+        database.close_connection()
+    reader = threading.Thread(target=count_tasks)
+    reader.start()
+    
+    async def create_all():
+        return await asyncio.gather(*(
+            mcp_server.create_tasks([mcp_server.NewTask(title=f"Batch {i} task {j}") for j in range(size)])
+            for i in range(batches)
+        ))
+    try:
+        created = [json.loads(result)["created"] for result in asyncio.run(create_all())]
+    finally:
+        stop.set()
+        reader.join()
+    
+    assert all(count % size == 0 for count in sizes)
+    # Each batch held the write lock throughout, so its IDs are consecutive
+    for ids in created:
+        assert ids == list(range(ids[0], ids[0] + size))
+    assert len({task_id for ids in created for task_id in ids}) == batches * size
+
+def test_overlapping_completions_each_commit(db):
+    task_ids = database.add_tasks([{"title": f"Task {i}"} for i in range(20)])
+    
+    async def complete_all():
+        return await asyncio.gather(
+            mcp_server.complete_tasks(task_ids[:15]),
+            mcp_server.complete_tasks(task_ids[5:] + [10**6]),
+        )
+    first, second = (json.loads(result) for result in asyncio.run(complete_all()))
+    
+    assert first == {"completed": task_ids[:15], "not_found": []}
+    assert second == {"completed": task_ids[5:], "not_found": [10**6]}
+    assert database.get_all_tasks(completed=False) == []
+
+def test_a_failing_batch_creates_nothing(db):
+    tasks = [mcp_server.NewTask(title="Fine"), mcp_server.NewTask(title="Bad date", due_date="not a date")]
+    with pytest.raises(ValueError):
+        asyncio.run(mcp_server.create_tasks(tasks))
+    assert database.get_all_tasks() == []
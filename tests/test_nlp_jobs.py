@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+import database
+import server
+from jobs import NLPJobQueue
+
+def rule_based(confidence):
+    return lambda text: {"title": "Rule based", "effort": 5, "consequences": 5, "desire": 5,
+                         "confidence": confidence}
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+    def extract_with_llm(text):
+        calls.append(text)
+        return {"title": "From the LLM", "effort": 5, "consequences": 5, "desire": 5}
+    monkeypatch.setattr(server, "extract_task_info_with_llm", extract_with_llm)
+    return calls
+
+def test_confident_extractions_skip_the_llm(db, llm_calls, monkeypatch):
+    monkeypatch.setattr(server, "extract_task_info_from_text", rule_based(server.LLM_CONFIDENCE_THRESHOLD))
+    result = server.process_nlp_text("Pay rent by Friday")
+    assert llm_calls == []
+    assert database.get_task(result["task_id"])["title"] == "Rule based"
+
+def test_unsure_extractions_fall_back_to_the_llm(db, llm_calls, monkeypatch):
+    monkeypatch.setattr(server, "extract_task_info_from_text", rule_based(server.LLM_CONFIDENCE_THRESHOLD - 0.1))
+    result = server.process_nlp_text("that thing for next week maybe")
+    assert llm_calls == ["that thing for next week maybe"]
+    assert database.get_task(result["task_id"])["title"] == "From the LLM"
+
+def test_unparsable_llm_output_keeps_the_rule_based_result(db, monkeypatch):
+    monkeypatch.setattr(server, "extract_task_info_from_text", rule_based(0.0))
+    def broken_llm(text):
+        raise ValueError("LLM output is not a JSON object")
+    monkeypatch.setattr(server, "extract_task_info_with_llm", broken_llm)
+    result = server.process_nlp_text("something")
+    assert database.get_task(result["task_id"])["title"] == "Rule based"
+
+def test_async_requests_past_capacity_get_429(db, monkeypatch):
+    release = threading.Event()
+    def handler(text, deadline):
+        release.wait(5)
+        return {"task_id": None}
+    queue = NLPJobQueue(handler, workers=1, max_pending=1)
+    monkeypatch.setattr(server, "get_nlp_queue", lambda handler: queue)
+    client = server.app.test_client()
+    
+    try:
+        accepted = client.post("/nlp/task", json={"text": "First", "async": True})
+        assert accepted.status_code == 202
+        refused = client.post("/nlp/task", json={"text": "Second", "async": True})
+        assert refused.status_code == 429
+        assert refused.headers["Retry-After"] == "1"
+        assert queue.get_stats()["rejected"] == 1
+    finally:
+        release.set()
+        queue._executor.shutdown(wait=True)
+    
+    assert client.get(f"/nlp/jobs/{accepted.json['job_id']}").json["status"] == "succeeded"
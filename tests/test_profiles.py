@@ -0,0 +1,25 @@
+import datetime
+import time
+
+import database
+from models import ScoringProfile
+
+def test_profile_top_follows_changes_and_time(db, monkeypatch):
+    database.save_scoring_profile(ScoringProfile("deadlines", due_buckets=[(0, 20)], later_due_points=0))
+    now = int(time.time())
+    due = datetime.datetime.fromtimestamp(now) + datetime.timedelta(days=1, hours=1)
+    steady = database.add_task("No due date", effort=9, consequences=9, desire=9)
+    deadline = database.add_task("Due tomorrow", due_date=due.isoformat(timespec='seconds'))
+    
+    monkeypatch.setattr(database.time, "time", lambda: now)
+    assert database.get_highest_score_task(profile="deadlines")['id'] == steady
+    assert database.get_highest_score_task(profile="deadlines")['id'] == steady
+    
+    # Two hours on, the deadline falls into the 20 point bucket
+    monkeypatch.setattr(database.time, "time", lambda: now + 2 * 3600)
+    assert database.get_highest_score_task(profile="deadlines")['id'] == deadline
+    
+    database.complete_task(deadline)
+    assert database.get_highest_score_task(profile="deadlines")['id'] == steady
+    database.complete_task(steady)
+    assert database.get_highest_score_task(profile="deadlines") is None
@@ -0,0 +1,57 @@
+import datetime
+import sqlite3
+
+import database
+
+def test_rescore_without_crossings_writes_nothing(db):
+    due = datetime.date.today() + datetime.timedelta(days=60)
+    database.add_task("Far off", due_date=due.isoformat())
+    now = int(datetime.datetime.now().timestamp())
+    database.rescore_tasks(now)
+    
+    # Another connection's data_version moves on every commit that writes
+    watcher = sqlite3.connect(db)
+    before = watcher.execute('PRAGMA data_version').fetchone()[0]
+    assert database.rescore_tasks(now + 60) == 0
+    assert watcher.execute('PRAGMA data_version').fetchone()[0] == before
+    watcher.close()
+    assert database.get_state('rescored_at') == str(now)
+
+def test_rescore_picks_up_a_crossed_boundary(db):
+    now = int(datetime.datetime.now().timestamp())
+    due = datetime.datetime.fromtimestamp(now) + datetime.timedelta(days=database.URGENT_DAYS + 1, hours=1)
+    task_id = database.add_task("Soon", due_date=due.isoformat(timespec='seconds'))
+    database.rescore_tasks(now)
+    quadrant = database.get_task(task_id)['quadrant']
+    
+    assert database.rescore_tasks(now + 2 * 3600) == 1
+    assert database.get_task(task_id)['quadrant'] != quadrant
+    assert database.get_state('rescored_at') == str(now + 2 * 3600)
+
+def test_stopped_full_pass_resumes_at_its_start_time(db, monkeypatch):
+    monkeypatch.setattr(database, "RESCORE_CHUNK_IDS", 2)
+    now = int(datetime.datetime.now().timestamp())
+    due = datetime.datetime.fromtimestamp(now) + datetime.timedelta(days=database.URGENT_DAYS + 1, hours=1)
+    task_ids = [database.add_task(f"Task {i}", due_date=due.isoformat(timespec='seconds')) for i in range(5)]
+    later = now + 2 * 3600
+    
+    assert database.rescore_tasks(later, full=True, should_stop=lambda: True) == 2
+    assert database.get_state('rescored_at') is None
+    # A resumed pass keeps the time it started at
+    assert database.rescore_tasks(later + 600, should_stop=lambda: True) == 2
+    assert database.rescore_tasks(later + 1200, should_stop=lambda: False) == 1
+    assert database.get_state('rescored_at') == str(later)
+    assert database.get_state('rescore_resume') is None
+    assert len({database.get_task(task_id)['quadrant'] for task_id in task_ids}) == 1
+
+def test_a_complete_pass_replaces_a_stopped_one(db, monkeypatch):
+    monkeypatch.setattr(database, "RESCORE_CHUNK_IDS", 2)
+    for i in range(5):
+        database.add_task(f"Task {i}", due_date="2000-01-01")
+    now = int(datetime.datetime.now().timestamp())
+    
+    database.rescore_tasks(now, full=True, should_stop=lambda: True)
+    assert database.get_state('rescore_resume') == f"{now} 2"
+    database.rescore_tasks(now + 60)
+    assert database.get_state('rescored_at') == str(now + 60)
+    assert database.get_state('rescore_resume') is None
@@ -0,0 +1,35 @@
+import datetime
+import time
+
+import database
+import server
+from models import ScoringProfile
+
+def test_not_modified_responses_vary_on_encoding(db):
+    task_id = database.add_task("Cached")
+    client = server.app.test_client()
+    
+    first = client.get(f"/task/{task_id}")
+    assert first.headers["Vary"] == "Accept-Encoding"
+    etag = first.headers["ETag"]
+    not_modified = client.get(f"/task/{task_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["Vary"] == "Accept-Encoding"
+    
+    database.update_task(task_id, title="Changed")
+    assert client.get(f"/task/{task_id}", headers={"If-None-Match": etag}).status_code == 200
+
+def test_profile_etags_change_only_when_a_due_date_crosses_a_bucket(db, monkeypatch):
+    database.save_scoring_profile(ScoringProfile("deadlines", due_buckets=[(0, 20)]))
+    now = int(time.time())
+    due = datetime.datetime.fromtimestamp(now) + datetime.timedelta(days=1, hours=1)
+    database.add_task("Due tomorrow", due_date=due.isoformat(timespec='seconds'))
+    client = server.app.test_client()
+    
+    def etag(at):
+        monkeypatch.setattr(database.time, "time", lambda: at)
+        return client.get("/task/top?profile=deadlines").headers["ETag"]
+    assert etag(now) == etag(now + 600)
+    assert etag(now + 2 * 3600) != etag(now)
+    # Without a profile only the data counts
+    assert client.get("/task/top").headers["ETag"] == f'W/"{database.get_change_counter()}"'
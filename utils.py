@@ -20,15 +20,13 @@ def check_for_similar_tasks(task_id: int, similarity_threshold: float = 0.8) ->
         return False
     
     # Get all active tasks except the current one
-    conn = sqlite3.connect(database.DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    cursor = database.get_connection().cursor()
+    cursor.row_factory = sqlite3.Row
     cursor.execute('''
     SELECT * FROM tasks WHERE id != ? AND completed = 0
     ''', (task_id,))
     
     other_tasks = [dict(row) for row in cursor.fetchall()]
-    conn.close()
     
     # Check for similar tasks
     similar_tasks = []
@@ -67,21 +65,19 @@ def merge_tasks(task_id1: int, task_id2: int) -> int:
         delete_task = task1
     
     # Update the kept task's repetitions
-    conn = sqlite3.connect(database.DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-    UPDATE tasks 
-    SET repetitions = repetitions + ?, 
-        score = score + 1
-    WHERE id = ?
-    ''', (delete_task['repetitions'], keep_task['id']))
-    
-    # Delete the other task
-    cursor.execute('DELETE FROM tasks WHERE id = ?', (delete_task['id'],))
-    
-    conn.commit()
-    conn.close()
+    with database.transaction() as cursor:
+        cursor.execute('''
+        UPDATE tasks 
+        SET repetitions = repetitions + ?, 
+            score = score + 1
+        WHERE id = ?
+        ''', (delete_task['repetitions'], keep_task['id']))
+        
+        # Delete the other task
+        cursor.execute('DELETE FROM tasks WHERE id = ?', (delete_task['id'],))
+        
+        database.log_task_event(cursor, 'merged', keep_task['id'])
+        database.log_task_event(cursor, 'deleted', delete_task['id'])
     
     return keep_task['id']
 
@@ -145,8 +141,45 @@ def parse_natural_language_date(text: str) -> datetime.datetime:
     # No date found
     return None
 
+# Words that suggest a deadline; if none occur, "no due date" is a safe answer.
+# Matched as whole words. Words that are common in other senses ("by",
+# "this", "may", "sun", "sat", "wed", "mar", "till") only count in
+# phrases that make them temporal.
+TEMPORAL_CUES = re.compile(
+    r"\b(?:due|deadline|before|until|tonight|today|tomorrow|"
+    r"end of|eod|eow|asap|(?:mon|tues|wednes|thurs|fri|satur|sun)day|mon|tue|thu|fri|"
+    r"(?:this|next|by) (?:week(?:end)?|month|year|morning|afternoon|evening|time)|"
+    r"by (?:noon|midnight|then|the \d{1,2}(?:st|nd|rd|th)|\d{1,2}(?::\d{2})? ?(?:am|pm))|"
+    r"jan(?:uary)?|feb(?:ruary)?|march|apr(?:il)?|june?|july?|aug(?:ust)?|"
+    r"sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?|"
+    r"(?:mar|may) \d{1,2}(?:st|nd|rd|th)?|\d{1,2}(?:st|nd|rd|th)? (?:of )?(?:mar|may)|"
+    r"in \d+ (?:day|week|month)s?|\d{1,4}[-/]\d{1,2}(?:[-/]\d{1,4})?)\b",
+    re.IGNORECASE
+)
+
+# Words that suggest how much work the task is
+EFFORT_CUES = re.compile(
+    r"\b(?:effort|easy|simple|quick|difficult|hard|challenging|complex|minutes?|hours?|days? of work)\b",
+    re.IGNORECASE
+)
+
+# Weights of the signals behind the extraction confidence; they sum to 1
+CONFIDENCE_WEIGHTS = {
+    "title": 0.35,
+    "due_date": 0.3,
+    "effort": 0.15,
+    "brevity": 0.2,
+}
+
 def extract_task_info_from_text(text: str) -> Dict[str, Any]:
-    """Extract task information from natural language text."""
+    """Extract task information from natural language text.
+    
+    The result includes a "confidence" between 0 and 1 of how likely the
+    rules captured the task: whether a clean title sentence was found,
+    whether a due date was parsed or no deadline is mentioned at all,
+    whether effort was matched or not discussed, and how much text the
+    rules had to ignore.
+    """
     task_info = {
         "title": "",
         "description": None,
@@ -155,6 +188,7 @@ def extract_task_info_from_text(text: str) -> Dict[str, Any]:
         "consequences": 5,
         "desire": 5
     }
+    signals = dict.fromkeys(CONFIDENCE_WEIGHTS, 0.0)
     
     # Extract title (assume it's the first sentence or up to a certain length)
     title_match = re.match(r'^([^.!?]{3,80})[.!?]?', text.strip())
@@ -163,6 +197,10 @@ def extract_task_info_from_text(text: str) -> Dict[str, Any]:
         description = text[len(title_match.group(0)):].strip()
         if description:
             task_info["description"] = description
+        # A sentence that ends before the 80 character cut is a clean title,
+        # unless a comma or semicolon suggests it runs into other clauses
+        if re.match(r'^[^.!?]{3,80}(?:[.!?]|$)', text.strip()):
+            signals["title"] = 0.5 if re.search(r'[,;:]', task_info["title"]) else 1.0
     else:
         task_info["title"] = text[:80].strip()
         if len(text) > 80:
@@ -184,6 +222,9 @@ def extract_task_info_from_text(text: str) -> Dict[str, Any]:
                 task_info["due_date"] = parsed_date.isoformat()
                 break
     
+    if task_info["due_date"] or not TEMPORAL_CUES.search(text):
+        signals["due_date"] = 1.0
+    
     # Extract effort level
     effort_patterns = [
         r"(?:takes|requires)\s+(\w+)\s+(?:effort|time|work)",
@@ -199,11 +240,15 @@ def extract_task_info_from_text(text: str) -> Dict[str, Any]:
     for pattern in effort_patterns:
         match = re.search(pattern, text, re.IGNORECASE)
         if match:
-            keyword = match.group(1).lower() if match.group(1) else match.group(0).split()[0].lower()
+            keyword = match.group(1).lower() if match.lastindex else match.group(0).split()[0].lower()
             if keyword in effort_keywords:
                 task_info["effort"] = effort_keywords[keyword]
+                signals["effort"] = 1.0
                 break
     
+    if not signals["effort"] and not EFFORT_CUES.search(text):
+        signals["effort"] = 0.7
+    
     # Extract consequences and desire based on language cues
     urgency_keywords = ["urgent", "critical", "important", "crucial", "vital", "essential"]
     desire_keywords = ["want", "hope", "wish", "excited", "looking forward", "eager"]
@@ -224,4 +269,10 @@ def extract_task_info_from_text(text: str) -> Dict[str, Any]:
     task_info["consequences"] = min(10, urgency_score)
     task_info["desire"] = min(10, desire_score)
     
+    # Each sentence beyond the second is context the rules mostly ignore
+    sentences = len([part for part in re.split(r'[.!?\n]+', text) if part.strip()])
+    signals["brevity"] = max(0.0, 1.0 - max(0, sentences - 2) / 4)
+    
+    task_info["confidence"] = round(sum(CONFIDENCE_WEIGHTS[name] * value for name, value in signals.items()), 3)
+    
     return task_info